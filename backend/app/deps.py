@@ -1,21 +1,49 @@
 import os
+import threading
 import time
-from typing import Generator
-from sqlmodel import SQLModel
-from sqlmodel import create_engine, Session
-from sqlalchemy.exc import OperationalError
+from typing import Any, Generator, Optional
 
+# SQLModel/SQLAlchemy só são importados no primeiro uso do banco: o processo
+# sobe (e atende /health e /ws) sem pagar esse import nem a conexão.
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
-engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+_engine: Optional[Any] = None
+_ready = False
+_lock = threading.RLock()
+
+
+def get_engine() -> Any:
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                from sqlmodel import create_engine
+                _engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+    return _engine
+
+
+def db_ready() -> bool:
+    return _ready
 
 
 def init_db() -> None:
-    wait_for_db()
-    SQLModel.metadata.create_all(bind=engine)
+    """Espera o banco e cria as tabelas; idempotente (quem chegar primeiro faz, os outros esperam)"""
+    global _ready
+    if _ready:
+        return
+    with _lock:
+        if _ready:
+            return
+        from sqlmodel import SQLModel
+        from . import models  # noqa: F401  registra as tabelas no metadata
+        wait_for_db()
+        SQLModel.metadata.create_all(bind=get_engine())
+        _ready = True
 
 
 def wait_for_db(retries: int = 30, delay_seconds: float = 1.0) -> None:
+    from sqlalchemy.exc import OperationalError
+    engine = get_engine()
     for _ in range(retries):
         try:
             with engine.connect() as conn:
@@ -28,8 +56,8 @@ def wait_for_db(retries: int = 30, delay_seconds: float = 1.0) -> None:
         conn.exec_driver_sql("SELECT 1")
 
 
-def get_session() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+def get_session() -> Generator[Any, None, None]:
+    from sqlmodel import Session
+    init_db()
+    with Session(get_engine()) as session:
         yield session
-
-
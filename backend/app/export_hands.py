@@ -0,0 +1,103 @@
+"""Exportação em massa do histórico de mãos para arquivos colunares (análise offline).
+
+Uso (a partir de backend/):
+    python -m app.export_hands saida.parquet [--table ID] [--since ID] [--batch N] [--format FORMATO]
+
+Formatos:
+    parquet  Parquet, um row group por lote (requer pyarrow)
+    arrow    Arrow IPC / Feather v2, um record batch por lote (requer pyarrow)
+    columns  sem dependências: uma linha JSON por lote, {"coluna": [valores...]}
+
+A leitura usa o mesmo cursor por id de GET /api/hands: memória constante,
+qualquer que seja o intervalo exportado.
+"""
+import argparse
+import json
+import sys
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from .services.hand_history import COLUMNS, iter_hands
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional; sem ele só o formato "columns"
+    pa = None
+    pq = None
+
+
+def column_batches(table_id: Optional[str], since: int, batch: int) -> Iterator[Dict[str, List[Any]]]:
+    rows = iter_hands(table_id, since, batch=batch)
+    while True:
+        chunk = list(islice(rows, batch))
+        if not chunk:
+            return
+        yield {
+            "id": [r.id for r in chunk],
+            "table_id": [r.table_id for r in chunk],
+            "game": [r.game for r in chunk],
+            "ended_at": [r.ended_at for r in chunk],
+            "players": [r.players.split(",") if r.players else [] for r in chunk],
+            "winners": [r.winners.split(",") if r.winners else [] for r in chunk],
+            "pot": [r.pot for r in chunk],
+            "data": [r.data for r in chunk],  # JSON como texto (esquema varia por jogo)
+        }
+
+
+def _arrow_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("table_id", pa.string()),
+        ("game", pa.string()),
+        ("ended_at", pa.float64()),
+        ("players", pa.list_(pa.string())),
+        ("winners", pa.list_(pa.string())),
+        ("pot", pa.int64()),
+        ("data", pa.string()),
+    ])
+
+
+def export(path: str, fmt: str, table_id: Optional[str] = None, since: int = 0, batch: int = 10000) -> int:
+    """Escreve as mãos em `path`; retorna quantas foram exportadas"""
+    if fmt in ("parquet", "arrow") and pa is None:
+        raise RuntimeError(f"o formato {fmt} requer pyarrow (pip install pyarrow); use --format columns")
+    total = 0
+    batches = column_batches(table_id, since, batch)
+    if fmt == "columns":
+        with open(path, "w", encoding="utf-8") as f:
+            for columns in batches:
+                f.write(json.dumps(columns, separators=(",", ":")) + "\n")
+                total += len(columns["id"])
+        return total
+    schema = _arrow_schema()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    with writer:
+        for columns in batches:
+            writer.write_batch(pa.record_batch([columns[name] for name in COLUMNS], schema=schema))
+            total += len(columns["id"])
+    return total
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Exporta o histórico de mãos em formato colunar")
+    parser.add_argument("path")
+    parser.add_argument("--table", default=None)
+    parser.add_argument("--since", type=int, default=0, help="exporta mãos com id maior que este")
+    parser.add_argument("--batch", type=int, default=10000, help="linhas por row group / lote")
+    parser.add_argument("--format", choices=["parquet", "arrow", "columns"],
+                        default="parquet" if pa is not None else "columns")
+    args = parser.parse_args(argv)
+    try:
+        total = export(args.path, args.format, args.table, args.since, args.batch)
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print(f"{total} mãos exportadas para {args.path} ({args.format})")
+
+
+if __name__ == "__main__":
+    main()
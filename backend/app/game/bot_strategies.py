@@ -0,0 +1,178 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Type
+from .cards import standard_deck
+from .holdem_engine import HoldemTableState
+
+# Estratégias recebem o frame de estado que o bot recebeu (o mesmo dos clientes)
+# e devolvem a mensagem de ação a enviar, no formato do protocolo de entrada:
+#   {"type": "action", "action": "call"} / {"type": "action", "action": "raise", "amount": 40}
+# `deadline` (time.perf_counter) limita o tempo de cálculo da decisão.
+Action = Dict[str, Any]
+
+_RANK_VALUE = {r: i for i, r in enumerate("23456789TJQKA", start=2)}
+_evaluator = HoldemTableState(max_players=2)  # só para o avaliador de mãos (evaluate_hand)
+
+
+def evaluate(cards: List[str]):
+    return _evaluator.evaluate_hand(cards)
+
+
+def _act(action: str, amount: Optional[int] = None) -> Action:
+    msg: Action = {"type": "action", "action": action}
+    if amount is not None:
+        msg["amount"] = amount
+    return msg
+
+
+def _passive(view: Dict[str, Any]) -> Action:
+    """check se não há aposta pendente, senão fold"""
+    return _act("check") if not view.get("callAmount") else _act("fold")
+
+
+class BotStrategy(ABC):
+    name = ""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+
+    def decide(self, view: Dict[str, Any], deadline: float) -> Action:
+        if view.get("game") == "sueca":
+            return self.play_sueca(view)
+        return self.decide_holdem(view, deadline)
+
+    @abstractmethod
+    def decide_holdem(self, view: Dict[str, Any], deadline: float) -> Action:
+        ...
+
+    def play_sueca(self, view: Dict[str, Any]) -> Action:
+        return {"type": "action", "action": "play", "card": self.rng.choice(view["legal"])}
+
+
+STRATEGIES: Dict[str, Type[BotStrategy]] = {}
+
+
+def register_strategy(cls: Type[BotStrategy]) -> Type[BotStrategy]:
+    STRATEGIES[cls.name] = cls
+    return cls
+
+
+@register_strategy
+class RandomStrategy(BotStrategy):
+    """Ações válidas sorteadas; gera carga variada (inclusive all-ins) para o motor."""
+
+    name = "random"
+
+    def decide_holdem(self, view: Dict[str, Any], deadline: float) -> Action:
+        call = view.get("callAmount") or 0
+        r = self.rng.random()
+        if r < 0.15:
+            return _passive(view)
+        if r < 0.75:
+            return _act("call") if call else _act("check")
+        if r < 0.97:
+            return _act("raise", (view.get("minRaise") or 0) * self.rng.randint(1, 3))
+        return _act("all_in")
+
+
+def preflop_score(hole: List[str]) -> float:
+    """Pontuação simplificada (estilo Chen) da mão inicial: ~0..20"""
+    a, b = sorted((_RANK_VALUE[c[0]] for c in hole), reverse=True)
+    score = {14: 10, 13: 8, 12: 7, 11: 6}.get(a, a / 2)
+    if a == b:
+        return max(5, score * 2)
+    if hole[0][1] == hole[1][1]:
+        score += 2
+    gap = a - b - 1
+    score -= (0, 1, 2, 4)[gap] if gap < 4 else 5
+    if gap <= 1 and a < 12:
+        score += 1
+    return score
+
+
+@register_strategy
+class TightAggressiveStrategy(BotStrategy):
+    """Joga poucas mãos iniciais e aposta forte com mão feita (par ou melhor)."""
+
+    name = "tag"
+
+    def decide_holdem(self, view: Dict[str, Any], deadline: float) -> Action:
+        hole = view.get("hole") or []
+        if len(hole) != 2:
+            return _passive(view)
+        call = view.get("callAmount") or 0
+        stack = (view.get("stacks") or {}).get(view.get("toAct"), 0)
+        min_raise = view.get("minRaise") or 0
+        if view.get("street") == "preflop":
+            score = preflop_score(hole)
+            if score >= 10:
+                return _act("raise", min_raise * 3)
+            if score >= 7 and call <= stack // 10:
+                return _act("call") if call else _act("check")
+            return _passive(view)
+        rank, _ = evaluate(hole + view.get("community", []))
+        if rank >= 2:
+            return _act("raise", max(min_raise, view.get("pot", 0) // 2))
+        if rank == 1 and call <= view.get("pot", 0) // 2:
+            return _act("call") if call else _act("check")
+        return _passive(view)
+
+
+def estimate_equity(hole: List[str], community: List[str], opponents: int, deadline: float,
+                    rng: random.Random, max_samples: int = 2000) -> float:
+    """Equity por Monte Carlo contra `opponents` mãos aleatórias, até o prazo ou max_samples"""
+    dead = set(hole) | set(community)
+    deck = [c for c in standard_deck() if c not in dead]
+    need = 5 - len(community)
+    wins = 0.0
+    samples = 0
+    while samples < max_samples and (samples < 8 or time.perf_counter() < deadline):
+        draw = rng.sample(deck, need + 2 * opponents)
+        board = community + draw[:need]
+        mine = evaluate(hole + board)
+        best = True
+        tie = 0
+        for i in range(opponents):
+            theirs = evaluate(draw[need + 2 * i:need + 2 * i + 2] + board)
+            if theirs > mine:
+                best = False
+                break
+            if theirs == mine:
+                tie += 1
+        if best:
+            wins += 1.0 / (tie + 1)
+        samples += 1
+    return wins / samples
+
+
+@register_strategy
+class EquityStrategy(BotStrategy):
+    """Compara a equity (Monte Carlo com o avaliador do motor) com as pot odds."""
+
+    name = "equity"
+
+    def decide_holdem(self, view: Dict[str, Any], deadline: float) -> Action:
+        hole = view.get("hole") or []
+        if len(hole) != 2:
+            return _passive(view)
+        community = view.get("community") or []
+        opponents = max(1, len(view.get("players", [])) - 1 - len(self._folded(view)))
+        equity = estimate_equity(hole, community, opponents, deadline, self.rng)
+        call = view.get("callAmount") or 0
+        pot = view.get("pot", 0)
+        min_raise = view.get("minRaise") or 0
+        if equity > 0.65 and min_raise:
+            return _act("raise", max(min_raise, pot // 2))
+        if call == 0:
+            return _act("check")
+        pot_odds = call / (pot + call)
+        return _act("call") if equity >= pot_odds else _act("fold")
+
+    @staticmethod
+    def _folded(view: Dict[str, Any]) -> List[str]:
+        return [a["player"] for a in view.get("recentActions", []) if a.get("action") == "fold"]
+
+
+def get_strategy(name: str) -> Optional[Callable[..., BotStrategy]]:
+    return STRATEGIES.get(name)
@@ -1,5 +1,5 @@
-import random
 from typing import List, Tuple
+from .shuffler import get_shuffler, shuffled
 
 SUITS = ["S", "H", "D", "C"]
 RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "T", "J", "Q", "K", "A"]
@@ -10,7 +10,13 @@ def standard_deck() -> List[str]:
 
 
 def shuffle_deck(deck: List[str]) -> None:
-    # Embaralha o baralho usando a fonte de aleatoriedade do sistema
-    random.shuffle(deck)
+    # Embaralha in-place com o embaralhador do processo (CSPRNG, ou semente via SHUFFLE_SEED)
+    get_shuffler().shuffle(deck)
 
 
+def shuffled_deck() -> List[str]:
+    """Baralho de 52 cartas já embaralhado (vem do pool pré-gerado)"""
+    return shuffled(_STANDARD_DECK)
+
+
+_STANDARD_DECK = tuple(standard_deck())
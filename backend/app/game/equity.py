@@ -0,0 +1,277 @@
+import bisect
+import functools
+import os
+import random
+import time
+from itertools import combinations
+from math import comb
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .cards import RANKS, SUITS, standard_deck
+from .hand_tables import get_tables
+from .holdem_engine import HoldemTableState
+
+# Equity mão x range e range x range (coaching / analytics), com o avaliador do motor.
+# Ranges na notação usual: "AKs, TT+, A5s-A2s, K9o+, 22-66, AhKh, random".
+
+Combo = Tuple[str, str]
+
+CATEGORIES = ("high_card", "pair", "two_pair", "trips", "straight", "flush",
+              "full_house", "quads", "straight_flush", "royal_flush")
+
+_RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
+_SUIT_INDEX = {s: i for i, s in enumerate(SUITS)}
+_evaluator = HoldemTableState(max_players=2)  # fallback sem as tabelas (evaluate_hand direto)
+
+
+def _combo(a: str, b: str) -> Combo:
+    """Ordem canônica: carta mais alta primeiro (mesmo combo escrito de outro jeito = mesma chave)"""
+    key = lambda c: (_RANK_INDEX[c[0]], -_SUIT_INDEX[c[1]])
+    return (a, b) if key(a) >= key(b) else (b, a)
+
+
+def parse_cards(text: Any) -> List[str]:
+    """"AhKd2c", "Ah Kd 2c" ou ["Ah", "Kd"] -> ["AH", "KD", "2C"] (formato do motor)"""
+    if isinstance(text, (list, tuple)):
+        text = "".join(text)
+    text = "".join(ch for ch in (text or "") if not ch.isspace() and ch != ",")
+    if len(text) % 2:
+        raise ValueError(f"Cartas inválidas: {text}")
+    cards = []
+    for i in range(0, len(text), 2):
+        card = text[i].upper() + text[i + 1].upper()
+        if card[0] not in _RANK_INDEX or card[1] not in _SUIT_INDEX:
+            raise ValueError(f"Carta inválida: {text[i:i + 2]}")
+        if card in cards:
+            raise ValueError(f"Carta repetida: {text[i:i + 2]}")
+        cards.append(card)
+    return cards
+
+
+def _pair(r: int) -> List[Combo]:
+    return [_combo(RANKS[r] + a, RANKS[r] + b) for a, b in combinations(SUITS, 2)]
+
+
+def _unpaired(hi: int, lo: int, kind: str) -> List[Combo]:
+    combos = []
+    for a in SUITS:
+        for b in SUITS:
+            if (kind == "s" and a != b) or (kind == "o" and a == b):
+                continue
+            combos.append(_combo(RANKS[hi] + a, RANKS[lo] + b))
+    return combos
+
+
+def _hand_token(token: str) -> Tuple[int, int, str]:
+    """"AKs" -> (12, 11, "s"); "TT" -> (8, 8, ""); valida a forma do token"""
+    if len(token) not in (2, 3):
+        raise ValueError(f"Range inválido: {token}")
+    a, b = token[0].upper(), token[1].upper()
+    kind = token[2].lower() if len(token) == 3 else ""
+    if a not in _RANK_INDEX or b not in _RANK_INDEX or kind not in ("", "s", "o"):
+        raise ValueError(f"Range inválido: {token}")
+    hi, lo = sorted((_RANK_INDEX[a], _RANK_INDEX[b]), reverse=True)
+    if hi == lo and kind:
+        raise ValueError(f"Range inválido: {token}")
+    return hi, lo, kind
+
+
+def parse_range(text: str) -> List[Combo]:
+    """Range em notação padrão -> combos (2 cartas no formato do motor), sem repetição.
+
+    Aceita pares ("TT", "TT+", "TT-77"), mãos suited/offsuit ("AKs", "AKo",
+    "AK" = as duas), "K9s+" (kicker subindo até abaixo da carta alta),
+    "A5s-A2s", combos específicos ("AhKh") e "random"/"any" (todas as 1326).
+    """
+    combos: Dict[Combo, None] = {}
+    for token in text.replace(";", ",").replace(" ", ",").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        found: List[Combo] = []
+        if token.lower() in ("random", "any"):
+            found = [_combo(a, b) for a, b in combinations(standard_deck(), 2)]
+        elif len(token) == 4 and token[1].upper() in _SUIT_INDEX and token[3].upper() in _SUIT_INDEX:
+            cards = parse_cards(token)
+            found = [_combo(cards[0], cards[1])]
+        elif token.endswith("+"):
+            hi, lo, kind = _hand_token(token[:-1])
+            if hi == lo:
+                for r in range(lo, len(RANKS)):
+                    found += _pair(r)
+            else:
+                for r in range(lo, hi):
+                    found += _unpaired(hi, r, kind)
+        elif "-" in token:
+            first, _, last = token.partition("-")
+            hi1, lo1, kind1 = _hand_token(first)
+            hi2, lo2, kind2 = _hand_token(last)
+            if kind1 != kind2 or (hi1 == lo1) != (hi2 == lo2) or (hi1 != lo1 and hi1 != hi2):
+                raise ValueError(f"Range inválido: {token}")
+            if hi1 == lo1:
+                for r in range(min(lo1, lo2), max(lo1, lo2) + 1):
+                    found += _pair(r)
+            else:
+                for r in range(min(lo1, lo2), max(lo1, lo2) + 1):
+                    found += _unpaired(hi1, r, kind1)
+        else:
+            hi, lo, kind = _hand_token(token)
+            found = _pair(hi) if hi == lo else _unpaired(hi, lo, kind)
+        for c in found:
+            combos[c] = None
+    return list(combos)
+
+
+def hand_label(combo: Combo) -> str:
+    """("AH", "KH") -> "AKs"; pares sem sufixo ("TT")"""
+    a, b = combo
+    if a[0] == b[0]:
+        return a[0] + b[0]
+    return a[0] + b[0] + ("s" if a[1] == b[1] else "o")
+
+
+@functools.lru_cache(maxsize=int(os.getenv("EQUITY_CACHE_SIZE", "4096")))
+def board_classes(board: Tuple[str, ...], combos: Tuple[Combo, ...]) -> Tuple[Any, ...]:
+    """Força de cada combo num board de 5 cartas (None se o combo usa carta do board).
+
+    Cacheado por (board ordenado, combos): a mesma runout com o mesmo range
+    (ex.: o range do vilão ao trocar só o do herói) não é reavaliada.
+    """
+    used = set(board)
+    live = [c for c in combos if c[0] not in used and c[1] not in used]
+    tables = get_tables()
+    if tables is not None:
+        values = iter(tables.hand_classes(list(board), live))
+    else:
+        values = iter((r, tuple(h)) for r, h in (_evaluator.evaluate_hand(list(c) + list(board)) for c in live))
+    return tuple(next(values) if c[0] not in used and c[1] not in used else None for c in combos)
+
+
+def _categories(board: List[str], combos: Sequence[Combo]) -> Dict[str, float]:
+    """Distribuição das categorias de mão (par, dois pares, flush...) do range no board atual"""
+    counts: Dict[str, int] = {}
+    tables = get_tables()
+    if tables is not None:
+        ranks = [tables.describe(c)[0] for c in tables.hand_classes(board, list(combos)) if c]
+    else:
+        ranks = [_evaluator.evaluate_hand(list(c) + board)[0] for c in combos]
+    for rank in ranks:
+        counts[CATEGORIES[rank]] = counts.get(CATEGORIES[rank], 0) + 1
+    total = len(ranks) or 1
+    return {name: round(n / total, 4) for name, n in sorted(counts.items(), key=lambda x: -x[1])}
+
+
+def _runouts(deck: List[str], need: int, max_boards: int, rng: random.Random) -> Tuple[Iterable[Tuple[str, ...]], bool]:
+    """Todas as runouts (embaralhadas) se couberem em max_boards; senão, amostras aleatórias"""
+    if comb(len(deck), need) <= max_boards:
+        boards = list(combinations(deck, need))
+        rng.shuffle(boards)  # parar pelo tempo ainda dá uma amostra sem viés
+        return boards, True
+    return (tuple(rng.sample(deck, need)) for _ in range(max_boards)), False
+
+
+def equity(
+    hero: str,
+    villain: str,
+    board: Any = "",
+    dead: Any = "",
+    *,
+    max_boards: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """Equity de `hero` contra `villain` (mão ou range) no board, removendo cartas mortas.
+
+    Cada trio (combo do herói, combo do vilão, runout) sem cartas em comum
+    pesa 1 (remoção combinatória). Runouts são enumeradas quando cabem em
+    EQUITY_MAX_BOARDS, senão amostradas; EQUITY_TIME_BUDGET limita o tempo.
+    """
+    max_boards = max_boards if max_boards is not None else int(os.getenv("EQUITY_MAX_BOARDS", "1500"))
+    time_budget = time_budget if time_budget is not None else float(os.getenv("EQUITY_TIME_BUDGET", "2.0"))
+    rng = rng or random.Random()
+    board_cards = parse_cards(board)
+    dead_cards = parse_cards(dead)
+    if len(board_cards) not in (0, 3, 4, 5):
+        raise ValueError("Board precisa ter 0, 3, 4 ou 5 cartas")
+    blocked = set(board_cards) | set(dead_cards)
+    if len(blocked) != len(board_cards) + len(dead_cards):
+        raise ValueError("Carta repetida entre board e cartas mortas")
+    hero_combos = tuple(c for c in parse_range(hero) if c[0] not in blocked and c[1] not in blocked)
+    villain_combos = tuple(c for c in parse_range(villain) if c[0] not in blocked and c[1] not in blocked)
+    if not hero_combos or not villain_combos:
+        raise ValueError("Range sem combos possíveis com essas cartas")
+
+    deck = [c for c in standard_deck() if c not in blocked]
+    need = 5 - len(board_cards)
+    runouts, exhaustive = _runouts(deck, need, max_boards, rng)
+    wins = [0.0] * len(hero_combos)
+    matchups = [0] * len(hero_combos)
+    ties = 0
+    boards = 0
+    deadline = time.perf_counter() + time_budget
+    for runout in runouts:
+        full = tuple(sorted(board_cards + list(runout)))
+        hero_classes = board_classes(full, hero_combos)
+        villain_classes = board_classes(full, villain_combos)
+        # vilão: forças ordenadas (total) e por carta (descontar combos que colidem com o do herói)
+        ranked = []
+        by_card: Dict[str, List[Any]] = {}
+        strength: Dict[Combo, Any] = {}
+        for c, v in zip(villain_combos, villain_classes):
+            if v is None:
+                continue
+            ranked.append(v)
+            by_card.setdefault(c[0], []).append(v)
+            by_card.setdefault(c[1], []).append(v)
+            strength[c] = v
+        ranked.sort()
+        for cards in by_card.values():
+            cards.sort()
+        total = len(ranked)
+        for i, (c, h) in enumerate(zip(hero_combos, hero_classes)):
+            if h is None:
+                continue
+            a = by_card.get(c[0], ())
+            b = by_card.get(c[1], ())
+            lower = bisect.bisect_left(ranked, h) - bisect.bisect_left(a, h) - bisect.bisect_left(b, h)
+            equal = (bisect.bisect_right(ranked, h) - bisect.bisect_left(ranked, h)
+                     - (bisect.bisect_right(a, h) - bisect.bisect_left(a, h))
+                     - (bisect.bisect_right(b, h) - bisect.bisect_left(b, h)))
+            n = total - len(a) - len(b)
+            if c in strength:
+                # o mesmo combo no range do vilão foi descontado duas vezes (uma por carta)
+                equal += 1
+                n += 1
+            wins[i] += lower + equal / 2
+            matchups[i] += n
+            ties += equal
+        boards += 1
+        if time.perf_counter() > deadline and boards >= 8:
+            break
+
+    played = sum(matchups)
+    if not played:
+        raise ValueError("Nenhum confronto possível entre os ranges")
+    hero_equity = sum(wins) / played
+    hands: Dict[str, List[float]] = {}
+    for c, w, n in zip(hero_combos, wins, matchups):
+        if n:
+            entry = hands.setdefault(hand_label(c), [0.0, 0, 0])
+            entry[0] += w
+            entry[1] += n
+            entry[2] += 1
+    result: Dict[str, Any] = {
+        "board": board_cards,
+        "dead": dead_cards,
+        "hero": {"range": hero, "combos": len(hero_combos), "equity": round(hero_equity, 4),
+                 "tie": round(ties / played, 4),
+                 "hands": [{"hand": label, "combos": k, "equity": round(w / n, 4)}
+                           for label, (w, n, k) in sorted(hands.items(), key=lambda x: -x[1][0] / x[1][1])]},
+        "villain": {"range": villain, "combos": len(villain_combos), "equity": round(1 - hero_equity, 4)},
+        "boards": boards,
+        "exact": exhaustive and boards == comb(len(deck), need),
+    }
+    if len(board_cards) >= 3:
+        result["hero"]["strength"] = _categories(board_cards, hero_combos)
+        result["villain"]["strength"] = _categories(board_cards, villain_combos)
+    return result
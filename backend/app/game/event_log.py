@@ -0,0 +1,73 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Eventos são tuplas compactas; o primeiro elemento é o tipo:
+#   ("join", nick)
+#   ("start", deck)                  deck embaralhado como string "AsKd..." (2 chars por carta)
+#   ("act", nick, action, amount)    apenas ações aceitas pelo motor
+#   ("street",)                      next_street chamado de fora de apply_action
+#   ("showdown",)                    mão encerrada direto no showdown
+#   ("payout",)                      potes pagos (get_winner)
+#   ("reset",)                       mão abortada/resetada
+#   ("seat", nick, stack)            jogador sentado com stack próprio (torneio)
+#   ("unseat", nick)                 jogador removido entre mãos (torneio ou desconectado)
+#   ("blinds", sb, bb)               novo nível de blinds
+Event = Tuple[Any, ...]
+
+
+def pack_deck(deck: List[str]) -> str:
+    return "".join(deck)
+
+
+def unpack_deck(packed: str) -> List[str]:
+    return [packed[i:i + 2] for i in range(0, len(packed), 2)]
+
+
+class EventLog:
+    """Log append-only das mutações de uma mesa, com checkpoints periódicos.
+
+    Índices são absolutos (contam desde a criação da mesa). Um checkpoint é
+    um estado completo entre mãos; ao guardar mais de `keep_checkpoints`, o
+    mais antigo e os eventos anteriores a ele são descartados, de modo que o
+    replay nunca precisa de mais que ~`checkpoint_every` eventos por checkpoint.
+    """
+
+    def __init__(self, checkpoint: Dict[str, Any], *, checkpoint_every: Optional[int] = None,
+                 keep_checkpoints: int = 2):
+        self.checkpoint_every = checkpoint_every or int(os.getenv("EVENT_LOG_CHECKPOINT_EVERY", "200"))
+        self.keep_checkpoints = max(1, keep_checkpoints)
+        self.events: List[Event] = []
+        self.base = 0  # índice absoluto de events[0]
+        self.checkpoints: List[Tuple[int, Dict[str, Any]]] = [(0, checkpoint)]
+
+    def __len__(self) -> int:
+        return self.base + len(self.events)
+
+    def append(self, event: Event) -> None:
+        self.events.append(event)
+
+    def due_checkpoint(self) -> bool:
+        return len(self) - self.checkpoints[-1][0] >= self.checkpoint_every
+
+    def add_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        self.checkpoints.append((len(self), checkpoint))
+        if len(self.checkpoints) > self.keep_checkpoints:
+            del self.checkpoints[0]
+            first = self.checkpoints[0][0]
+            del self.events[:first - self.base]
+            self.base = first
+
+    def since(self, index: int) -> Optional[List[Event]]:
+        """Eventos a partir do índice absoluto `index` (None se já foram compactados)."""
+        if index < self.base:
+            return None
+        return self.events[index - self.base:]
+
+    def nearest_checkpoint(self, index: Optional[int] = None) -> Tuple[int, Dict[str, Any]]:
+        """Checkpoint mais recente com índice <= `index` (ou o último, se None)."""
+        if index is None:
+            return self.checkpoints[-1]
+        for cp in reversed(self.checkpoints):
+            if cp[0] <= index:
+                return cp
+        raise ValueError(f"índice {index} anterior ao checkpoint mais antigo ({self.checkpoints[0][0]})")
@@ -0,0 +1,322 @@
+"""Tabelas pré-calculadas do avaliador de Hold'em (arquivo binário versionado, aberto com mmap).
+
+O arquivo é gerado no build (python -m app.game.hand_tables build) e aberto
+só para leitura com mmap: todos os workers do uvicorn compartilham as mesmas
+páginas do page cache em vez de cada um montar uma cópia própria.
+
+Layout (little-endian):
+    cabeçalho  MAGIC, versão, tamanhos das seções e sha256 do payload
+    flush      uint16[8192]   máscara de 13 bits dos valores do naipe com 5+ cartas -> classe
+    ranks5/6/7 uint16[...]    multiconjunto de valores (hash quinário) de 5/6/7 cartas -> classe
+    classes    7 bytes/classe (categoria, n, até 5 highs) na ordem de força
+
+A classe é um inteiro em que maior = mão melhor; é decodificada para o mesmo
+(rank, high_cards) que HoldemTableState._evaluate_5_cards devolve.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+MAGIC = b"HEVT"
+# Subir quando mudar o layout ou o avaliador de referência (arquivos antigos são recusados)
+TABLES_VERSION = 1
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "hand_tables.bin")
+
+_HEADER = struct.Struct("<4sHHIIII32s")
+_HEADER_SIZE = 64  # cabeçalho com padding: as seções uint16 começam alinhadas
+_CLASS_SIZE = 7
+_RANKS = "23456789TJQKA"
+_SUITS = "SHDC"
+# carta ("AS") -> (índice do valor 0..12, índice do naipe 0..3)
+_CARDS: Dict[str, Tuple[int, int]] = {r + s: (i, j) for i, r in enumerate(_RANKS) for j, s in enumerate(_SUITS)}
+
+
+def _quinary_offsets() -> List[List[List[int]]]:
+    """OFFSETS[valor][restantes][n]: deslocamento do hash quinário ao usar n cartas desse valor.
+
+    O índice de um multiconjunto (contagem 0..4 por valor, soma k) é a sua
+    posição na ordem lexicográfica de todos os multiconjuntos com soma k.
+    """
+    ways = [[0] * 8 for _ in range(14)]  # ways[i][s]: valores i..12 somando s
+    ways[13][0] = 1
+    for i in range(12, -1, -1):
+        for s in range(8):
+            ways[i][s] = sum(ways[i + 1][s - c] for c in range(min(4, s) + 1))
+    return [[[sum(ways[i + 1][rem - j] for j in range(c) if rem - j >= 0) for c in range(5)]
+             for rem in range(8)] for i in range(13)]
+
+
+_OFFSETS = _quinary_offsets()
+
+
+def _multisets(k: int, i: int = 0):
+    """Contagens por valor (tuplas de 13, cada uma 0..4) que somam k"""
+    if i == 12:
+        if k <= 4:
+            yield (k,)
+        return
+    for c in range(min(4, k) + 1):
+        for rest in _multisets(k - c, i + 1):
+            yield (c,) + rest
+
+
+def _rank_index(counts) -> int:
+    idx = 0
+    rem = sum(counts)
+    for r, c in enumerate(counts):
+        if c:
+            idx += _OFFSETS[r][rem][c]
+            rem -= c
+    return idx
+
+
+class HandTables:
+    """Tabelas abertas via mmap (somente leitura); `evaluate` devolve None quando não cobre a mão"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _load(self) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("tabelas do avaliador são little-endian")
+        if len(self._mm) < _HEADER_SIZE:
+            raise ValueError("arquivo truncado")
+        magic, version, n_classes, n_flush, n5, n6, n7, digest = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError("arquivo não é uma tabela do avaliador")
+        if version != TABLES_VERSION:
+            raise ValueError(f"versão {version} das tabelas, esperada {TABLES_VERSION} (rodar o build de novo)")
+        sizes = (n_flush, n5, n6, n7)
+        with memoryview(self._mm) as view:
+            if len(view) - _HEADER_SIZE != 2 * sum(sizes) + _CLASS_SIZE * n_classes:
+                raise ValueError("tamanho do arquivo não bate com o cabeçalho")
+            if hashlib.sha256(view[_HEADER_SIZE:]).digest() != digest:
+                raise ValueError("checksum das tabelas não confere (arquivo corrompido)")
+        payload = memoryview(self._mm)[_HEADER_SIZE:]
+        offset = 0
+        sections = []
+        for n in sizes:
+            sections.append(payload[offset:offset + 2 * n].cast("H"))
+            offset += 2 * n
+        self.flush = sections[0]
+        self.ranks = {5: sections[1], 6: sections[2], 7: sections[3]}
+        self.classes = payload[offset:]
+        self.n_classes = n_classes
+        self.digest = digest.hex()
+        self.size = len(self._mm)
+
+    def close(self) -> None:
+        self.flush = self.classes = None
+        self.ranks = {}
+        self._mm.close()
+
+    def hand_class(self, cards: List[str]) -> int:
+        """Classe (força) da melhor mão de 5 entre 5 a 7 cartas; 0 se a mão não é coberta"""
+        n = len(cards)
+        if n < 5 or n > 7:
+            return 0
+        counts = [0] * 13
+        suit_masks = [0, 0, 0, 0]
+        suit_counts = [0, 0, 0, 0]
+        for card in cards:
+            parsed = _CARDS.get(card)
+            if parsed is None:
+                return 0
+            r, s = parsed
+            counts[r] += 1
+            suit_masks[s] |= 1 << r
+            suit_counts[s] += 1
+        return self._lookup(counts, suit_masks, suit_counts, n)
+
+    def hand_classes(self, board: List[str], hands: List[Tuple[str, str]]) -> List[int]:
+        """Classes de várias mãos de 2 cartas no mesmo board (3 a 5 cartas), em lote.
+
+        O board é contado uma vez só. Fora de flush a classe só depende dos
+        dois valores, então cada par de valores (no máximo 91) é consultado
+        uma vez; o flush só é testado nos naipes com 3+ cartas no board.
+        """
+        n = len(board) + 2
+        if n < 5 or n > 7:
+            return [0] * len(hands)
+        counts = [0] * 13
+        suit_masks = [0, 0, 0, 0]
+        suit_counts = [0, 0, 0, 0]
+        for card in board:
+            parsed = _CARDS.get(card)
+            if parsed is None:
+                return [0] * len(hands)
+            r, s = parsed
+            counts[r] += 1
+            suit_masks[s] |= 1 << r
+            suit_counts[s] += 1
+        flush_suits = [s for s in range(4) if suit_counts[s] >= 3]
+        by_ranks: Dict[Tuple[int, int], int] = {}
+        result = []
+        for a, b in hands:
+            pa = _CARDS.get(a)
+            pb = _CARDS.get(b)
+            if pa is None or pb is None or a == b:
+                result.append(0)
+                continue
+            (ra, sa), (rb, sb) = pa, pb
+            if suit_masks[sa] >> ra & 1 or suit_masks[sb] >> rb & 1:
+                result.append(0)  # carta repetida com o board
+                continue
+            value = 0
+            for s in flush_suits:
+                if suit_counts[s] + (sa == s) + (sb == s) >= 5:
+                    mask = suit_masks[s]
+                    if sa == s:
+                        mask |= 1 << ra
+                    if sb == s:
+                        mask |= 1 << rb
+                    value = self.flush[mask]
+                    break
+            if not value:
+                key = (ra, rb)
+                value = by_ranks.get(key, 0)
+                if not value:
+                    c = counts[:]
+                    c[ra] += 1
+                    c[rb] += 1
+                    value = by_ranks[key] = self._rank_lookup(c, n)
+            result.append(value)
+        return result
+
+    def _lookup(self, counts: List[int], suit_masks: List[int], suit_counts: List[int], n: int) -> int:
+        for s in range(4):
+            # com até 7 cartas, um flush sempre é a melhor mão possível
+            if suit_counts[s] >= 5:
+                if suit_counts[s] != bin(suit_masks[s]).count("1"):
+                    return 0  # carta repetida
+                return self.flush[suit_masks[s]]
+        return self._rank_lookup(counts, n)
+
+    def _rank_lookup(self, counts: List[int], n: int) -> int:
+        idx = 0
+        rem = n
+        offsets = _OFFSETS
+        for r in range(13):
+            c = counts[r]
+            if c:
+                if c > 4:
+                    return 0
+                idx += offsets[r][rem][c]
+                rem -= c
+        return self.ranks[n][idx]
+
+    def describe(self, hand_class: int) -> Tuple[int, List[int]]:
+        """Classe -> (rank, high_cards) no formato de HoldemTableState.evaluate_hand"""
+        start = (hand_class - 1) * _CLASS_SIZE
+        rec = self.classes[start:start + _CLASS_SIZE]
+        return rec[0], list(rec[2:2 + rec[1]])
+
+    def evaluate(self, cards: List[str]) -> Optional[Tuple[int, List[int]]]:
+        hand_class = self.hand_class(cards)
+        if not hand_class:
+            return None
+        return self.describe(hand_class)
+
+
+_tables: Optional[HandTables] = None
+_failed = False
+_lock = threading.Lock()
+
+
+def get_tables() -> Optional[HandTables]:
+    """Tabelas do processo (abertas no primeiro uso); None se o arquivo falta ou não passa na checagem"""
+    global _tables, _failed
+    if _tables is not None or _failed:
+        return _tables
+    with _lock:
+        if _tables is None and not _failed:
+            path = os.getenv("HAND_TABLES_PATH", DEFAULT_PATH)
+            try:
+                _tables = HandTables(path)
+                print(f"[DEBUG] Tabelas do avaliador carregadas de {path} ({_tables.size} bytes, mmap)")
+            except (OSError, ValueError) as e:
+                _failed = True
+                print(f"[ERROR] Tabelas do avaliador indisponíveis ({e}); usando o avaliador direto")
+    return _tables
+
+
+def build(path: str = DEFAULT_PATH) -> int:
+    """Gera o arquivo de tabelas a partir do avaliador de referência; devolve o tamanho em bytes"""
+    from array import array
+    from .holdem_engine import HoldemTableState
+
+    reference = HoldemTableState(max_players=2)._evaluate_5_cards
+
+    def plain(ranks: Tuple[int, ...]) -> Tuple[int, Tuple[int, ...]]:
+        # naipes escolhidos para as 5 cartas nunca formarem flush
+        used: Dict[int, int] = {}
+        cards = []
+        for r in ranks:
+            cards.append(_RANKS[r] + _SUITS[(used.get(r, 0) + r) % 4])
+            used[r] = used.get(r, 0) + 1
+        rank, highs = reference(cards)
+        return rank, tuple(highs)
+
+    five: Dict[Tuple[int, ...], Tuple[int, Tuple[int, ...]]] = {}
+    for counts in _multisets(5):
+        ranks = tuple(r for r in range(13) for _ in range(counts[r]))
+        five[ranks] = plain(ranks)
+    suited: Dict[Tuple[int, ...], Tuple[int, Tuple[int, ...]]] = {}
+    for ranks in combinations(range(13), 5):
+        rank, highs = reference([_RANKS[r] + "S" for r in ranks])
+        suited[ranks] = (rank, tuple(highs))
+
+    strengths = sorted(set(five.values()) | set(suited.values()))
+    class_of = {value: i + 1 for i, value in enumerate(strengths)}
+
+    flush = array("H", bytes(2 * 8192))
+    for mask in range(8192):
+        ranks = tuple(r for r in range(13) if mask >> r & 1)
+        if 5 <= len(ranks) <= 7:
+            flush[mask] = max(class_of[suited[c]] for c in combinations(ranks, 5))
+
+    sections = [flush]
+    for k in (5, 6, 7):
+        table = array("H", bytes(2 * sum(1 for _ in _multisets(k))))
+        for counts in _multisets(k):
+            ranks = tuple(r for r in range(13) for _ in range(counts[r]))
+            table[_rank_index(counts)] = max(class_of[five[c]] for c in set(combinations(ranks, 5)))
+        sections.append(table)
+
+    classes = bytearray()
+    for rank, highs in strengths:
+        classes += bytes((rank, len(highs)) + highs + (0,) * (5 - len(highs)))
+
+    payload = b"".join(t.tobytes() for t in sections) + bytes(classes)
+    header = _HEADER.pack(MAGIC, TABLES_VERSION, len(strengths), *(len(t) for t in sections),
+                          hashlib.sha256(payload).digest())
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header.ljust(_HEADER_SIZE, b"\0"))
+        f.write(payload)
+    os.replace(tmp, path)  # workers que já abriram o arquivo antigo continuam com o mmap dele
+    return _HEADER_SIZE + len(payload)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    target = sys.argv[2] if len(sys.argv) > 2 else os.getenv("HAND_TABLES_PATH", DEFAULT_PATH)
+    if command == "build":
+        print(f"{target}: {build(target)} bytes")
+    elif command == "verify":
+        t = HandTables(target)
+        print(f"{target}: ok, versão {TABLES_VERSION}, {t.n_classes} classes, sha256 {t.digest}")
+    else:
+        sys.exit("uso: python -m app.game.hand_tables [build|verify] [arquivo]")
@@ -1,5 +1,10 @@
-from typing import List, Dict, Optional, Tuple, Any
-from .cards import standard_deck, shuffle_deck
+import copy
+from collections import deque
+from typing import Deque, List, Dict, Optional, Tuple, Any
+from .cards import shuffled_deck
+from .event_log import Event, EventLog, pack_deck, unpack_deck
+from .hand_tables import get_tables
+from .pot_ledger import PotLedger
 
 
 class HoldemTableState:
@@ -14,7 +19,9 @@ class HoldemTableState:
         self.started = False
         self.street = "preflop"  # preflop, flop, turn, river, showdown
         self.pot: int = 0
-        self.side_pots: List[Dict[str, Any]] = []  # side pots para all-ins
+        self.pot_ledger = PotLedger()  # potes (principal + side pots) mantidos a cada aposta
+        self.seats: Dict[str, int] = {}  # assento (bit do ledger) de cada jogador na mão
+        self.winners: Optional[List[str]] = None  # resultado do showdown (pago uma única vez)
         self.bets: Dict[str, int] = {}  # apostas da rodada atual
         self.total_committed: Dict[str, int] = {}  # total apostado na mão
         self.folded: Dict[str, bool] = {}
@@ -24,10 +31,92 @@ class HoldemTableState:
         self.last_raise_amount: int = 0  # valor do último raise para calcular min-raise
         self.dealer_index: int = 0  # índice do dealer
         self.last_action_index: int = 0  # rastreia onde a rodada começou
-        self.recent_actions: List[Dict[str, Any]] = []  # histórico de ações recentes
+        self.recent_actions: Deque[Dict[str, Any]] = deque(maxlen=10)  # últimas 10 ações (ring buffer)
         self.last_bettor: Optional[str] = None  # último jogador que apostou/raiseu (para showdown)
         self.sb_size: int = 5
         self.bb_size: int = 10
+        self.action_seq: int = 0  # incrementa a cada mudança de vez (mão, street, ação aplicada)
+        self._applying = False  # dentro de apply_action (next_street interno não é logado)
+        # log de eventos da mesa; estados reconstruídos por replay não têm log
+        self.log: Optional[EventLog] = EventLog(self.checkpoint())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado entre mãos (jogadores, stacks, botão) para hibernar a mesa"""
+        return {
+            "max_players": self.max_players,
+            "buy_in": self.buy_in,
+            "players": list(self.players),
+            "stacks": dict(self.stacks),
+            "dealer_index": self.dealer_index,
+            "sb_size": self.sb_size,
+            "bb_size": self.bb_size,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "HoldemTableState":
+        st = cls(max_players=data.get("max_players", 9), buy_in=data.get("buy_in", 1000))
+        for p in data.get("players", []):
+            st.add_player(p)
+        st.stacks.update(data.get("stacks", {}))
+        st.dealer_index = data.get("dealer_index", 0)
+        st.sb_size = data.get("sb_size", st.sb_size)
+        st.bb_size = data.get("bb_size", st.bb_size)
+        # o estado restaurado vira o ponto de partida do log
+        st.log = EventLog(st.checkpoint())
+        return st
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Cópia completa do estado (sem o log), usada como checkpoint do replay"""
+        return copy.deepcopy({k: v for k, v in self.__dict__.items() if k != "log"})
+
+    @classmethod
+    def from_checkpoint(cls, data: Dict[str, Any]) -> "HoldemTableState":
+        st = cls.__new__(cls)
+        st.__dict__.update(copy.deepcopy(data))
+        st.log = None
+        return st
+
+    @classmethod
+    def replay(cls, log: EventLog, upto: Optional[int] = None) -> "HoldemTableState":
+        """Reconstrói o estado a partir do checkpoint mais próximo (fast-forward até `upto`)"""
+        index, data = log.nearest_checkpoint(upto)
+        st = cls.from_checkpoint(data)
+        events = log.since(index) or []
+        if upto is not None:
+            events = events[:upto - index]
+        for event in events:
+            st.apply_event(event)
+        return st
+
+    def apply_event(self, event: Event) -> None:
+        """Reaplica um evento do log (caminho de replay)"""
+        kind = event[0]
+        if kind == "join":
+            self.add_player(event[1])
+        elif kind == "start":
+            self.start_hand(deck=unpack_deck(event[1]))
+        elif kind == "act":
+            self.apply_action(event[1], event[2], event[3])
+        elif kind == "street":
+            self.next_street()
+        elif kind == "showdown":
+            self.force_showdown()
+        elif kind == "payout":
+            self.get_winner()
+        elif kind == "reset":
+            self.reset_hand()
+        elif kind == "seat":
+            self.seat_player(event[1], event[2])
+        elif kind == "unseat":
+            self.unseat_player(event[1])
+        elif kind == "blinds":
+            self.set_blinds(event[1], event[2])
+        else:
+            raise ValueError(f"evento desconhecido: {kind}")
+
+    def _record(self, event: Event) -> None:
+        if self.log is not None:
+            self.log.append(event)
 
     def add_player(self, nick: str) -> bool:
         """Adiciona jogador à mesa. Retorna True se adicionado, False se mesa cheia."""
@@ -39,30 +128,78 @@ class HoldemTableState:
         self.stacks[nick] = self.buy_in
         self.total_committed[nick] = 0
         self.all_in[nick] = False
+        self._record(("join", nick))
         return True
 
-    def start_hand(self) -> None:
-        # remove jogadores com stack zero
-        self.players = [p for p in self.players if self.stacks.get(p, 0) > 0]
+    def seat_player(self, nick: str, stack: int) -> bool:
+        """Senta um jogador com um stack já existente (ex.: transferido de outra mesa de torneio)"""
+        if nick in self.players or len(self.players) >= self.max_players:
+            return False
+        self.players.append(nick)
+        self.stacks[nick] = stack
+        self.total_committed[nick] = 0
+        self.all_in[nick] = False
+        self._record(("seat", nick, stack))
+        return True
+
+    def unseat_player(self, nick: str) -> int:
+        """Remove um jogador entre mãos e retorna o stack dele; o botão continua no mesmo lugar"""
+        if nick not in self.players:
+            return 0
+        idx = self.players.index(nick)
+        self.players.pop(idx)
+        if idx <= self.dealer_index:
+            self.dealer_index -= 1
+        self.dealer_index = self.dealer_index % len(self.players) if self.players else 0
+        for d in (self.hole, self.bets, self.total_committed, self.folded, self.all_in):
+            d.pop(nick, None)
+        self._record(("unseat", nick))
+        return self.stacks.pop(nick, 0)
+
+    def set_blinds(self, sb: int, bb: int) -> None:
+        """Troca os blinds (vale a partir da próxima mão)"""
+        if (sb, bb) == (self.sb_size, self.bb_size):
+            return
+        self.sb_size = sb
+        self.bb_size = bb
+        self._record(("blinds", sb, bb))
+
+    def start_hand(self, deck: Optional[List[str]] = None) -> None:
+        """Inicia uma mão; `deck` (já embaralhado) é usado no replay em vez de embaralhar"""
+        # checkpoints periódicos são tirados entre mãos, antes de qualquer mutação
+        if self.log is not None and self.log.due_checkpoint():
+            self.log.add_checkpoint(self.checkpoint())
+        # remove jogadores com stack zero; o botão continua no mesmo lugar (como em unseat_player)
+        busted = [i for i, p in enumerate(self.players) if self.stacks.get(p, 0) <= 0]
+        if busted:
+            shift = sum(1 for i in busted if i <= self.dealer_index)
+            self.players = [p for p in self.players if self.stacks.get(p, 0) > 0]
+            self.dealer_index = (self.dealer_index - shift) % len(self.players) if self.players else 0
         if len(self.players) < 2:
+            self._record(("start", ""))  # a remoção acima também precisa ser reproduzida
             return
         
         # rotaciona dealer
         self.dealer_index = (self.dealer_index + 1) % len(self.players)
         
-        self.deck = standard_deck()
-        shuffle_deck(self.deck)
+        self.action_seq += 1
+        if deck is None:
+            deck = shuffled_deck()
+        self.deck = list(deck)
+        self._record(("start", pack_deck(self.deck)))
         self.community = []
         self.hole = {p: [self.deck.pop(), self.deck.pop()] for p in self.players}
         self.started = True
         self.street = "preflop"
         self.pot = 0
-        self.side_pots = []
+        self.pot_ledger.reset()
+        self.seats = {p: i for i, p in enumerate(self.players)}
+        self.winners = None
         self.bets = {p: 0 for p in self.players}
         self.total_committed = {p: 0 for p in self.players}
         self.folded = {p: False for p in self.players}
         self.all_in = {p: False for p in self.players}
-        self.recent_actions = []
+        self.recent_actions.clear()
         self.last_raise_amount = 0  # Reseta, BB não conta como raise inicial
         self.last_bettor = None  # Reseta último apostador
         
@@ -86,6 +223,9 @@ class HoldemTableState:
     def next_street(self) -> None:
         if not self.started:
             return
+        self.action_seq += 1
+        if not self._applying:
+            self._record(("street",))
         if self.street == "preflop":
             # burn 1, then flop 3
             if len(self.deck) >= 4:
@@ -120,15 +260,44 @@ class HoldemTableState:
             
             # Ação começa no primeiro jogador ativo à esquerda do dealer (small blind position)
             self.current_index = (self.dealer_index + 1) % len(self.players)
-            # Pula jogadores que foldaram ou estão all-in
-            while (self.folded.get(self.players[self.current_index], False) or 
-                   self.all_in.get(self.players[self.current_index], False)):
+            # Pula jogadores que foldaram ou estão all-in (no máximo uma volta: se
+            # ninguém pode agir, to_act() retorna None e a mão segue até o showdown)
+            for _ in range(len(self.players)):
+                p = self.players[self.current_index]
+                if not self.folded.get(p, False) and not self.all_in.get(p, False):
+                    break
                 self.current_index = (self.current_index + 1) % len(self.players)
             self.last_action_index = self.current_index
-            self.recent_actions = []  # limpa ações ao mudar de street
+            self.recent_actions.clear()  # limpa ações ao mudar de street
             self.last_raise_amount = 0  # reseta raise amount ao mudar de street
             self.last_bettor = None  # reseta último apostador na nova street
 
+    def force_showdown(self) -> None:
+        """Leva a mão direto ao showdown (ex.: só resta um jogador ou todos all-in)"""
+        if self.street == "showdown":
+            return
+        self.street = "showdown"
+        self._record(("showdown",))
+
+    def reset_hand(self) -> None:
+        """Aborta a mão em andamento (ex.: jogadores desconectaram)"""
+        if self.started and self.winners is None:
+            # mão abortada antes do pagamento: devolve o que cada um colocou no pote
+            for p, amt in self.total_committed.items():
+                if amt and p in self.stacks:
+                    self.stacks[p] += amt
+        self.started = False
+        self.community = []
+        self.hole = {}
+        self.street = "preflop"
+        self.pot = 0
+        self.bets = {}
+        self.total_committed = {p: 0 for p in self.players}
+        self.folded = {}
+        self.all_in = {p: False for p in self.players}
+        self.recent_actions.clear()
+        self._record(("reset",))
+
     def to_act(self) -> Optional[str]:
         if not self.players:
             return None
@@ -141,20 +310,26 @@ class HoldemTableState:
             idx = (idx + 1) % len(self.players)
         return None
 
+    def _acting_index(self, idx: int) -> int:
+        """Primeiro assento a partir de idx que ainda pode agir (não foldou nem está all-in)"""
+        for _ in range(len(self.players)):
+            p = self.players[idx % len(self.players)]
+            if not self.folded.get(p, False) and not self.all_in.get(p, False):
+                return idx % len(self.players)
+            idx += 1
+        return idx % len(self.players)
+
     def _next_index(self, idx: int) -> int:
         return (idx + 1) % len(self.players)
 
     def highest_bet(self) -> int:
-        """Retorna a maior aposta da rodada atual, considerando apenas jogadores ativos (não foldados e não all-in que já agiram)"""
+        """Retorna a maior aposta da rodada atual entre os jogadores não foldados"""
         if not self.bets:
             return 0
-        # Considera apenas jogadores ativos (não foldados) para calcular highest_bet
-        # Jogadores all-in não precisam igualar novas apostas
-        active_bets = {p: self.bets.get(p, 0) for p in self.players 
-                      if not self.folded.get(p, False) and not self.all_in.get(p, False)}
-        if not active_bets:
-            return 0
-        return max(active_bets.values())
+        # All-ins contam: quem ainda tem fichas precisa pagar (ou foldar) a aposta de um all-in;
+        # o all-in é que não precisa igualar apostas maiores (ver call_amount / side pots)
+        active_bets = [self.bets.get(p, 0) for p in self.players if not self.folded.get(p, False)]
+        return max(active_bets, default=0)
     
     def _commit_bet(self, nick: str, amount: int) -> int:
         """Commita aposta do stack, retorna quanto foi realmente pago (pode ser all-in)"""
@@ -167,9 +342,24 @@ class HoldemTableState:
         self.bets[nick] = self.bets.get(nick, 0) + actual_amount
         self.total_committed[nick] = self.total_committed.get(nick, 0) + actual_amount
         self.pot += actual_amount
-        if self.stacks[nick] == 0 and actual_amount > 0:
+        went_all_in = self.stacks[nick] == 0 and actual_amount > 0
+        if went_all_in:
             self.all_in[nick] = True
+        self.pot_ledger.commit(self._seat(nick), actual_amount, all_in=went_all_in)
         return actual_amount
+
+    def _seat(self, nick: str) -> int:
+        seat = self.seats.get(nick)
+        if seat is None:
+            # jogador fora do mapa da mão (ex.: entrou depois do start_hand)
+            seat = max(self.seats.values(), default=-1) + 1
+            self.seats[nick] = seat
+        return seat
+
+    def pots_view(self) -> List[Dict[str, Any]]:
+        """Totais por pote com os jogadores elegíveis, para mostrar durante a mão"""
+        by_seat = [p for p, _ in sorted(self.seats.items(), key=lambda x: x[1])]
+        return self.pot_ledger.view(by_seat)
     
     def call_amount(self, nick: str) -> int:
         """Retorna quanto o jogador precisa pagar para call"""
@@ -207,12 +397,31 @@ class HoldemTableState:
         return self.players[bb_idx]
 
     def apply_action(self, nick: str, action: str, amount: Optional[int] = None) -> None:
+        seq, index, had_bet = self.action_seq, self.current_index, nick in self.bets
+        self._applying = True
+        try:
+            self._apply_action(nick, action, amount)
+        finally:
+            self._applying = False
+        if self.action_seq != seq:
+            # só ações aceitas entram no log
+            self._record(("act", nick, action, amount))
+        else:
+            # ação recusada não deixa rastro (o replay não a vê)
+            self.current_index = index
+            if not had_bet:
+                self.bets.pop(nick, None)
+
+    def _apply_action(self, nick: str, action: str, amount: Optional[int] = None) -> None:
         if not self.started or nick != self.to_act():
             return
         if self.street == "showdown":
             return
         if self.all_in.get(nick, False):
             return  # jogador já está all-in
+        # current_index pode apontar para um jogador que foldou ou está all-in
+        # (to_act pula esses); ancora no assento de quem age para avançar a partir dele
+        self.current_index = self.players.index(nick)
         
         # Garante que o jogador está no dicionário bets
         if nick not in self.bets:
@@ -222,6 +431,7 @@ class HoldemTableState:
         
         if action == "fold":
             self.folded[nick] = True
+            self.pot_ledger.fold(self._seat(nick))
             self.current_index = self._next_index(self.current_index)
         elif action == "check":
             # só pode check se não há aposta pendente (todos têm a mesma aposta)
@@ -337,10 +547,9 @@ class HoldemTableState:
             
             self.current_index = self._next_index(self.current_index)
         
-        # registra ação no histórico (mantém apenas últimas 10)
+        # registra ação no histórico (o deque mantém apenas as últimas 10)
         self.recent_actions.append(action_record)
-        if len(self.recent_actions) > 10:
-            self.recent_actions.pop(0)
+        self.action_seq += 1
 
         # verifica se pode avançar street: todos ativos igualaram e todos agiram desde o último raise
         active = [p for p in self.players if not self.folded.get(p, False)]
@@ -372,7 +581,7 @@ class HoldemTableState:
         
         # Se a ação voltou ao last_action_index, todos já agiram desde o último raise/bet
         # Isso significa que a rodada pode avançar
-        if self.current_index == self.last_action_index:
+        if self._acting_index(self.current_index) == self._acting_index(self.last_action_index):
             self.next_street()
             return
         
@@ -481,49 +690,14 @@ class HoldemTableState:
     
     def evaluate_hand(self, cards: List[str]) -> Tuple[int, List[int]]:
         """Retorna (rank, high_cards) para a melhor combinação de 5 cartas dentre as cartas disponíveis"""
+        # 5 a 7 cartas: consulta nas tabelas pré-calculadas (mmap); sem o arquivo, avaliação direta
+        tables = get_tables()
+        if tables is not None:
+            result = tables.evaluate(cards)
+            if result is not None:
+                return result
         return self._best_5_card_hand(cards)
 
-    def _calculate_side_pots(self, all_hands: List[Tuple[str, int, List[int]]]) -> List[Tuple[List[str], int]]:
-        """Calcula side pots e retorna lista de (jogadores_eligíveis, valor_do_pote)"""
-        active = [p for p in self.players if not self.folded.get(p, False)]
-        if not active:
-            return []
-        
-        # ordena jogadores por total_committed (menor primeiro)
-        committed = sorted([(p, self.total_committed.get(p, 0)) for p in active], key=lambda x: x[1])
-        
-        side_pots: List[Tuple[List[str], int]] = []
-        remaining_pot = self.pot
-        
-        # processa cada nível de all-in
-        last_level = 0
-        for player, level in committed:
-            if level <= last_level:
-                continue
-            
-            # calcula pote deste nível
-            eligible_count = len([p for p, c in committed if c >= level])
-            pot_size = (level - last_level) * eligible_count
-            
-            if pot_size > remaining_pot:
-                pot_size = remaining_pot
-                remaining_pot = 0
-            else:
-                remaining_pot -= pot_size
-            
-            # jogadores elegíveis para este pote (que apostaram pelo menos até este nível)
-            eligible = [p for p, c in committed if c >= level]
-            
-            if pot_size > 0:
-                side_pots.append((eligible, pot_size))
-            
-            last_level = level
-            
-            if remaining_pot <= 0:
-                break
-        
-        return side_pots
-    
     def get_winner(self) -> Optional[List[str]]:
         """Retorna lista de vencedores (pode ser empate) e atualiza stacks com distribuição de potes"""
         if not self.started:
@@ -531,6 +705,9 @@ class HoldemTableState:
         # permite calcular vencedor se temos 5 cartas comunitárias ou se street é showdown
         if len(self.community) < 5 and self.street != "showdown":
             return None
+        # os potes são pagos uma única vez por mão; chamadas seguintes só consultam
+        if self.winners is not None:
+            return self.winners
         active_players = [p for p in self.players if not self.folded.get(p, False)]
         if len(active_players) == 0:
             return None
@@ -538,66 +715,54 @@ class HoldemTableState:
             winner = active_players[0]
             # dá o pote inteiro para o único jogador ativo
             self.stacks[winner] = self.stacks.get(winner, 0) + self.pot
-            return [winner]
+            self.winners = [winner]
+            self._record(("payout",))
+            return self.winners
         
         # avaliar todas as mãos (melhor combinação de 5 cartas entre hole + community)
-        all_hands = []
+        # e ordenar uma única vez da melhor para a pior
+        ranked = []
         for p in active_players:
-            hole = self.hole.get(p, [])
-            all_cards = hole + self.community
-            rank, highs = self.evaluate_hand(all_cards)
-            all_hands.append((p, rank, highs))
-        
-        # Ordenar mãos para determinar vencedores em cada side pot
-        # Cria dict de mãos por jogador para consulta rápida
-        hand_dict = {p: (rank, highs) for p, rank, highs in all_hands}
-        
-        # Calcula side pots
-        side_pots = self._calculate_side_pots(all_hands)
-        
-        # Se não há side pots (todos apostaram igual), distribui normalmente
-        if not side_pots:
-            # ordenar por rank desc, depois por highs desc (comparação de listas)
-            all_hands.sort(key=lambda x: (x[1], tuple(x[2])), reverse=True)
-            # pegar o(s) vencedor(es) com melhor rank/highs
-            best = all_hands[0]
-            best_tuple = (best[1], tuple(best[2]))
-            winners = [h[0] for h in all_hands if (h[1], tuple(h[2])) == best_tuple]
-            
-            if winners:
-                pot_per_winner = self.pot // len(winners)
-                remainder = self.pot % len(winners)
-                for w in winners:
-                    self.stacks[w] = self.stacks.get(w, 0) + pot_per_winner
-                if remainder > 0 and winners:
-                    self.stacks[winners[0]] = self.stacks.get(winners[0], 0) + remainder
-            
-            return winners if winners else None
-        
-        # Distribui side pots: cada pote vai para o(s) melhor(es) jogador(es) elegíveis
-        all_winners = set()
-        for eligible, pot_size in side_pots:
-            # Encontra melhor mão entre elegíveis
-            eligible_hands = [(p, hand_dict[p][0], hand_dict[p][1]) for p in eligible if p in hand_dict]
-            if not eligible_hands:
+            rank, highs = self.evaluate_hand(self.hole.get(p, []) + self.community)
+            ranked.append(((rank, tuple(highs)), self._seat(p), p))
+        ranked.sort(key=lambda x: x[0], reverse=True)
+        
+        # Distribui os potes do ledger: cada pote vai para o(s) melhor(es) elegíveis
+        all_winners: List[str] = []
+        carry = 0  # fichas de potes sem elegíveis (todos foldaram) descem para o próximo
+        for pot in reversed(self.pot_ledger.pots):
+            pot_size = pot.amount + carry
+            eligible = self.pot_ledger.eligible_mask(pot)
+            if pot_size <= 0:
                 continue
-            
-            eligible_hands.sort(key=lambda x: (x[1], tuple(x[2])), reverse=True)
-            best = eligible_hands[0]
-            best_tuple = (best[1], tuple(best[2]))
-            pot_winners = [h[0] for h in eligible_hands if (h[1], tuple(h[2])) == best_tuple]
+            if not eligible:
+                carry = pot_size
+                continue
+            carry = 0
+            pot_winners: List[str] = []
+            best = None
+            for strength, seat, p in ranked:
+                if not eligible >> seat & 1:
+                    continue
+                if best is None:
+                    best = strength
+                elif strength != best:
+                    break
+                pot_winners.append(p)
             
             # Distribui este pote entre vencedores
-            if pot_winners:
-                pot_per_winner = pot_size // len(pot_winners)
-                remainder = pot_size % len(pot_winners)
-                for w in pot_winners:
-                    self.stacks[w] = self.stacks.get(w, 0) + pot_per_winner
-                    all_winners.add(w)
-                if remainder > 0 and pot_winners:
-                    self.stacks[pot_winners[0]] = self.stacks.get(pot_winners[0], 0) + remainder
-        
-        return list(all_winners) if all_winners else None
+            pot_per_winner = pot_size // len(pot_winners)
+            remainder = pot_size % len(pot_winners)
+            for w in pot_winners:
+                self.stacks[w] = self.stacks.get(w, 0) + pot_per_winner
+                if w not in all_winners:
+                    all_winners.append(w)
+            if remainder > 0:
+                self.stacks[pot_winners[0]] = self.stacks.get(pot_winners[0], 0) + remainder
+        
+        self.winners = all_winners or None
+        self._record(("payout",))
+        return self.winners
     
     def get_showdown_order(self) -> List[str]:
         """Retorna ordem de showdown: quem apostou por último mostra primeiro, senão primeiro à esquerda do botão"""
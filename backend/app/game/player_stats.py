@@ -0,0 +1,117 @@
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Estatísticas de HUD por jogador (Hold'em):
+#   VPIP  % das mãos em que colocou fichas voluntariamente no preflop (call/raise/all-in)
+#   PFR   % das mãos em que deu raise no preflop
+#   AF    fator de agressão pós-flop: (bets + raises) / calls
+# Contadores em colunas (um array por contador, indexado pelo id do jogador):
+# cada ação custa O(1) e a leitura não consulta o banco.
+
+COUNTERS = ("hands", "vpip", "pfr", "aggr", "calls")
+
+_VOLUNTARY = ("call", "raise", "bet", "all_in")
+_AGGRESSIVE = ("raise", "bet", "all_in")
+
+
+class PlayerStats:
+    def __init__(self):
+        # início da contagem incremental: mãos encerradas antes disso vêm do histórico (ver merge)
+        self.since = time.time()
+        self.ids: Dict[str, int] = {}
+        self.nicks: List[str] = []
+        self.columns: Dict[str, array] = {name: array("q") for name in COUNTERS}
+        # mão em andamento por mesa: quem já contou VPIP / PFR nesta mão
+        self._vpip: Dict[str, Set[int]] = {}
+        self._pfr: Dict[str, Set[int]] = {}
+
+    def _id(self, nick: str) -> int:
+        pid = self.ids.get(nick)
+        if pid is None:
+            pid = self.ids[nick] = len(self.nicks)
+            self.nicks.append(nick)
+            for column in self.columns.values():
+                column.append(0)
+        return pid
+
+    # eventos do motor
+    def on_event(self, table_id: str, event: Tuple[Any, ...]) -> None:
+        """Consome os eventos emitidos por GameEngine (ver engines.py)"""
+        if event[0] == "start":
+            self.hand_started(table_id, event[1])
+        elif event[0] == "act":
+            self.action(table_id, event[1], event[2], event[4])
+
+    def hand_started(self, table_id: str, players: Sequence[str]) -> None:
+        hands = self.columns["hands"]
+        for nick in players:
+            hands[self._id(nick)] += 1
+        self._vpip[table_id] = set()
+        self._pfr[table_id] = set()
+
+    def action(self, table_id: str, nick: str, action: str, street: str) -> None:
+        pid = self._id(nick)
+        c = self.columns
+        if street == "preflop":
+            vpip = self._vpip.setdefault(table_id, set())
+            if action in _VOLUNTARY and pid not in vpip:
+                vpip.add(pid)
+                c["vpip"][pid] += 1
+            pfr = self._pfr.setdefault(table_id, set())
+            if action in _AGGRESSIVE and pid not in pfr:
+                pfr.add(pid)
+                c["pfr"][pid] += 1
+        elif action in _AGGRESSIVE:
+            c["aggr"][pid] += 1
+        elif action == "call":
+            c["calls"][pid] += 1
+
+    def forget_table(self, table_id: str) -> None:
+        self._vpip.pop(table_id, None)
+        self._pfr.pop(table_id, None)
+
+    # leitura
+    def get(self, nick: str) -> Optional[Dict[str, Any]]:
+        pid = self.ids.get(nick)
+        if pid is None:
+            return None
+        counts = {name: self.columns[name][pid] for name in COUNTERS}
+        return summarize(counts)
+
+    def view(self, players: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Stats dos jogadores sentados (campo opcional dos frames de estado)"""
+        return {p: s for p in players if (s := self.get(p)) is not None}
+
+    # recálculo a partir do histórico
+    @classmethod
+    def from_history(cls, hands: Iterable[Tuple[List[str], List[List[Any]]]]) -> "PlayerStats":
+        """Contadores de um histórico de mãos, consumido em streaming.
+
+        `hands` traz (jogadores, ações) por mão, com ações [nick, ação, valor, street]
+        (formato de HandRecord.data["actions"]); a memória não depende do tamanho do histórico.
+        """
+        stats = cls()
+        for players, actions in hands:
+            stats.hand_started("", players)
+            for nick, action, _amount, street in actions:
+                stats.action("", nick, action, street)
+        stats.forget_table("")
+        return stats
+
+    def merge(self, other: "PlayerStats") -> None:
+        """Soma os contadores de `other` (ex.: histórico anterior a `since`) aos incrementais."""
+        for nick, pid in other.ids.items():
+            mine = self._id(nick)
+            for name in COUNTERS:
+                self.columns[name][mine] += other.columns[name][pid]
+
+
+def summarize(counts: Dict[str, int]) -> Dict[str, Any]:
+    hands = counts["hands"]
+    return {
+        "hands": hands,
+        "vpip": round(100 * counts["vpip"] / hands, 1) if hands else 0.0,
+        "pfr": round(100 * counts["pfr"] / hands, 1) if hands else 0.0,
+        "af": round(counts["aggr"] / counts["calls"], 2) if counts["calls"] else None,
+    }
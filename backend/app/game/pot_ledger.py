@@ -0,0 +1,98 @@
+from typing import Any, Dict, List, Optional
+
+
+class Pot:
+    """Faixa de apostas (floor, cap] de uma mão. cap=None é o pote principal aberto."""
+
+    __slots__ = ("floor", "cap", "amount", "mask")
+
+    def __init__(self, floor: int, cap: Optional[int], amount: int = 0, mask: int = 0):
+        self.floor = floor
+        self.cap = cap
+        self.amount = amount
+        self.mask = mask  # bitmask dos assentos que contribuíram para este pote
+
+
+class PotLedger:
+    """Livro de potes mantido incrementalmente à medida que as fichas são commitadas.
+
+    Cada all-in cria (no máximo) um novo nível, dividindo o pote que o contém;
+    as demais apostas apenas somam nos potes cobertos. No showdown basta uma
+    passada linear pelos potes usando os bitmasks de elegibilidade.
+    """
+
+    def __init__(self):
+        self.pots: List[Pot] = [Pot(0, None)]
+        self.committed: Dict[int, int] = {}  # total apostado na mão por assento
+        self.folded_mask: int = 0
+
+    def reset(self) -> None:
+        self.pots = [Pot(0, None)]
+        self.committed = {}
+        self.folded_mask = 0
+
+    def total(self) -> int:
+        return sum(p.amount for p in self.pots)
+
+    def commit(self, seat: int, amount: int, all_in: bool = False) -> None:
+        """Registra `amount` fichas do assento; `all_in` fixa um teto no novo total."""
+        prev = self.committed.get(seat, 0)
+        new = prev + amount
+        if all_in:
+            self._split_at(new)
+        self.committed[seat] = new
+        if amount <= 0:
+            return
+        bit = 1 << seat
+        for pot in self.pots:
+            if pot.floor >= new:
+                break
+            if pot.cap is not None and pot.cap <= prev:
+                continue
+            top = new if pot.cap is None else min(new, pot.cap)
+            pot.amount += top - max(prev, pot.floor)
+            pot.mask |= bit
+
+    def fold(self, seat: int) -> None:
+        self.folded_mask |= 1 << seat
+
+    def eligible_mask(self, pot: Pot) -> int:
+        return pot.mask & ~self.folded_mask
+
+    def _split_at(self, level: int) -> None:
+        """Garante que exista um teto exatamente em `level`."""
+        for i, pot in enumerate(self.pots):
+            if level <= pot.floor:
+                return
+            if pot.cap is not None and level > pot.cap:
+                continue
+            if pot.cap == level:
+                return
+            lower = Pot(pot.floor, level)
+            upper = Pot(level, pot.cap)
+            mask = pot.mask
+            while mask:
+                low_bit = mask & -mask
+                seat = low_bit.bit_length() - 1
+                mask ^= low_bit
+                c = self.committed.get(seat, 0)
+                lower.amount += min(c, level) - pot.floor
+                lower.mask |= low_bit
+                if c > level:
+                    upper.amount += (c if pot.cap is None else min(c, pot.cap)) - level
+                    upper.mask |= low_bit
+            self.pots[i:i + 1] = [lower, upper]
+            return
+
+    def view(self, players: List[str]) -> List[Dict[str, Any]]:
+        """Totais por pote (com jogadores elegíveis) para exibição durante a mão."""
+        out = []
+        for pot in self.pots:
+            if pot.amount <= 0:
+                continue
+            eligible = self.eligible_mask(pot)
+            out.append({
+                "amount": pot.amount,
+                "eligible": [p for i, p in enumerate(players) if eligible >> i & 1],
+            })
+        return out
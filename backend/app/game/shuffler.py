@@ -0,0 +1,159 @@
+import os
+import random
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+# Embaralhamento das mesas. Duas fontes:
+#   SecureShuffler: Fisher–Yates com bytes do CSPRNG do sistema (os.urandom),
+#                   lidos em lotes para amortizar as chamadas ao SO
+#   SeededShuffler: determinístico a partir de uma semente (benchmarks/testes);
+#                   ativado para o processo inteiro com SHUFFLE_SEED
+# O replay de mãos não depende do embaralhador: o baralho de cada mão vai para o event log.
+
+
+class Shuffler(ABC):
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _below(self, n: int) -> int:
+        """Inteiro uniforme em [0, n)"""
+
+    def shuffle(self, items: List) -> None:
+        """Fisher–Yates in-place"""
+        below = self._below
+        with self._lock:
+            for i in range(len(items) - 1, 0, -1):
+                j = below(i + 1)
+                items[i], items[j] = items[j], items[i]
+
+
+class SecureShuffler(Shuffler):
+    def __init__(self, batch_bytes: Optional[int] = None):
+        super().__init__()
+        batch = batch_bytes or int(os.getenv("SHUFFLE_ENTROPY_BYTES", "4096"))
+        self.batch_words = max(1, batch // 4)
+        self._words = array("I")
+        self._pos = 0
+        self.refills = 0
+
+    def _refill(self) -> None:
+        words = array("I")
+        words.frombytes(os.urandom(self.batch_words * words.itemsize))
+        self._words = words
+        self._pos = 0
+        self.refills += 1
+
+    def _below(self, n: int) -> int:
+        # rejeição: descarta palavras acima do maior múltiplo de n (sem viés de módulo)
+        span = 1 << (8 * self._words.itemsize)
+        limit = span - span % n
+        while True:
+            if self._pos >= len(self._words):
+                self._refill()
+            w = self._words[self._pos]
+            self._pos += 1
+            if w < limit:
+                return w % n
+
+
+class SeededShuffler(Shuffler):
+    def __init__(self, seed: int):
+        super().__init__()
+        self.seed = seed
+        self._rng = random.Random(seed)
+
+    def _below(self, n: int) -> int:
+        return self._rng.randrange(n)
+
+
+class DeckPool:
+    """Baralhos já embaralhados, gerados fora do caminho de start_hand.
+
+    Uma thread daemon repõe o pool quando ele cai abaixo da metade; se
+    esvaziar, take() embaralha na hora. Geração e retirada compartilham
+    um lock, então a ordem dos baralhos segue a ordem do embaralhador
+    (com SHUFFLE_SEED a sequência de mãos é reprodutível).
+    """
+
+    def __init__(self, template: Sequence, shuffler: Shuffler, size: Optional[int] = None):
+        self.template = list(template)
+        self.shuffler = shuffler
+        self.size = size if size is not None else int(os.getenv("SHUFFLE_POOL_SIZE", "64"))
+        self._decks: Deque[List] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _generate(self) -> List:
+        deck = list(self.template)
+        self.shuffler.shuffle(deck)
+        return deck
+
+    def take(self) -> List:
+        with self._lock:
+            if self._decks:
+                deck = self._decks.popleft()
+                self.hits += 1
+            else:
+                deck = self._generate()
+                self.misses += 1
+            low = len(self._decks) < self.size // 2
+        if low and self.size > 0:
+            self._ensure_thread()
+            self._wake.set()
+        return deck
+
+    def fill(self) -> None:
+        while True:
+            with self._lock:
+                if len(self._decks) >= self.size:
+                    return
+                self._decks.append(self._generate())
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="deck-pool", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.fill()
+            except Exception as e:
+                print(f"[ERROR] Erro ao repor o pool de baralhos: {e}")
+
+
+_shuffler: Optional[Shuffler] = None
+_pools: Dict[Tuple, DeckPool] = {}
+
+
+def get_shuffler() -> Shuffler:
+    global _shuffler
+    if _shuffler is None:
+        seed = os.getenv("SHUFFLE_SEED")
+        _shuffler = SeededShuffler(int(seed)) if seed else SecureShuffler()
+    return _shuffler
+
+
+def set_shuffler(shuffler: Shuffler) -> None:
+    """Troca o embaralhador do processo (descarta os baralhos já gerados)"""
+    global _shuffler
+    _shuffler = shuffler
+    _pools.clear()
+
+
+def shuffled(template: Sequence) -> List:
+    """Cópia embaralhada de `template`, servida pelo pool daquele baralho"""
+    key = tuple(template)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = DeckPool(key, get_shuffler())
+    return pool.take()
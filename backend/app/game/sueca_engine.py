@@ -1,4 +1,6 @@
-from typing import List
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from .shuffler import shuffled
 
 SUECA_RANKS = ["A", "7", "K", "J", "Q", "6", "5", "4", "3", "2"]
 SUECA_SUITS = ["S", "H", "D", "C"]
@@ -9,3 +11,201 @@ def sueca_deck() -> List[str]:
     return [r + s for s in SUECA_SUITS for r in SUECA_RANKS]
 
 
+# Cartas como inteiros 0..39: carta = naipe * 10 + posição do rank em SUECA_RANKS
+# (0 = A, a mais forte). Todas as consultas abaixo são tabelas pré-calculadas.
+CARD_NAMES: List[str] = sueca_deck()
+CARD_INDEX: Dict[str, int] = {name: i for i, name in enumerate(CARD_NAMES)}
+SUIT_OF: List[int] = [i // 10 for i in range(40)]
+STRENGTH: List[int] = [9 - i % 10 for i in range(40)]  # maior = mais forte
+_RANK_POINTS = {"A": 11, "7": 10, "K": 4, "J": 3, "Q": 2}
+POINTS: List[int] = [_RANK_POINTS.get(name[0], 0) for name in CARD_NAMES]
+SUIT_MASKS: List[int] = [((1 << 10) - 1) << (10 * s) for s in range(4)]
+# TRICK_KEY[trunfo][naipe de saída][carta]: quem tem a maior chave ganha a vaza
+TRICK_KEY: List[List[List[int]]] = [
+    [[STRENGTH[c] + (10 if SUIT_OF[c] == led else 0) + (20 if SUIT_OF[c] == trump else 0) for c in range(40)]
+     for led in range(4)]
+    for trump in range(4)
+]
+TOTAL_POINTS = 120
+_SUECA_DECK = tuple(range(40))
+
+
+def hand_game_points(points: int) -> int:
+    """Pontos de jogo da equipe com `points` na mão: 61-90 = 1, 91-119 = 2, 120 = 4"""
+    if points == TOTAL_POINTS:
+        return 4
+    if points >= 91:
+        return 2
+    if points >= 61:
+        return 1
+    return 0
+
+
+class SuecaTableState:
+    """Mesa de Sueca: 4 jogadores, equipes (0, 2) x (1, 3), 10 vazas por mão.
+
+    As mãos são bitmasks de 40 bits, então verificar se o jogador tem o
+    naipe de saída é um AND com SUIT_MASKS e resolver a vaza é uma consulta
+    em TRICK_KEY por carta.
+    """
+
+    def __init__(self, max_players: int = 4):
+        self.max_players = max_players
+        self.players: List[str] = []
+        self.hands: List[int] = [0, 0, 0, 0]  # bitmask das cartas de cada assento
+        self.started = False
+        self.finished = False  # mão terminou (todas as vazas jogadas)
+        self.dealer_index: int = 0
+        self.current: int = 0  # assento da vez
+        self.trump: int = 0
+        self.trump_card: Optional[int] = None  # carta virada que define o trunfo
+        self.trick: List[Tuple[int, int]] = []  # (assento, carta) da vaza em andamento
+        self.last_trick: List[Tuple[int, int]] = []
+        self.last_trick_winner: Optional[int] = None
+        self.tricks_played: int = 0
+        self.points: List[int] = [0, 0]  # pontos das equipes na mão atual
+        self.score: List[int] = [0, 0]  # pontos de jogo acumulados
+        self.recent_actions: Deque[Dict[str, Any]] = deque(maxlen=10)
+        self.action_seq: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado entre mãos (jogadores, dealer, placar) para hibernar a mesa"""
+        return {
+            "max_players": self.max_players,
+            "players": list(self.players),
+            "dealer_index": self.dealer_index,
+            "score": list(self.score),
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "SuecaTableState":
+        st = cls(max_players=data.get("max_players", 4))
+        for p in data.get("players", []):
+            st.add_player(p)
+        st.dealer_index = data.get("dealer_index", 0)
+        st.score = list(data.get("score", [0, 0]))
+        return st
+
+    def add_player(self, nick: str) -> bool:
+        """Adiciona jogador à mesa. Retorna True se adicionado, False se mesa cheia."""
+        if nick in self.players:
+            return True
+        if len(self.players) >= self.max_players:
+            return False
+        self.players.append(nick)
+        return True
+
+    def start_hand(self, deck: Optional[List[int]] = None) -> bool:
+        """Distribui 10 cartas a cada jogador; o trunfo é a última carta do dealer"""
+        if len(self.players) != 4:
+            return False
+        if self.started:
+            self.dealer_index = (self.dealer_index + 1) % 4
+        if deck is None:
+            deck = shuffled(_SUECA_DECK)
+        # distribuição começa à direita do dealer; o dealer recebe as últimas 10
+        self.hands = [0, 0, 0, 0]
+        for i in range(4):
+            seat = (self.dealer_index + 1 + i) % 4
+            for card in deck[i * 10:(i + 1) * 10]:
+                self.hands[seat] |= 1 << card
+        self.trump_card = deck[39]
+        self.trump = SUIT_OF[self.trump_card]
+        self.started = True
+        self.finished = False
+        self.current = (self.dealer_index + 1) % 4
+        self.trick = []
+        self.last_trick = []
+        self.last_trick_winner = None
+        self.tricks_played = 0
+        self.points = [0, 0]
+        self.recent_actions.clear()
+        self.action_seq += 1
+        return True
+
+    def reset_hand(self) -> None:
+        """Descarta a mão atual (ex.: a formação da mesa mudou); o placar fica com quem chamou"""
+        self.started = False
+        self.finished = False
+        self.hands = [0, 0, 0, 0]
+        self.trump_card = None
+        self.trick = []
+        self.last_trick = []
+        self.last_trick_winner = None
+        self.tricks_played = 0
+        self.points = [0, 0]
+        self.action_seq += 1
+
+    def seat_of(self, nick: str) -> Optional[int]:
+        try:
+            return self.players.index(nick)
+        except ValueError:
+            return None
+
+    def to_act(self) -> Optional[str]:
+        if not self.started or self.finished:
+            return None
+        return self.players[self.current]
+
+    def led_suit(self) -> Optional[int]:
+        return SUIT_OF[self.trick[0][1]] if self.trick else None
+
+    def is_legal(self, seat: int, card: int) -> bool:
+        hand = self.hands[seat]
+        if not hand >> card & 1:
+            return False
+        led = self.led_suit()
+        # tem de assistir (seguir o naipe de saída) se puder
+        if led is not None and SUIT_OF[card] != led and hand & SUIT_MASKS[led]:
+            return False
+        return True
+
+    def legal_cards(self, seat: int) -> List[int]:
+        hand = self.hands[seat]
+        led = self.led_suit()
+        if led is not None and hand & SUIT_MASKS[led]:
+            hand &= SUIT_MASKS[led]
+        return [c for c in range(40) if hand >> c & 1]
+
+    def play(self, nick: str, card_name: str) -> bool:
+        """Joga uma carta. Retorna False se a jogada não é válida."""
+        if not self.started or self.finished or nick != self.to_act():
+            return False
+        card = CARD_INDEX.get(card_name)
+        if card is None or not self.is_legal(self.current, card):
+            return False
+        seat = self.current
+        self.hands[seat] &= ~(1 << card)
+        self.trick.append((seat, card))
+        self.recent_actions.append({"player": nick, "action": "play", "card": card_name})
+        self.action_seq += 1
+        if len(self.trick) < 4:
+            self.current = (seat + 1) % 4
+            return True
+        self._resolve_trick()
+        return True
+
+    def _resolve_trick(self) -> None:
+        keys = TRICK_KEY[self.trump][SUIT_OF[self.trick[0][1]]]
+        winner, _ = max(self.trick, key=lambda sc: keys[sc[1]])
+        self.points[winner % 2] += sum(POINTS[c] for _, c in self.trick)
+        self.last_trick = self.trick
+        self.last_trick_winner = winner
+        self.trick = []
+        self.tricks_played += 1
+        self.current = winner
+        if self.tricks_played == 10:
+            self._finish_hand()
+
+    def _finish_hand(self) -> None:
+        self.finished = True
+        # 60 x 60 é empate; caso contrário a equipe com mais pontos marca
+        for team in (0, 1):
+            self.score[team] += hand_game_points(self.points[team])
+
+    def card_names(self, seat: int) -> List[str]:
+        hand = self.hands[seat]
+        return [CARD_NAMES[c] for c in range(40) if hand >> c & 1]
+
+    def hand_counts(self) -> Dict[str, int]:
+        return {p: bin(self.hands[i]).count("1") for i, p in enumerate(self.players)}
@@ -0,0 +1,189 @@
+import heapq
+import itertools
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from .holdem_engine import HoldemTableState
+
+
+class BlindLevel(NamedTuple):
+    sb: int
+    bb: int
+
+
+DEFAULT_BLIND_LEVELS: List[BlindLevel] = [
+    BlindLevel(sb, sb * 2) for sb in (5, 10, 15, 25, 50, 75, 100, 150, 200, 300, 400, 600, 800, 1000, 1500, 2000)
+]
+
+
+class BlindSchedule:
+    """Níveis de blinds por tempo; depois do último nível, o último vale até o fim."""
+
+    def __init__(self, levels: Optional[List[BlindLevel]] = None, level_seconds: Optional[float] = None):
+        self.levels = levels or DEFAULT_BLIND_LEVELS
+        self.level_seconds = level_seconds if level_seconds is not None else float(os.getenv("MTT_LEVEL_SECONDS", "600"))
+
+    def level_index(self, elapsed: float) -> int:
+        return min(int(elapsed // self.level_seconds), len(self.levels) - 1)
+
+    def level_at(self, elapsed: float) -> BlindLevel:
+        return self.levels[self.level_index(elapsed)]
+
+
+class Move(NamedTuple):
+    nick: str
+    source: str
+    target: str
+
+
+class HandResult(NamedTuple):
+    """Efeito do fim de uma mão: jogadores eliminados, transferências e mesas a atualizar."""
+    eliminated: List[str]
+    moves: List[Move]
+    broken: Optional[str]  # mesa desfeita (se houver)
+    tables: Set[str]  # mesas afetadas (um broadcast por mesa)
+
+
+class Tournament:
+    """Torneio multi-mesa (MTT): várias HoldemTableState com balanceamento de assentos.
+
+    O balanceamento roda em `hand_finished`, quando a mesa está entre mãos:
+    a mesa desfeita ou a maior cede jogadores para as menores, escolhidas num
+    heap de tamanhos de mesa (O(log mesas) por movimento). Entradas antigas do
+    heap são invalidadas por versão, como no TimerScheduler. Jogadores
+    transferidos para uma mesa com mão em andamento esperam em `pending` e
+    sentam quando essa mão termina.
+    """
+
+    def __init__(self, tournament_id: str, players: List[str], *, table_size: int = 9,
+                 starting_stack: Optional[int] = None, schedule: Optional[BlindSchedule] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if len(set(players)) != len(players):
+            raise ValueError("jogadores duplicados no torneio")
+        self.id = tournament_id
+        self.table_size = table_size
+        self.starting_stack = starting_stack if starting_stack is not None else int(os.getenv("MTT_STARTING_STACK", "10000"))
+        self.schedule = schedule or BlindSchedule()
+        self.clock = clock
+        self.started_at = clock()
+        self.tables: Dict[str, HoldemTableState] = {}
+        self.pending: Dict[str, List[Tuple[str, int]]] = {}  # {table_id: [(nick, stack)]} aguardando a mão acabar
+        self.table_of: Dict[str, str] = {}  # {nick: table_id}
+        self.finish_order: List[str] = []  # eliminados, do primeiro ao último
+        self._heap: List[Tuple[int, int, str]] = []  # (tamanho, versão, table_id)
+        self._version: Dict[str, int] = {}
+        self._versions = itertools.count()
+        self._seat_all(players)
+
+    def _seat_all(self, players: List[str]) -> None:
+        n_tables = max(1, -(-len(players) // self.table_size))
+        ids = [f"{self.id}-t{i + 1}" for i in range(n_tables)]
+        level = self.level()
+        for table_id in ids:
+            st = HoldemTableState(max_players=self.table_size, buy_in=self.starting_stack)
+            st.set_blinds(level.sb, level.bb)
+            self.tables[table_id] = st
+            self.pending[table_id] = []
+        # distribuição round-robin: as mesas ficam com no máximo 1 jogador de diferença
+        for i, nick in enumerate(players):
+            table_id = ids[i % n_tables]
+            self.tables[table_id].seat_player(nick, self.starting_stack)
+            self.table_of[nick] = table_id
+        for table_id in ids:
+            self._push(table_id)
+
+    # tamanhos / heap
+    def size(self, table_id: str) -> int:
+        return len(self.tables[table_id].players) + len(self.pending[table_id])
+
+    def remaining(self) -> int:
+        return len(self.table_of)
+
+    def _push(self, table_id: str) -> None:
+        version = next(self._versions)
+        self._version[table_id] = version
+        heapq.heappush(self._heap, (self.size(table_id), version, table_id))
+
+    def _smallest(self) -> Optional[str]:
+        while self._heap:
+            _, version, table_id = self._heap[0]
+            if self._version.get(table_id) == version:
+                return table_id
+            heapq.heappop(self._heap)  # entrada antiga (mesa mudou de tamanho ou foi desfeita)
+        return None
+
+    # blinds
+    def level(self) -> BlindLevel:
+        return self.schedule.level_at(self.clock() - self.started_at)
+
+    def level_index(self) -> int:
+        return self.schedule.level_index(self.clock() - self.started_at)
+
+    # transferências
+    def _in_hand(self, table_id: str) -> bool:
+        st = self.tables[table_id]
+        return st.started and st.street != "showdown"
+
+    def _move(self, nick: str, source: str, target: str) -> Move:
+        """Transfere um jogador (com o stack) de uma mesa entre mãos para outra, numa única etapa"""
+        stack = self.tables[source].unseat_player(nick)
+        if self._in_hand(target):
+            self.pending[target].append((nick, stack))
+        else:
+            self.tables[target].seat_player(nick, stack)
+        self.table_of[nick] = target
+        self._push(target)
+        return Move(nick, source, target)
+
+    def _pick_mover(self, table_id: str) -> str:
+        # move quem está mais longe de pagar o big blind: o jogador logo após o BB
+        st = self.tables[table_id]
+        return st.players[(st.dealer_index + 3) % len(st.players)]
+
+    def hand_finished(self, table_id: str) -> HandResult:
+        """Fim de mão na mesa: senta os pendentes, elimina quem zerou, aplica o nível e balanceia."""
+        st = self.tables[table_id]
+        affected: Set[str] = {table_id}
+        for nick, stack in self.pending[table_id]:
+            st.seat_player(nick, stack)
+        self.pending[table_id] = []
+        eliminated = [p for p in st.players if st.stacks.get(p, 0) <= 0]
+        for nick in eliminated:
+            st.unseat_player(nick)
+            del self.table_of[nick]
+            self.finish_order.append(nick)
+        level = self.level()
+        st.set_blinds(level.sb, level.bb)
+        moves: List[Move] = []
+        broken = None
+        self._push(table_id)
+        if len(self.tables) > 1 and self.remaining() <= (len(self.tables) - 1) * self.table_size:
+            # cabe em uma mesa a menos: desfaz esta (está entre mãos) e espalha pelas menores
+            broken = table_id
+            self._version.pop(table_id)
+            for nick in list(st.players):
+                target = self._smallest()
+                moves.append(self._move(nick, table_id, target))
+                affected.add(target)
+            del self.tables[table_id]
+            del self.pending[table_id]
+        else:
+            # balanceia: esta mesa cede jogadores enquanto tiver 2+ a mais que a menor
+            while True:
+                target = self._smallest()
+                if target is None or target == table_id or self.size(table_id) - self.size(target) <= 1:
+                    break
+                moves.append(self._move(self._pick_mover(table_id), table_id, target))
+                affected.add(target)
+                self._push(table_id)
+        return HandResult(eliminated, moves, broken, affected)
+
+    def finished(self) -> bool:
+        return self.remaining() <= 1
+
+    def winner(self) -> Optional[str]:
+        return next(iter(self.table_of)) if self.finished() and self.table_of else None
+
+    def standings(self) -> List[str]:
+        """Classificação final: vencedor primeiro, depois eliminados do último ao primeiro"""
+        return ([self.winner()] if self.winner() else []) + self.finish_order[::-1]
@@ -1,11 +1,30 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.websockets import WebSocketState
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import asyncio
+import gc
 import os
+import resource
+import secrets
+import signal
+import threading
 import uuid
 
 from .realtime.manager import ConnectionManager
+from .realtime.bots import BotRunner
+from .realtime.compression import DICTIONARY_ID, SHARED_DICTIONARY
+from .realtime.quotas import ClientBuckets, client_identity
+from .game.equity import equity
+from .game.hand_tables import get_tables
+from .game.player_stats import PlayerStats
+from .services.hand_history import gzip_chunks, holdem_actions, iter_hands, ndjson_lines
+from .services.introspection import LoopSampler, MemoryTracer
+from .services.leaderboard import RedisBoards
+from .services.persistence import get_redis
+from .services.readiness import FirstRequestTimer, Readiness
 from .deps import init_db
 
 
@@ -25,24 +44,244 @@ app.add_middleware(
 )
 
 manager = ConnectionManager()
+bots = BotRunner(manager)
+readiness = Readiness()
+app.add_middleware(FirstRequestTimer, readiness=readiness)
+
+
+async def _init_database() -> None:
+    await asyncio.get_running_loop().run_in_executor(None, init_db)
+
+
+async def _init_player_stats() -> None:
+    # stats de HUD: o histórico (mãos anteriores ao início deste nó) é lido em páginas e
+    # agregado fora do loop num PlayerStats separado; no loop só soma aos incrementais,
+    # então as mãos jogadas enquanto isso (STARTUP_MODE=background) não se perdem.
+    stats = manager.player_stats
+    history = await asyncio.get_running_loop().run_in_executor(
+        None, lambda: PlayerStats.from_history(holdem_actions(before=stats.since)))
+    stats.merge(history)
+
+
+async def _init_evaluator_tables() -> None:
+    # abre (mmap) e confere o checksum antes da primeira mão, fora do loop
+    if await asyncio.get_running_loop().run_in_executor(None, get_tables) is None:
+        raise RuntimeError("usando o avaliador direto")
+
+
+async def _init_redis() -> None:
+    await (await get_redis()).ping()
+
+
+readiness.add("database", _init_database)
+if os.getenv("PLAYER_STATS_RECOMPUTE", "1").lower() in ("1", "true", "yes", "on"):
+    readiness.add("playerStats", _init_player_stats, after="database")
+readiness.add("evaluatorTables", _init_evaluator_tables, required=False)
+if manager.lifecycle.hibernate or isinstance(manager.leaderboard.backend, RedisBoards):
+    # Redis só é aquecido quando alguma feature usa; falha não tira o nó do ar (há fallback)
+    readiness.add("redis", _init_redis, required=False)
+
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    init_db()
+    # STARTUP_MODE=background: o servidor aceita conexões antes do banco/stats ficarem prontos
+    await readiness.start()
+    manager.scheduler.start()
+    # SIGUSR1 coloca o nó em drain (o deploy manda o SIGTERM depois que o drain termina)
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, manager.start_drain)
+    except (NotImplementedError, AttributeError, RuntimeError):
+        pass  # sem suporte a sinais (ex.: Windows)
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    bots.shutdown()
+    # mesas que ainda estão no nó vão para o store compartilhado antes de sair
+    if manager.connections or (manager.draining is not None and not manager.draining["done"]):
+        await manager.finish_drain()
+    await manager.hand_history.flush()
 
 
 @app.get("/health")
 async def health() -> JSONResponse:
+    # em drain o balanceador deixa de mandar clientes novos para o nó
+    if manager.draining is not None:
+        return JSONResponse({"status": "draining"}, status_code=503)
     return JSONResponse({"status": "ok"})
 
 
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """Pronto para tráfego completo (banco e stats carregados); 503 enquanto inicializa"""
+    return JSONResponse(readiness.view(), status_code=200 if readiness.ready else 503)
+
+
+def _is_admin(request: Request) -> bool:
+    """Rotas de admin exigem o header X-Admin-Token igual a ADMIN_TOKEN (desligadas sem ADMIN_TOKEN)"""
+    token = os.getenv("ADMIN_TOKEN")
+    return bool(token) and secrets.compare_digest(request.headers.get("x-admin-token", ""), token)
+
+
+_FORBIDDEN = {"error": "Não autorizado"}
+
+
+class DrainRequest(BaseModel):
+    deadline_seconds: Optional[float] = Field(None, ge=0, le=3600)
+    target: Optional[str] = Field(None, max_length=500)
+
+
+@app.post("/api/admin/drain")
+async def start_drain(request: Request, body: DrainRequest) -> JSONResponse:
+    """Coloca o nó em drain: mãos em andamento terminam, depois os clientes recebem reconnect"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    return JSONResponse(manager.start_drain(deadline_seconds=body.deadline_seconds, target=body.target), status_code=202)
+
+
+@app.get("/api/admin/drain")
+async def drain_status(request: Request) -> JSONResponse:
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    return JSONResponse(manager.drain_status())
+
+
+memory_tracer = MemoryTracer()
+_profile_lock = asyncio.Lock()
+
+
+@app.get("/api/admin/node")
+async def admin_node(request: Request) -> JSONResponse:
+    """Visão geral do nó: conexões, filas pendentes, tasks e memória do processo"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    return JSONResponse({
+        "tables": len(manager.lobby.entries),
+        "connections": len(manager.connections),
+        "queues": manager.queue_depths(),
+        "tasks": len(asyncio.all_tasks()),
+        "heartbeat": {"pings": manager.heartbeat.pings, "dropped": manager.heartbeat.dropped},
+        "maxRssKb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "gc": gc.get_count(),
+        "tracemalloc": memory_tracer.tracing,
+        "evaluatorTables": _tables_view(),
+    })
+
+
+def _tables_view() -> Optional[dict]:
+    tables = get_tables()
+    if tables is None:
+        return None
+    return {"path": tables.path, "bytes": tables.size, "sha256": tables.digest}
+
+
+@app.get("/api/admin/quotas")
+async def admin_quotas(request: Request, top: int = Query(20, ge=1, le=500)) -> JSONResponse:
+    """Uso das quotas por cliente/origem, mesas em throttling e recusas"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    return JSONResponse(manager.quotas.view(top))
+
+
+@app.get("/api/admin/tables")
+async def admin_tables(
+    request: Request,
+    memory: bool = False,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> JSONResponse:
+    """Conexões, taxas de mensagens e bytes enviados por mesa (com memory=1, memória do motor)"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    table_ids = list(manager.lobby.entries)
+    page = [manager.table_report(t, memory) for t in table_ids[offset:offset + limit]]
+    return JSONResponse({"total": len(table_ids), "offset": offset, "tables": page})
+
+
+@app.get("/api/admin/tables/hot")
+async def admin_hot_tables(
+    request: Request,
+    k: int = Query(10, ge=1, le=100),
+    by: str = Query("bytes", pattern="^(bytes|messages|cpu)$"),
+) -> JSONResponse:
+    """Top-K mesas pela taxa recente de bytes enviados (ou de mensagens recebidas)"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    return JSONResponse({"by": by, "tables": [manager.table_report(t, memory=True) for t in manager.metrics.hottest(k, by)]})
+
+
+@app.get("/api/admin/tables/{table_id}")
+async def admin_table(request: Request, table_id: str) -> JSONResponse:
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    if table_id not in manager.lobby.entries:
+        return JSONResponse({"error": "Sala não encontrada"}, status_code=404)
+    return JSONResponse(manager.table_report(table_id, memory=True))
+
+
+@app.post("/api/admin/tracemalloc/start")
+async def admin_tracemalloc_start(request: Request, frames: int = Query(1, ge=1, le=25)) -> JSONResponse:
+    """Liga o tracemalloc (deixa as alocações mais lentas até o stop)"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    memory_tracer.start(frames)
+    return JSONResponse({"tracing": True, "frames": frames})
+
+
+@app.post("/api/admin/tracemalloc/stop")
+async def admin_tracemalloc_stop(request: Request) -> JSONResponse:
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    memory_tracer.stop()
+    return JSONResponse({"tracing": False})
+
+
+@app.get("/api/admin/tracemalloc/snapshot")
+async def admin_tracemalloc_snapshot(request: Request, top: int = Query(20, ge=1, le=200)) -> JSONResponse:
+    """Maiores alocações por linha; a partir do segundo snapshot, o diff em relação ao anterior"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    result = memory_tracer.snapshot(top)
+    return JSONResponse(result, status_code=409 if "error" in result else 200)
+
+
+@app.get("/api/admin/profile")
+async def admin_profile(
+    request: Request,
+    seconds: float = Query(2.0, gt=0, le=30),
+    top: int = Query(30, ge=1, le=200),
+) -> JSONResponse:
+    """Amostra a pilha da thread do event loop por `seconds` (uma captura por vez)"""
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    if _profile_lock.locked():
+        return JSONResponse({"error": "Captura em andamento"}, status_code=409)
+    async with _profile_lock:
+        sampler = LoopSampler(threading.get_ident())
+        result = await asyncio.get_running_loop().run_in_executor(None, sampler.capture, seconds, None, top)
+    return JSONResponse(result)
+
+
 @app.get("/api/tables")
-async def list_tables() -> JSONResponse:
-    """Lista todas as salas/tabelas disponíveis"""
-    tables_info = manager.get_tables_info()
-    response = JSONResponse(tables_info)
-    response.headers["Access-Control-Allow-Origin"] = "*"
-    return response
+async def list_tables(
+    request: Request,
+    game: Optional[str] = None,
+    open_seats: Optional[bool] = Query(None, alias="open"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+) -> Response:
+    """Lista as salas/tabelas disponíveis (filtros opcionais por jogo e por assentos livres)"""
+    # A listagem vem do índice do lobby, serializada uma vez por versão
+    body, etag, total = manager.lobby.serialized(game=game, open_seats=open_seats, offset=offset, limit=limit)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "X-Total-Count": str(total),
+        "Access-Control-Allow-Origin": "*",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/api/tables/{table_id}")
@@ -73,7 +312,7 @@ class CreateTableRequest(BaseModel):
 
 
 @app.post("/api/tables")
-async def create_table(request: CreateTableRequest) -> JSONResponse:
+async def create_table(request: CreateTableRequest, http_request: Request) -> JSONResponse:
     """Cria uma nova mesa"""
     # Gera ID único se não fornecido
     table_id = request.table_id or f"{request.game}-{str(uuid.uuid4())[:8]}"
@@ -85,9 +324,13 @@ async def create_table(request: CreateTableRequest) -> JSONResponse:
         return response
     
     # Cria a mesa
-    table_info = manager.create_table(table_id, request.game, request.name)
+    table_info = manager.create_table(table_id, request.game, request.name, owner=client_identity(http_request))
     if "error" in table_info:
-        response = JSONResponse(table_info, status_code=400)
+        if table_info.get("quota"):
+            status_code = 429
+        else:
+            status_code = 503 if manager.draining is not None else 400
+        response = JSONResponse(table_info, status_code=status_code)
         response.headers["Access-Control-Allow-Origin"] = "*"
         return response
     
@@ -96,11 +339,203 @@ async def create_table(request: CreateTableRequest) -> JSONResponse:
     return response
 
 
+class AddBotsRequest(BaseModel):
+    count: int = Field(1, ge=1, le=9)
+    strategy: str = "random"
+
+
+@app.post("/api/tables/{table_id}/bots")
+async def add_bots(table_id: str, request: AddBotsRequest, http_request: Request) -> JSONResponse:
+    """Senta bots do servidor numa mesa existente (admin; preencher assentos / teste de carga).
+
+    As conexões dos bots contam na quota de quem criou a mesa.
+    """
+    if not _is_admin(http_request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    entry = manager.lobby.entries.get(table_id)
+    error = manager.quotas.check_connection(manager.quotas.owners.get(table_id))
+    if entry is None:
+        response = JSONResponse({"error": "Sala não encontrada"}, status_code=404)
+    elif error is not None:
+        response = JSONResponse({"error": error}, status_code=429)
+    else:
+        try:
+            nicks = await bots.fill(table_id, game=entry["game"], count=request.count, strategy=request.strategy)
+            response = JSONResponse({"bots": nicks}, status_code=201)
+        except ValueError as e:
+            response = JSONResponse({"error": str(e)}, status_code=400)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.delete("/api/tables/{table_id}/bots")
+async def remove_bots(table_id: str, request: Request) -> JSONResponse:
+    if not _is_admin(request):
+        return JSONResponse(_FORBIDDEN, status_code=403)
+    response = JSONResponse({"removed": await bots.remove_table(table_id)})
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+class CreateTournamentRequest(BaseModel):
+    players: List[str]
+    name: str = None
+    tournament_id: str = None
+    table_size: int = Field(9, ge=2, le=9)
+
+
+@app.post("/api/tournaments")
+async def create_tournament(request: CreateTournamentRequest, http_request: Request) -> JSONResponse:
+    """Cria um torneio multi-mesa com os jogadores inscritos já sentados"""
+    tournament_id = request.tournament_id or f"mtt-{str(uuid.uuid4())[:8]}"
+    info = manager.create_tournament(tournament_id, request.players, table_size=request.table_size, name=request.name,
+                                     owner=client_identity(http_request))
+    if "error" in info:
+        response = JSONResponse(info, status_code=429 if info.get("quota") else 400)
+    else:
+        response = JSONResponse(info, status_code=201)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/tournaments/{tournament_id}")
+async def get_tournament(tournament_id: str) -> JSONResponse:
+    info = manager.tournament_info(tournament_id)
+    response = JSONResponse(info or {"error": "Torneio não encontrado"}, status_code=200 if info else 404)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/hands")
+async def export_hands(
+    table: Optional[str] = None,
+    since: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    format: str = Query("ndjson", pattern="^(ndjson|gzip)$"),
+) -> StreamingResponse:
+    """Histórico de mãos em streaming (NDJSON, opcionalmente gzip), em ordem de id.
+
+    `since` é o cursor: o id da última mão já recebida (retomar com since=<último id>).
+    """
+    chunks = ndjson_lines(iter_hands(table, since, limit=limit))
+    headers = {"Access-Control-Allow-Origin": "*"}
+    if format == "gzip":
+        headers["Content-Disposition"] = 'attachment; filename="hands.ndjson.gz"'
+        return StreamingResponse(gzip_chunks(chunks), media_type="application/gzip", headers=headers)
+    return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
+
+
+class EquityRequest(BaseModel):
+    hero: str = Field(..., max_length=1000)  # mão ("AhKh") ou range ("AKs, TT+")
+    villain: str = Field(..., max_length=1000)
+    board: str = Field("", max_length=20)
+    dead: str = Field("", max_length=60)
+    max_boards: Optional[int] = Field(None, ge=1, le=20000)
+
+
+# /api/equity é público e caro: token bucket por IP (EQUITY_RATE/s, rajada EQUITY_BURST) e
+# no máximo EQUITY_CONCURRENCY cálculos no executor; acima disso responde 429 em vez de enfileirar
+equity_buckets = ClientBuckets(float(os.getenv("EQUITY_RATE", "1")), float(os.getenv("EQUITY_BURST", "5")))
+equity_slots = asyncio.Semaphore(int(os.getenv("EQUITY_CONCURRENCY", "2")))
+
+
+@app.post("/api/equity")
+async def compute_equity(request: EquityRequest, http_request: Request) -> JSONResponse:
+    """Equity mão/range x range no board (coaching); o cálculo roda fora do event loop"""
+    who = client_identity(http_request)
+    if who is not None and not equity_buckets.allow(who[0]):
+        response = JSONResponse({"error": "Muitos cálculos de equity; tente novamente em instantes"}, status_code=429)
+        response.headers["Retry-After"] = "1"
+    elif equity_slots.locked():
+        response = JSONResponse({"error": "Servidor ocupado; tente novamente em instantes"}, status_code=429)
+        response.headers["Retry-After"] = "1"
+    else:
+        try:
+            async with equity_slots:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: equity(request.hero, request.villain, request.board, request.dead,
+                                         max_boards=request.max_boards))
+            response = JSONResponse(result)
+        except ValueError as e:
+            response = JSONResponse({"error": str(e)}, status_code=400)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/players/{nick}/stats")
+async def get_player_stats(nick: str) -> JSONResponse:
+    """VPIP / PFR / fator de agressão do jogador (contadores em memória, sem consulta ao banco)"""
+    stats = manager.player_stats.get(nick)
+    response = JSONResponse(stats or {"error": "Jogador sem mãos registradas"}, status_code=200 if stats else 404)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/stats")
+async def get_players_stats(players: str = Query(..., max_length=2000)) -> JSONResponse:
+    """Stats de vários jogadores de uma vez: ?players=a,b,c"""
+    response = JSONResponse(manager.player_stats.view(p for p in players.split(",") if p))
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/leaderboard")
+async def get_leaderboard(
+    board: str = Query("winnings", pattern="^(winnings|chips)$"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+) -> JSONResponse:
+    """Top-N paginado (cache curto no servidor; ver LEADERBOARD_CACHE_SECONDS)"""
+    page = await manager.leaderboard.top(board, offset, limit)
+    response = JSONResponse(page)
+    response.headers["Cache-Control"] = f"public, max-age={int(manager.leaderboard.cache_seconds)}"
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/leaderboard/{nick}")
+async def get_leaderboard_position(
+    nick: str,
+    board: str = Query("winnings", pattern="^(winnings|chips)$"),
+    radius: int = Query(5, ge=0, le=50),
+) -> JSONResponse:
+    """Rank do jogador e os vizinhos ("perto de mim")"""
+    around = await manager.leaderboard.around(board, nick, radius)
+    response = JSONResponse(around or {"error": "Jogador fora do ranking"}, status_code=200 if around else 404)
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/ws/dictionary")
+async def get_ws_dictionary() -> Response:
+    """Dicionário do modo ?compress=deflate-dict (inflate com zdict no cliente)"""
+    response = Response(SHARED_DICTIONARY, media_type="application/octet-stream")
+    response.headers["X-Dictionary-Id"] = DICTIONARY_ID
+    response.headers["Cache-Control"] = "public, max-age=86400"
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.get("/api/ws/compression")
+async def get_ws_compression() -> JSONResponse:
+    """Parâmetros da compressão do /ws e razão / CPU medidas por modo"""
+    policy = manager.compression
+    response = JSONResponse({
+        "level": policy.level,
+        "windowBits": policy.window_bits,
+        "memLevel": policy.mem_level,
+        "minBytes": policy.min_bytes,
+        "dictionary": DICTIONARY_ID,
+        "modes": policy.stats.as_dict(),
+    })
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
 @app.options("/api/tables")
 @app.options("/api/tables/{table_id}")
 async def options_handler():
     """Handler para requisições OPTIONS (preflight)"""
-    from fastapi.responses import Response
     response = Response()
     response.headers["Access-Control-Allow-Origin"] = "*"
     response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
@@ -113,12 +548,43 @@ async def websocket_endpoint(websocket: WebSocket):
     game = websocket.query_params.get("game")
     table = websocket.query_params.get("table", "new")
     nick = websocket.query_params.get("nick", "guest")
-    await manager.connect(websocket, game=game, table=table, nick=nick)
+    # Compressão dos frames enviados: ?compress=deflate | deflate-dict (ver compression.py)
+    compress = websocket.query_params.get("compress")
+    if websocket.query_params.get("role") == "spectator":
+        # Espectadores só recebem frames; mensagens enviadas por eles são ignoradas
+        if not await manager.connect_spectator(websocket, table=table, compress=compress):
+            return
+        try:
+            while websocket.application_state == WebSocketState.CONNECTED:
+                # só conta como sinal de vida (pong) para o heartbeat
+                await manager.handle_message(websocket, await websocket.receive_text())
+        except WebSocketDisconnect:
+            manager.disconnect_spectator(websocket, table)
+        return
+    # Reconexão: token da sessão e último seq recebido pelo cliente
+    session = websocket.query_params.get("session")
+    last_seq = websocket.query_params.get("last_seq")
+    await manager.connect(
+        websocket, game=game, table=table, nick=nick,
+        session=session, last_seq=int(last_seq) if last_seq and last_seq.isdigit() else None,
+        stats=websocket.query_params.get("stats") in ("1", "true"), compress=compress,
+    )
     try:
-        while True:
+        # o servidor pode fechar a conexão (recusa, drain, heartbeat): o laço termina sem receive
+        while websocket.application_state == WebSocketState.CONNECTED:
             data = await websocket.receive_text()
             await manager.handle_message(websocket, data)
     except WebSocketDisconnect:
         await manager.disconnect(websocket)
 
 
+@app.websocket("/ws/lobby")
+async def lobby_feed_endpoint(websocket: WebSocket):
+    """Feed do lobby: snapshot inicial + diffs em lote (alternativa ao polling de /api/tables)"""
+    await manager.lobby_feed.subscribe(websocket)
+    try:
+        while True:
+            # o cliente não envia comandos; apenas mantém a conexão
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        manager.lobby_feed.unsubscribe(websocket)
@@ -19,3 +19,13 @@ class Seat(SQLModel, table=True):
     user_id: int
 
 
+class HandRecord(SQLModel, table=True):
+    """Mão encerrada (histórico para exportação/analytics); detalhes do jogo ficam em `data` (JSON)"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    table_id: str = Field(index=True)
+    game: str
+    ended_at: float = Field(index=True)  # epoch em segundos
+    players: str  # nicks separados por vírgula
+    winners: str
+    pot: int = 0
+    data: str = "{}"
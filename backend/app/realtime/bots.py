@@ -0,0 +1,263 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from ..game.bot_strategies import BotStrategy, get_strategy
+from .inbound import connection_bucket
+from .quotas import Identity
+
+
+class BotSocket:
+    """Faz o papel do WebSocket de um bot: o manager envia frames e o bot reage."""
+
+    def __init__(self, bot: "Bot"):
+        self.bot = bot
+        self.owner: Optional[Identity] = None  # quem criou a mesa: a conexão do bot conta na quota dele
+        self.closed = False
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        if self.closed:
+            raise RuntimeError("bot desconectado")
+        self.bot.on_frame(text)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed = True
+
+
+class Bot:
+    def __init__(self, runner: "BotRunner", table_id: str, nick: str, game: str, strategy: BotStrategy):
+        self.runner = runner
+        self.table_id = table_id
+        self.nick = nick
+        self.game = game
+        self.strategy = strategy
+        self.socket = BotSocket(self)
+        self.deciding = False
+        self.last_signature: Optional[Tuple] = None  # frame em que a última ação foi decidida
+        self.retries = 0
+        self.next_send = 0.0  # respeita o rate limit de mensagens por conexão
+        self.last_view: Dict[str, Any] = {}  # último frame de estado recebido
+
+    @staticmethod
+    def _signature(msg: Dict[str, Any]) -> Tuple:
+        recent = msg.get("recentActions") or []
+        return (msg.get("street"), msg.get("pot"), msg.get("callAmount"), len(msg.get("community") or []),
+                len(recent), json.dumps(recent[-1]) if recent else None, len(msg.get("hand") or []))
+
+    def on_frame(self, text: str) -> None:
+        msg = json.loads(text)
+        if msg.get("type") != "state":
+            return
+        self.last_view = msg
+        if msg.get("toAct") == self.nick and msg.get("street") != "showdown" and not self.deciding:
+            signature = self._signature(msg)
+            if signature == self.last_signature:
+                # a ação anterior foi recusada: tenta check/fold uma vez, depois deixa o relógio agir
+                self.retries += 1
+                if self.retries > 1:
+                    return
+                self.runner.send_fallback(self, msg)
+                return
+            self.retries = 0
+            self.last_signature = signature
+            self.deciding = True
+            self.runner.spawn(self.runner.decide(self, msg))
+        elif self is self.runner.host(self.table_id) and self._hand_over(msg):
+            self.runner.schedule_new_hand(self, msg)
+
+    def _hand_over(self, msg: Dict[str, Any]) -> bool:
+        if self.game == "sueca":
+            return len(msg["players"]) == 4 and (not msg["started"] or msg["finished"])
+        return len(msg["players"]) >= 2 and (not msg["started"] or msg.get("street") == "showdown")
+
+
+class BotRunner:
+    """Bots do servidor: entram nas mesas pela API do ConnectionManager, sem socket real.
+
+    As decisões rodam num pool de workers com um orçamento de tempo por
+    decisão (BOT_DECISION_BUDGET); se o orçamento estoura, o bot faz
+    check/fold. O primeiro bot de cada mesa inicia as mãos seguintes.
+    """
+
+    def __init__(self, manager, *, workers: Optional[int] = None, budget: Optional[float] = None,
+                 think_delay: Optional[float] = None, hand_delay: Optional[float] = None):
+        self.manager = manager
+        self.workers = workers or int(os.getenv("BOT_WORKERS", "4"))
+        self.budget = budget if budget is not None else float(os.getenv("BOT_DECISION_BUDGET", "0.05"))
+        self.think_delay = think_delay if think_delay is not None else float(os.getenv("BOT_THINK_DELAY", "0.5"))
+        self.hand_delay = hand_delay if hand_delay is not None else float(os.getenv("BOT_HAND_DELAY", "2"))
+        # bots passam pelo mesmo rate limit dos clientes; espaçam os envios para não perder ações
+        self.send_interval = 1.0 / connection_bucket().rate
+        self.bots: Dict[str, Dict[str, Bot]] = {}  # {table_id: {nick: bot}} (ordem = ordem de entrada)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._names = itertools.count(1)
+        self._new_hand_pending: Dict[str, bool] = {}
+        self._tasks: set = set()
+        # métricas
+        self.decisions = 0
+        self.timeouts = 0
+        self.hands = 0
+        self.latencies: Deque[float] = deque(maxlen=10000)
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bot")
+        return self._pool
+
+    def host(self, table_id: str) -> Optional[Bot]:
+        bots = self.bots.get(table_id)
+        return next(iter(bots.values())) if bots else None
+
+    def spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[ERROR] Erro na tarefa do bot: {task.exception()!r}")
+
+    async def add_bot(self, table_id: str, *, game: str = "holdem", strategy: str = "random",
+                      nick: Optional[str] = None) -> Optional[str]:
+        """Senta um bot na mesa; retorna o nick ou None se a mesa recusou"""
+        strategy_cls = get_strategy(strategy)
+        if strategy_cls is None:
+            raise ValueError(f"estratégia desconhecida: {strategy}")
+        nick = nick or f"bot-{strategy}-{next(self._names)}"
+        bot = Bot(self, table_id, nick, game, strategy_cls())
+        bot.socket.owner = self.manager.quotas.owners.get(table_id)
+        self.bots.setdefault(table_id, {})[nick] = bot
+        # bots rodam no processo: sem ping/pong
+        await self.manager.connect(bot.socket, game=game, table=table_id, nick=nick, heartbeat=False)
+        if bot.socket.closed:
+            self._forget(bot)
+            return None
+        return nick
+
+    async def fill(self, table_id: str, *, game: str = "holdem", count: int = 1, strategy: str = "random") -> List[str]:
+        nicks = []
+        for _ in range(count):
+            nick = await self.add_bot(table_id, game=game, strategy=strategy)
+            if nick is None:
+                break
+            nicks.append(nick)
+        return nicks
+
+    async def remove_bot(self, table_id: str, nick: str) -> bool:
+        bot = self.bots.get(table_id, {}).get(nick)
+        if bot is None:
+            return False
+        self._forget(bot)
+        bot.socket.closed = True
+        await self.manager.disconnect(bot.socket)
+        return True
+
+    async def remove_table(self, table_id: str) -> int:
+        nicks = list(self.bots.get(table_id, {}))
+        for nick in nicks:
+            await self.remove_bot(table_id, nick)
+        return len(nicks)
+
+    def _forget(self, bot: Bot) -> None:
+        bots = self.bots.get(bot.table_id, {})
+        bots.pop(bot.nick, None)
+        if not bots:
+            self.bots.pop(bot.table_id, None)
+            self._new_hand_pending.pop(bot.table_id, None)
+
+    async def decide(self, bot: Bot, view: Dict[str, Any]) -> None:
+        try:
+            if self.think_delay > 0:
+                await asyncio.sleep(self.think_delay)
+            start = time.perf_counter()
+            deadline = start + self.budget
+            loop = asyncio.get_running_loop()
+            try:
+                # o worker respeita o deadline; o wait_for só protege contra estratégias que não respeitam
+                action = await asyncio.wait_for(
+                    loop.run_in_executor(self.pool, bot.strategy.decide, view, deadline),
+                    self.budget * 2 + 0.05,
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                action = self._fallback(view)
+            self.latencies.append(time.perf_counter() - start)
+            self.decisions += 1
+        finally:
+            bot.deciding = False
+        await self._send(bot, action)
+
+    async def _send(self, bot: Bot, msg: Dict[str, Any]) -> None:
+        wait = bot.next_send - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        bot.next_send = max(time.monotonic(), bot.next_send) + self.send_interval
+        if not bot.socket.closed:
+            await self.manager.handle_message(bot.socket, json.dumps(msg))
+
+    def send_fallback(self, bot: Bot, view: Dict[str, Any]) -> None:
+        self.spawn(self._send(bot, self._fallback(view)))
+
+    @staticmethod
+    def _fallback(view: Dict[str, Any]) -> Dict[str, Any]:
+        if view.get("game") == "sueca":
+            return {"type": "action", "action": "play", "card": view["legal"][0]}
+        return {"type": "action", "action": "check" if not view.get("callAmount") else "fold"}
+
+    def schedule_new_hand(self, bot: Bot, view: Dict[str, Any]) -> None:
+        if self._new_hand_pending.get(bot.table_id):
+            return
+        self._new_hand_pending[bot.table_id] = True
+        self.spawn(self._new_hand(bot, view))
+
+    async def _new_hand(self, bot: Bot, view: Dict[str, Any]) -> None:
+        try:
+            await asyncio.sleep(self.hand_delay)
+            await self._start_next_hand(bot, view)
+        finally:
+            self._new_hand_pending.pop(bot.table_id, None)
+
+    async def _start_next_hand(self, bot: Bot, view: Dict[str, Any]) -> None:
+        if bot.socket.closed:
+            return
+        if bot.game == "holdem":
+            # bots sem fichas saem e voltam com um novo buy-in
+            for nick, stack in (view.get("stacks") or {}).items():
+                other = self.bots.get(bot.table_id, {}).get(nick)
+                if other is not None and stack <= 0:
+                    await self.remove_bot(bot.table_id, nick)
+                    await self.add_bot(bot.table_id, game=other.game, strategy=other.strategy.name, nick=nick)
+            bot = self.host(bot.table_id)
+            if bot is None:
+                return
+        # new_hand reinicia a mesa: só envia se a mão ainda estiver encerrada
+        if bot.last_view and not bot._hand_over(bot.last_view):
+            return
+        self.hands += 1
+        await self._send(bot, {"type": "action", "action": "new_hand"})
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0.0
+        return {
+            "tables": len(self.bots),
+            "bots": sum(len(b) for b in self.bots.values()),
+            "decisions": self.decisions,
+            "timeouts": self.timeouts,
+            "hands": self.hands,
+            "decisionP99Ms": round(p99 * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,171 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class TimerScheduler:
+    """Agendador único (heap) para os timers de todas as mesas.
+
+    Cada timer é identificado por uma chave; reagendar ou cancelar apenas
+    troca/remove a entrada do dicionário, e as entradas antigas do heap são
+    ignoradas quando saem dele. Uma única task dorme até o próximo prazo.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._timers: Dict[Any, Tuple[int, Callable[[], Awaitable[None]]]] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    @property
+    def heap_size(self) -> int:
+        """Entradas no heap, incluindo as já canceladas/reagendadas que ainda não saíram"""
+        return len(self._heap)
+
+    def schedule(self, key: Any, deadline: float, callback: Callable[[], Awaitable[None]]) -> None:
+        """Agenda (ou reagenda) `callback` para o instante `deadline` (time.monotonic)."""
+        seq = next(self._seq)
+        self._timers[key] = (seq, callback)
+        if not self._heap or deadline < self._heap[0][0]:
+            self._wake()
+        heapq.heappush(self._heap, (deadline, seq, key))
+
+    def cancel(self, key: Any) -> None:
+        self._timers.pop(key, None)
+
+    def pop_due(self, now: Optional[float] = None) -> List[Callable[[], Awaitable[None]]]:
+        now = now if now is not None else time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, key = heapq.heappop(self._heap)
+            timer = self._timers.get(key)
+            if timer is not None and timer[0] == seq:
+                del self._timers[key]
+                due.append(timer[1])
+        return due
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, self._heap[0][0] - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            for callback in self.pop_due():
+                try:
+                    await callback()
+                except Exception as e:
+                    print(f"[ERROR] Erro ao executar timer: {e}")
+
+
+class TurnClock:
+    __slots__ = ("player", "token", "deadline", "in_bank", "bank_started")
+
+    def __init__(self, player: str, token: Any, deadline: float):
+        self.player = player
+        self.token = token
+        self.deadline = deadline
+        self.in_bank = False
+        self.bank_started = 0.0
+
+
+class ActionClocks:
+    """Shot clock por vez de agir, com time bank por jogador.
+
+    Quando o tempo da vez acaba, o jogador passa a consumir o time bank; se
+    ele também acabar, `on_expire(table_id, player, token)` é chamado para
+    aplicar o check/fold automático. `on_bank(table_id)` avisa a entrada no
+    time bank (para atualizar o relógio dos clientes).
+    """
+
+    def __init__(self, scheduler: TimerScheduler, on_expire: Callable[[str, str, Any], Awaitable[None]], *,
+                 on_bank: Optional[Callable[[str], Awaitable[None]]] = None,
+                 turn_seconds: Optional[float] = None, bank_seconds: Optional[float] = None):
+        self.scheduler = scheduler
+        self.on_expire = on_expire
+        self.on_bank = on_bank
+        self.turn_seconds = turn_seconds if turn_seconds is not None else float(os.getenv("ACTION_TIMEOUT", "30"))
+        self.bank_seconds = bank_seconds if bank_seconds is not None else float(os.getenv("TIME_BANK", "60"))
+        self.active: Dict[str, TurnClock] = {}
+        self.banks: Dict[Tuple[str, str], float] = {}  # {(table_id, nick): segundos restantes}
+
+    def arm(self, table_id: str, player: str, token: Any) -> None:
+        """Inicia o relógio da vez; não faz nada se a vez (token) não mudou."""
+        clock = self.active.get(table_id)
+        if clock is not None and clock.token == token and clock.player == player:
+            return
+        self.stop(table_id)
+        clock = TurnClock(player, token, time.monotonic() + self.turn_seconds)
+        self.active[table_id] = clock
+        self.scheduler.schedule(("turn", table_id), clock.deadline, lambda: self._expired(table_id, clock))
+
+    def stop(self, table_id: str) -> None:
+        clock = self.active.pop(table_id, None)
+        if clock is None:
+            return
+        self.scheduler.cancel(("turn", table_id))
+        if clock.in_bank:
+            key = (table_id, clock.player)
+            used = time.monotonic() - clock.bank_started
+            self.banks[key] = max(0.0, self.banks.get(key, self.bank_seconds) - used)
+
+    def forget_table(self, table_id: str) -> None:
+        self.stop(table_id)
+        for key in [k for k in self.banks if k[0] == table_id]:
+            del self.banks[key]
+
+    def view(self, table_id: str) -> Optional[Dict[str, Any]]:
+        clock = self.active.get(table_id)
+        if clock is None:
+            return None
+        remaining = max(0.0, clock.deadline - time.monotonic())
+        return {
+            "player": clock.player,
+            "expiresAt": time.time() + remaining,
+            "usingBank": clock.in_bank,
+            "timeBank": self.banks.get((table_id, clock.player), self.bank_seconds),
+        }
+
+    async def _expired(self, table_id: str, clock: TurnClock) -> None:
+        if self.active.get(table_id) is not clock:
+            return
+        bank = self.banks.get((table_id, clock.player), self.bank_seconds)
+        if not clock.in_bank and bank > 0:
+            # tempo da vez esgotado: passa a consumir o time bank
+            clock.in_bank = True
+            clock.bank_started = time.monotonic()
+            clock.deadline = clock.bank_started + bank
+            self.scheduler.schedule(("turn", table_id), clock.deadline, lambda: self._expired(table_id, clock))
+            if self.on_bank is not None:
+                await self.on_bank(table_id)
+            return
+        self.stop(table_id)
+        await self.on_expire(table_id, clock.player, clock.token)
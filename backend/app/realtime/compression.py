@@ -0,0 +1,140 @@
+import json
+import os
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from .protocol import state_message, sueca_state_message
+
+# Compressão dos frames do /ws, negociada pelo cliente com ?compress=<modo>:
+#   deflate       stream deflate por conexão (context takeover, como o permessage-deflate):
+#                 cada frame se aproveita dos anteriores; custa memória por conexão
+#   deflate-dict  cada frame comprimido sozinho, com um dicionário compartilhado de
+#                 frames de estado (GET /api/ws/dictionary); sem estado por conexão,
+#                 então um frame igual para vários destinatários é comprimido uma vez
+# Frames comprimidos vão como mensagens binárias (deflate raw, com Z_SYNC_FLUSH);
+# frames menores que WS_COMPRESS_MIN_BYTES continuam como texto. O cliente
+# descomprime em frontend/src/ws/inflate.ts.
+# Esta é a única camada de compressão: o uvicorn roda com
+# --ws-per-message-deflate false (Dockerfile / docker-compose), senão os frames
+# binários seriam comprimidos de novo pelo permessage-deflate.
+MODES = ("deflate", "deflate-dict")
+
+
+def _dictionary() -> bytes:
+    """Frames de estado típicos; o zlib prefere o fim do dicionário, então os trechos mais comuns vão por último"""
+    actions = [{"player": "", "action": a, "amount": None} for a in ("fold", "check", "call", "raise", "all_in")]
+    sueca = sueca_state_message(
+        players=[], started=True, finished=False, hand_self=["AS", "7H"], legal=["AS"], trump="S", trump_card="AS",
+        trick=[{"player": "", "card": "KD"}], last_trick=[], last_trick_winner=None, to_act=None, dealer=None,
+        points=[0, 0], score=[0, 0], hand_counts={}, recent_actions=[{"player": "", "action": "play", "card": "QC"}],
+    )
+    holdem = state_message(
+        players=[], started=True, community=["AS", "KD", "7C"], hole_self=["QH", "TS"], pot=0, street="preflop",
+        to_act=None, winners=None, recent_actions=actions, call_amount=0, stacks={}, dealer=None, sb=None, bb=None,
+        min_raise=10, all_holes={}, pots=[{"amount": 0, "eligible": []}],
+        action_clock={"player": "", "expiresAt": 0, "usingBank": False, "timeBank": 60.0},
+    )
+    text = json.dumps({"type": "session", "token": ""}) + json.dumps(sueca) + '{"seq": 1, ' + json.dumps(holdem)[1:]
+    return text.encode()
+
+
+SHARED_DICTIONARY = _dictionary()
+DICTIONARY_ID = format(zlib.crc32(SHARED_DICTIONARY), "08x")
+
+
+class CompressionStats:
+    """Bytes brutos x enviados e CPU gasta comprimindo, por modo (GET /api/ws/compression)"""
+
+    def __init__(self):
+        self.modes: Dict[str, Dict[str, float]] = {}
+
+    def add(self, mode: str, raw: int, wire: int, compressed: bool, cpu: float) -> None:
+        m = self.modes.get(mode)
+        if m is None:
+            m = self.modes[mode] = {"frames": 0, "compressed": 0, "rawBytes": 0, "wireBytes": 0, "cpuSeconds": 0.0}
+        m["frames"] += 1
+        m["compressed"] += compressed
+        m["rawBytes"] += raw
+        m["wireBytes"] += wire
+        m["cpuSeconds"] += cpu
+
+    def as_dict(self) -> Dict[str, Any]:
+        out = {}
+        for mode, m in self.modes.items():
+            out[mode] = dict(m)
+            out[mode]["ratio"] = round(m["wireBytes"] / m["rawBytes"], 3) if m["rawBytes"] else None
+            out[mode]["cpuUsPerFrame"] = round(m["cpuSeconds"] / m["frames"] * 1e6, 1) if m["frames"] else None
+        return out
+
+
+class CompressionPolicy:
+    def __init__(self, *, level: Optional[int] = None, window_bits: Optional[int] = None,
+                 mem_level: Optional[int] = None, min_bytes: Optional[int] = None):
+        self.level = level if level is not None else int(os.getenv("WS_COMPRESS_LEVEL", "6"))
+        # janela de 2^9..2^15 bytes: menor = menos memória por conexão, razão pior
+        self.window_bits = window_bits if window_bits is not None else int(os.getenv("WS_COMPRESS_WINDOW_BITS", "15"))
+        self.mem_level = mem_level if mem_level is not None else int(os.getenv("WS_COMPRESS_MEM_LEVEL", "8"))
+        self.min_bytes = min_bytes if min_bytes is not None else int(os.getenv("WS_COMPRESS_MIN_BYTES", "256"))
+        self.stats = CompressionStats()
+
+    def describe(self, mode: str) -> Dict[str, Any]:
+        """Parâmetros que o cliente precisa para o inflate (vão no frame de sessão)"""
+        info: Dict[str, Any] = {"mode": mode, "windowBits": self.window_bits, "minBytes": self.min_bytes}
+        if mode == "deflate-dict":
+            info["dictionary"] = DICTIONARY_ID
+        return info
+
+    def compressor(self, mode: Optional[str]) -> Optional["FrameCompressor"]:
+        if mode == "deflate":
+            return StreamCompressor(self)
+        if mode == "deflate-dict":
+            return DictCompressor(self)
+        return None
+
+
+class FrameCompressor(ABC):
+    mode = ""
+
+    def __init__(self, policy: CompressionPolicy):
+        self.policy = policy
+
+    @abstractmethod
+    def _deflate(self, data: bytes) -> bytes:
+        ...
+
+    def compress(self, text: str) -> Optional[bytes]:
+        """Frame comprimido, ou None se deve ir como texto (pequeno demais / não compensa)"""
+        data = text.encode()
+        if len(data) < self.policy.min_bytes:
+            self.policy.stats.add(self.mode, len(data), len(data), False, 0.0)
+            return None
+        start = time.perf_counter()
+        out = self._deflate(data)
+        cpu = time.perf_counter() - start
+        # stream (context takeover) precisa mandar tudo que comprimiu, mesmo sem ganho
+        if len(out) >= len(data) and self.mode == "deflate-dict":
+            self.policy.stats.add(self.mode, len(data), len(data), False, cpu)
+            return None
+        self.policy.stats.add(self.mode, len(data), len(out), True, cpu)
+        return out
+
+
+class StreamCompressor(FrameCompressor):
+    mode = "deflate"
+
+    def __init__(self, policy: CompressionPolicy):
+        super().__init__(policy)
+        self._z = zlib.compressobj(policy.level, zlib.DEFLATED, -policy.window_bits, policy.mem_level)
+
+    def _deflate(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+
+class DictCompressor(FrameCompressor):
+    mode = "deflate-dict"
+
+    def _deflate(self, data: bytes) -> bytes:
+        z = zlib.compressobj(self.policy.level, zlib.DEFLATED, -self.policy.window_bits, self.policy.mem_level,
+                             zdict=SHARED_DICTIONARY)
+        return z.compress(data) + z.flush()
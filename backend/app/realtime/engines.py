@@ -0,0 +1,564 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from ..game.holdem_engine import HoldemTableState
+from ..game.tournament import Tournament
+from ..game.sueca_engine import CARD_NAMES, POINTS, STRENGTH, SUECA_SUITS, SuecaTableState
+from .protocol import state_message, sueca_state_message
+from .inbound import ActionIn
+
+
+DEFAULT_MAX_PLAYERS = 4  # mesas de jogos sem motor registrado
+
+
+class GameEngine(ABC):
+    """Interface comum dos jogos hospedados pelo ConnectionManager.
+
+    Uma instância por mesa, resolvida uma única vez na criação da mesa; guarda
+    o estado do jogo (`state`) e tudo que for específico do jogo (serializers,
+    caches). O manager só chama estes métodos, sem testar o tipo de jogo.
+    """
+
+    name = ""
+    max_players = DEFAULT_MAX_PLAYERS
+
+    def __init__(self, state: Any = None):
+        self.state = state if state is not None else self.new_state()
+        self._recorded: Any = None  # turn_token da última mão entregue ao histórico
+        # ouvintes dos eventos de jogo: ("start", jogadores) e ("act", nick, ação, valor, street)
+        self.listeners: List[Callable[[Tuple[Any, ...]], None]] = []
+
+    def subscribe(self, callback: Callable[[Tuple[Any, ...]], None]) -> None:
+        self.listeners.append(callback)
+
+    def _emit(self, *event: Any) -> None:
+        for callback in self.listeners:
+            callback(event)
+
+    @abstractmethod
+    def new_state(self) -> Any:
+        ...
+
+    @property
+    def players(self) -> List[str]:
+        return self.state.players
+
+    # ciclo de vida dos assentos
+    def join(self, nick: str, connected: Set[str]) -> Optional[str]:
+        """Senta o jogador; retorna a mensagem de erro se não houver lugar."""
+        if not self.state.add_player(nick):
+            return f"Mesa cheia. Máximo de {self.state.max_players} jogadores."
+        return None
+
+    def leave(self, connected: Set[str]) -> bool:
+        """Chamado quando uma conexão sai; retorna True se o estado mudou."""
+        return False
+
+    # jogo
+    @abstractmethod
+    def start(self) -> Optional[str]:
+        """Inicia uma mão; retorna a mensagem de erro se não for possível."""
+
+    def apply(self, nick: str, msg: ActionIn) -> Optional[bool]:
+        """Aplica uma ação. True = aceita, False = recusada, None = não suportada."""
+        return None
+
+    def to_act(self) -> Optional[str]:
+        return None
+
+    def turn_token(self) -> Any:
+        """Identifica a vez atual (muda a cada ação aceita), usado pelo relógio."""
+        return self.state.action_seq
+
+    def on_timeout(self, nick: str) -> None:
+        """Jogada automática quando o relógio (e o time bank) de `nick` esgota."""
+
+    # frames
+    @abstractmethod
+    def private_view(self, nick: Optional[str], players: List[str], clock: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        ...
+
+    def public_view(self, players: List[str], clock: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.private_view(None, players, clock)
+
+    def spectator_view(self, players: List[str], clock: Optional[Dict[str, Any]], reveal: bool) -> Dict[str, Any]:
+        return self.public_view(players, clock)
+
+    def summary(self) -> Dict[str, Any]:
+        """Resumo para o lobby / GET /api/tables/{id} (sempre inclui started)."""
+        return {"started": self.state.started}
+
+    # histórico
+    def finished_hand(self) -> Optional[Dict[str, Any]]:
+        """Registro da mão recém-encerrada (players, winners, pot + detalhes do jogo).
+
+        Retorna o registro uma única vez por mão; None se não há mão encerrada
+        pendente de registro.
+        """
+        return None
+
+    # hibernação
+    def snapshot(self) -> Dict[str, Any]:
+        return self.state.snapshot()
+
+    @classmethod
+    @abstractmethod
+    def restore(cls, data: Dict[str, Any]) -> "GameEngine":
+        ...
+
+
+ENGINES: Dict[str, Type[GameEngine]] = {}
+
+
+def register_engine(cls: Type[GameEngine]) -> Type[GameEngine]:
+    ENGINES[cls.name] = cls
+    return cls
+
+
+def get_engine(game: Optional[str]) -> Optional[Type[GameEngine]]:
+    return ENGINES.get(game or "")
+
+
+def max_players_for(game: Optional[str]) -> int:
+    engine = get_engine(game)
+    return engine.max_players if engine else DEFAULT_MAX_PLAYERS
+
+
+@register_engine
+class HoldemEngine(GameEngine):
+    name = "holdem"
+    max_players = 9
+
+    def __init__(self, state: Any = None):
+        super().__init__(state)
+        self.actions: List[List[Any]] = []  # ações da mão atual: [nick, ação, valor, street]
+        self.start_stacks: Dict[str, int] = {}  # stacks antes dos blinds da mão atual
+
+    def new_state(self) -> HoldemTableState:
+        return HoldemTableState(max_players=self.max_players)
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "HoldemEngine":
+        return cls(HoldemTableState.from_snapshot(data))
+
+    def join(self, nick: str, connected: Set[str]) -> Optional[str]:
+        st = self.state
+        if not st.started or st.street == "showdown":
+            # Entre mãos, libera os assentos dos desconectados antes de verificar.
+            # unseat_player é logado (e ajusta o botão), então o replay reproduz a mesa.
+            for p in [p for p in st.players if p not in connected]:
+                st.unseat_player(p)
+        if nick not in st.players:
+            print(f"[DEBUG] Tentando adicionar jogador {nick}. Jogadores atuais: {len(st.players)}/{st.max_players}, Lista: {st.players}")
+        return super().join(nick, connected)
+
+    def leave(self, connected: Set[str]) -> bool:
+        st = self.state
+        if not connected:
+            # Se não há mais conexões, reseta o estado do jogo
+            st.reset_hand()
+            return True
+        # Se não há mais jogadores conectados que estavam na mão, reseta
+        active_players_in_hand = [p for p in st.players if p in connected]
+        if st.started and len(active_players_in_hand) < 2:
+            st.reset_hand()
+            return True
+        return False
+
+    def hand_live(self) -> bool:
+        """Há uma mão em andamento (ainda não chegou ao showdown)"""
+        st = self.state
+        return st.started and st.street != "showdown"
+
+    def start(self) -> Optional[str]:
+        st = self.state
+        if not st.players:
+            return "sem jogadores"
+        if self.hand_live():
+            return "Já há uma mão em andamento."
+        print(f"[DEBUG] Iniciar mão - Jogadores na mesa: {len(st.players)}")
+        print(f"[DEBUG] Stacks: {st.stacks}")
+        players_with_stack = [p for p in st.players if st.stacks.get(p, 0) > 0]
+        # Verifica número de jogadores
+        if len(st.players) < 2:
+            return f"É necessário pelo menos 2 jogadores para iniciar a mão. Atualmente há {len(st.players)} jogador(es) na mesa: {st.players}"
+        # Verifica se há jogadores com stack antes de iniciar
+        if len(players_with_stack) < 2:
+            return f"É necessário pelo menos 2 jogadores com fichas para iniciar a mão. Há {len(st.players)} jogador(es) na mesa, mas apenas {len(players_with_stack)} têm fichas. Jogadores sem fichas: {[p for p in st.players if st.stacks.get(p, 0) <= 0]}"
+        self._start_hand()
+        return None
+
+    def next_hand(self) -> Optional[str]:
+        """Fecha a mão encerrada e dá a próxima; retorna a mensagem de erro se não for possível."""
+        if self.hand_live():
+            return "Já há uma mão em andamento."
+        self.state.reset_hand()
+        return self.start()
+
+    def _start_hand(self) -> None:
+        st = self.state
+        before = dict(st.stacks)
+        st.start_hand()
+        if st.started:
+            self.actions = []
+            self.start_stacks = {p: before.get(p, 0) for p in st.players}
+            self._emit("start", list(st.players))
+
+    def apply(self, nick: str, msg: ActionIn) -> Optional[bool]:
+        st = self.state
+        if msg.action == "new_hand":
+            # só entre mãos: reiniciar no meio descartaria o pote
+            if self.hand_live():
+                return False
+            # Reseta o estado antes de iniciar nova mão
+            st.reset_hand()
+            self._start_hand()
+            return True
+        if msg.action == "play":
+            return None
+        return self._act(nick, msg.action, msg.amount)
+
+    def _act(self, nick: str, action: str, amount: Optional[int] = None) -> bool:
+        st = self.state
+        seq, street = st.action_seq, st.street
+        st.apply_action(nick, action, amount)
+        if st.action_seq == seq:
+            return False
+        self.actions.append([nick, action, amount, street])
+        self._emit("act", nick, action, amount, street)
+        # Após ação, verifica se pode avançar automaticamente até showdown
+        self._auto_advance_to_showdown()
+        return True
+
+    def to_act(self) -> Optional[str]:
+        st = self.state
+        return st.to_act() if (st.started and st.street != "showdown") else None
+
+    def on_timeout(self, nick: str) -> None:
+        """Tempo esgotado: check se possível, senão fold"""
+        st = self.state
+        # timeout atrasado (o jogador já agiu ou a mão acabou): nada a fazer
+        if self.to_act() != nick:
+            return
+        action = "check" if st.call_amount(nick) == 0 else "fold"
+        print(f"[DEBUG] Tempo esgotado para {nick}: {action} automático")
+        self._act(nick, action)
+
+    def _auto_advance_to_showdown(self) -> None:
+        """Avança automaticamente até showdown se todos estão all-in ou não há mais ação possível"""
+        st = self.state
+        # Continua avançando streets enquanto houver jogadores ativos e não estiver no showdown
+        max_iterations = 10  # Evita loop infinito
+        iteration = 0
+
+        while iteration < max_iterations and st.street != "showdown":
+            iteration += 1
+            active = [p for p in st.players if not st.folded.get(p, False)]
+
+            # Se só sobrou 1 jogador, vai para showdown
+            if len(active) <= 1:
+                st.force_showdown()
+                break
+
+            # Se todos ativos estão all-in (ou só um ainda pode agir e não deve nada),
+            # avança automaticamente até showdown
+            can_act = [p for p in active if not st.all_in.get(p, False)]
+            all_all_in = not can_act or (len(can_act) == 1 and st.call_amount(can_act[0]) == 0)
+
+            if all_all_in:
+                # Avança até river/showdown
+                while st.street != "showdown":
+                    if st.street == "preflop":
+                        st.next_street()  # vai para flop
+                    elif st.street == "flop":
+                        st.next_street()  # vai para turn
+                    elif st.street == "turn":
+                        st.next_street()  # vai para river
+                    elif st.street == "river":
+                        st.force_showdown()
+                        break
+                break
+
+            # Verifica se há alguém para agir
+            to_act_player = st.to_act()
+            if to_act_player is None:
+                # Não há mais ninguém para agir, avança street
+                if st.street != "showdown":
+                    st.next_street()
+                    # Se avançou e ainda não há ninguém para agir, continua
+                    if st.to_act() is None and st.street != "showdown":
+                        continue
+                    else:
+                        break
+                else:
+                    break
+
+            # Se chegou aqui, há alguém para agir, para o loop
+            break
+
+        # Se chegou no showdown, calcula vencedores
+        if st.street == "showdown":
+            st.get_winner()
+
+    def private_view(self, nick: Optional[str], players: List[str], clock: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        st = self.state
+        if st.started:
+            # Só envia cartas se o jogador está realmente no jogo (estava na mesa quando a mão começou)
+            hole = st.hole.get(nick, []) if nick in st.players else []
+            winners = st.get_winner() if st.street == "showdown" else None
+            call_amt = st.call_amount(nick) if nick is not None and nick == st.to_act() else None
+            # no showdown, mostra cartas de todos os jogadores (apenas não-folded)
+            all_holes = self._live_holes() if st.street == "showdown" else None
+            return state_message(
+                players=players,
+                started=True,
+                community=st.community,
+                hole_self=hole,
+                pot=st.pot,
+                street=st.street,
+                to_act=st.to_act(),
+                winners=winners,
+                recent_actions=list(st.recent_actions),
+                call_amount=call_amt,
+                stacks=st.stacks,
+                dealer=st.players[st.dealer_index] if st.players else None,
+                sb=st.get_sb_player(),
+                bb=st.get_bb_player(),
+                min_raise=st.min_raise_amount() if st.to_act() else None,
+                all_holes=all_holes,
+                pots=st.pots_view(),
+                action_clock=clock,
+            )
+        return state_message(
+            players=players,
+            started=False,
+            community=[],
+            hole_self=[],
+            pot=st.pot,
+            street=st.street,
+            to_act=st.to_act(),
+            winners=None,
+            recent_actions=list(st.recent_actions),
+            call_amount=None,
+            stacks=st.stacks,
+            dealer=st.players[st.dealer_index] if st.players else None,
+            sb=None,
+            bb=None,
+            min_raise=None,
+            all_holes=None,
+        )
+
+    def spectator_view(self, players: List[str], clock: Optional[Dict[str, Any]], reveal: bool) -> Dict[str, Any]:
+        msg = self.public_view(players, clock)
+        if reveal and self.state.started:
+            msg["allHoles"] = self._live_holes()
+        return msg
+
+    def _live_holes(self) -> Dict[str, List[str]]:
+        st = self.state
+        return {p: st.hole.get(p, []) for p in st.players if not st.folded.get(p, False)}
+
+    def _shown_holes(self) -> Dict[str, List[str]]:
+        """Cartas abertas no showdown: só existe showdown disputado com 2+ jogadores na mão"""
+        holes = self._live_holes()
+        return holes if len(holes) > 1 else {}
+
+    def finished_hand(self) -> Optional[Dict[str, Any]]:
+        st = self.state
+        if not st.started or st.street != "showdown" or self._recorded == st.action_seq:
+            return None
+        self._recorded = st.action_seq
+        winners = st.get_winner() or []
+        return {
+            "players": list(st.players),
+            "winners": winners,
+            "pot": st.pot,
+            "dealer": st.players[st.dealer_index] if st.players else None,
+            "blinds": [st.sb_size, st.bb_size],
+            "board": list(st.community),
+            # o histórico é exportado sem autenticação (/api/hands): nada de cartas que não foram abertas
+            "holes": self._shown_holes(),
+            "stacks": dict(st.stacks),
+            # resultado líquido da mão por jogador (vazio se a mão começou antes de um restore)
+            "deltas": {p: st.stacks.get(p, 0) - stack for p, stack in self.start_stacks.items()},
+            "actions": self.actions,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        st = self.state
+        return {
+            "started": st.started,
+            "street": st.street,
+            "pot": st.pot,
+            "dealer": st.players[st.dealer_index] if st.players else None,
+            "sb": st.get_sb_player() if st.started else None,
+            "bb": st.get_bb_player() if st.started else None,
+        }
+
+
+@register_engine
+class SuecaEngine(GameEngine):
+    name = "sueca"
+    max_players = 4
+
+    def new_state(self) -> SuecaTableState:
+        return SuecaTableState(max_players=self.max_players)
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "SuecaEngine":
+        return cls(SuecaTableState.from_snapshot(data))
+
+    def _in_hand(self) -> bool:
+        return self.state.started and not self.state.finished
+
+    def join(self, nick: str, connected: Set[str]) -> Optional[str]:
+        st = self.state
+        if nick in st.players:
+            return None
+        if self._in_hand():
+            # mão em andamento: quem chega assume o assento (equipe e cartas) de um desconectado
+            for seat, p in enumerate(st.players):
+                if p not in connected:
+                    print(f"[DEBUG] {nick} assume o assento {seat} de {p} na mão em andamento")
+                    st.players[seat] = nick
+                    return None
+            return f"Mesa cheia. Máximo de {st.max_players} jogadores."
+        self._prune(connected)
+        return super().join(nick, connected)
+
+    def leave(self, connected: Set[str]) -> bool:
+        if self._in_hand():
+            if connected:
+                # a mão continua: o relógio joga pelos ausentes e um novo jogador pode assumir o assento
+                return False
+            self.state.reset_hand()
+        return self._prune(connected)
+
+    def _prune(self, connected: Set[str]) -> bool:
+        """Libera os assentos dos desconectados entre mãos; retorna True se a mesa mudou"""
+        st = self.state
+        seated = [p for p in st.players if p in connected]
+        if seated == st.players:
+            return False
+        st.players = seated
+        # as equipes são por assento: formação nova, placar novo
+        st.score = [0, 0]
+        st.dealer_index = st.dealer_index % len(seated) if seated else 0
+        if st.started:
+            st.reset_hand()
+        return True
+
+    def start(self) -> Optional[str]:
+        st = self.state
+        if st.started and not st.finished:
+            return "mão em andamento"
+        if not st.start_hand():
+            return f"A Sueca precisa de 4 jogadores. Atualmente há {len(st.players)} na mesa."
+        return None
+
+    def apply(self, nick: str, msg: ActionIn) -> Optional[bool]:
+        if msg.action == "new_hand":
+            return self.start() is None
+        if msg.action != "play":
+            return None
+        return self.state.play(nick, msg.card or "")
+
+    def to_act(self) -> Optional[str]:
+        return self.state.to_act()
+
+    def on_timeout(self, nick: str) -> None:
+        """Tempo esgotado: joga a carta válida mais fraca"""
+        st = self.state
+        card = min(st.legal_cards(st.current), key=lambda c: (POINTS[c], STRENGTH[c]))
+        print(f"[DEBUG] Tempo esgotado para {nick}: {CARD_NAMES[card]} automático")
+        st.play(nick, CARD_NAMES[card])
+
+    def private_view(self, nick: Optional[str], players: List[str], clock: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        st = self.state
+        seat = st.seat_of(nick) if nick is not None else None
+        hand, legal = [], []
+        if st.started and seat is not None:
+            hand = st.card_names(seat)
+            if seat == st.current and not st.finished:
+                legal = [CARD_NAMES[card] for card in st.legal_cards(seat)]
+        return sueca_state_message(
+            players=players,
+            started=st.started,
+            finished=st.finished,
+            hand_self=hand,
+            legal=legal,
+            trump=SUECA_SUITS[st.trump] if st.started else None,
+            trump_card=CARD_NAMES[st.trump_card] if st.trump_card is not None else None,
+            trick=self._trick_view(st.trick),
+            last_trick=self._trick_view(st.last_trick),
+            last_trick_winner=st.players[st.last_trick_winner] if st.last_trick_winner is not None else None,
+            to_act=st.to_act(),
+            dealer=st.players[st.dealer_index] if st.players else None,
+            points=st.points,
+            score=st.score,
+            hand_counts=st.hand_counts() if st.started else {},
+            recent_actions=list(st.recent_actions),
+            action_clock=clock,
+        )
+
+    def spectator_view(self, players: List[str], clock: Optional[Dict[str, Any]], reveal: bool) -> Dict[str, Any]:
+        msg = self.public_view(players, clock)
+        st = self.state
+        if reveal and st.started:
+            msg["allHands"] = {p: st.card_names(i) for i, p in enumerate(st.players)}
+        return msg
+
+    def _trick_view(self, trick) -> List[Dict[str, str]]:
+        return [{"player": self.state.players[seat], "card": CARD_NAMES[card]} for seat, card in trick]
+
+    def finished_hand(self) -> Optional[Dict[str, Any]]:
+        st = self.state
+        if not st.finished or self._recorded == st.action_seq:
+            return None
+        self._recorded = st.action_seq
+        # equipes (0, 2) x (1, 3); 60 x 60 é empate, sem vencedores
+        winning = 0 if st.points[0] > st.points[1] else 1 if st.points[1] > st.points[0] else None
+        return {
+            "players": list(st.players),
+            "winners": [p for i, p in enumerate(st.players) if i % 2 == winning],
+            "pot": 0,
+            "dealer": st.players[st.dealer_index],
+            "trump": SUECA_SUITS[st.trump],
+            "trumpCard": CARD_NAMES[st.trump_card],
+            "points": list(st.points),
+            "score": list(st.score),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        st = self.state
+        return {
+            "started": st.started,
+            "dealer": st.players[st.dealer_index] if st.players else None,
+            "score": list(st.score),
+        }
+
+
+class TournamentHoldemEngine(HoldemEngine):
+    """Mesa de um torneio: os assentos pertencem ao Tournament, não às conexões.
+
+    Não fica no registro: as mesas são criadas por ConnectionManager.create_tournament.
+    """
+
+    def __init__(self, tournament: Tournament, table_id: str):
+        super().__init__(tournament.tables[table_id])
+        self.tournament = tournament
+        self.table_id = table_id
+
+    def join(self, nick: str, connected: Set[str]) -> Optional[str]:
+        if self.tournament.table_of.get(nick) != self.table_id:
+            return "Jogador não está sentado nesta mesa do torneio."
+        return None
+
+    def leave(self, connected: Set[str]) -> bool:
+        # quem desconecta continua sentado (o relógio faz check/fold por ele)
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        summary = super().summary()
+        summary["tournament"] = self.tournament.id
+        summary["level"] = self.tournament.level_index() + 1
+        return summary
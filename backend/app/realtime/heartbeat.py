@@ -0,0 +1,73 @@
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
+from .clocks import TimerScheduler
+
+PING = json.dumps({"type": "ping"})
+
+
+class Heartbeat:
+    """Ping/pong de aplicação para todas as conexões, no agendador único.
+
+    Cada conexão tem um timer (chave ("heartbeat", conn)); qualquer frame
+    recebido conta como sinal de vida, então conexões ativas não recebem
+    ping. Sem tráfego por `interval` segundos o servidor manda {"type": "ping"};
+    sem nenhum frame do cliente em `timeout` segundos, `on_dead(conn)` remove
+    a conexão. Envio que falhou também marca a conexão como morta, e a
+    limpeza acontece fora do laço de broadcast.
+    """
+
+    def __init__(self, scheduler: TimerScheduler, on_dead: Callable[[Any], Awaitable[None]], *,
+                 interval: Optional[float] = None, timeout: Optional[float] = None):
+        self.scheduler = scheduler
+        self.on_dead = on_dead
+        # WS_PING_INTERVAL=0 desliga o heartbeat
+        self.interval = interval if interval is not None else float(os.getenv("WS_PING_INTERVAL", "25"))
+        self.timeout = timeout if timeout is not None else float(os.getenv("WS_PING_TIMEOUT", "10"))
+        self.pings = 0
+        self.dropped = 0
+
+    def watch(self, conn: Any) -> None:
+        conn.last_seen = time.monotonic()
+        conn.ping_sent = None
+        if self.interval > 0:
+            self._schedule(conn, conn.last_seen + self.interval)
+
+    def unwatch(self, conn: Any) -> None:
+        self.scheduler.cancel(("heartbeat", conn))
+
+    def seen(self, conn: Any) -> None:
+        """Frame recebido: só atualiza o instante (O(1), o timer não é reagendado)"""
+        conn.last_seen = time.monotonic()
+
+    def mark_dead(self, conn: Any) -> None:
+        """Envio falhou: remove a conexão no próximo ciclo do agendador"""
+        if not conn.dead:
+            conn.dead = True
+            self._schedule(conn, time.monotonic())
+
+    def _schedule(self, conn: Any, deadline: float) -> None:
+        self.scheduler.schedule(("heartbeat", conn), deadline, lambda: self._check(conn))
+
+    async def _check(self, conn: Any) -> None:
+        now = time.monotonic()
+        waiting = conn.ping_sent is not None and conn.last_seen < conn.ping_sent
+        if conn.dead or (waiting and now - conn.ping_sent >= self.timeout):
+            self.dropped += 1
+            await self.on_dead(conn)
+            return
+        if waiting:
+            self._schedule(conn, conn.ping_sent + self.timeout)
+            return
+        if now - conn.last_seen < self.interval:
+            # houve tráfego desde o último ciclo
+            self._schedule(conn, conn.last_seen + self.interval)
+            return
+        conn.ping_sent = now
+        self.pings += 1
+        self._schedule(conn, now + self.timeout)
+        try:
+            await conn.websocket.send_text(PING)
+        except Exception:
+            self.mark_dead(conn)
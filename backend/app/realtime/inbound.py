@@ -0,0 +1,72 @@
+import os
+import time
+from typing import Annotated, Literal, Optional, Union
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+
+MAX_MESSAGE_BYTES = int(os.getenv("WS_MAX_MESSAGE_BYTES", "4096"))
+
+
+class ChatIn(BaseModel):
+    type: Literal["chat"]
+    text: str = Field(max_length=500)
+
+
+class StartIn(BaseModel):
+    type: Literal["start"]
+
+
+class PongIn(BaseModel):
+    type: Literal["pong"]  # resposta ao {"type": "ping"} do heartbeat
+
+
+class ActionIn(BaseModel):
+    type: Literal["action"]
+    action: Literal["check", "call", "fold", "raise", "all_in", "new_hand", "play"]
+    amount: Optional[int] = Field(default=None, ge=0, le=1_000_000_000)
+    card: Optional[str] = Field(default=None, max_length=3)  # "play" (Sueca)
+
+
+InboundMessage = Annotated[Union[ChatIn, StartIn, ActionIn, PongIn], Field(discriminator="type")]
+
+# Validador compilado uma única vez; faz o parse do JSON e a validação numa passada
+_inbound = TypeAdapter(InboundMessage)
+
+
+def parse_inbound(data: str) -> Union[ChatIn, StartIn, ActionIn, None]:
+    """Valida um frame recebido. Retorna None para frames grandes, malformados ou desconhecidos."""
+    if len(data) > MAX_MESSAGE_BYTES:
+        return None
+    try:
+        return _inbound.validate_json(data)
+    except ValidationError:
+        return None
+
+
+class TokenBucket:
+    """Token bucket simples: `rate` mensagens/s com rajadas de até `burst`."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = now if now is not None else time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+def connection_bucket() -> TokenBucket:
+    return TokenBucket(float(os.getenv("WS_RATE", "5")), float(os.getenv("WS_BURST", "10")))
+
+
+def table_bucket() -> TokenBucket:
+    return TokenBucket(float(os.getenv("WS_TABLE_RATE", "50")), float(os.getenv("WS_TABLE_BURST", "100")))
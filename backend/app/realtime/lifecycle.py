@@ -0,0 +1,68 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from .clocks import TimerScheduler
+
+
+def _env_flag(name: str, default: str = "0") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+class TableLifecycle:
+    """Controla o ciclo de vida das mesas vazias do nó.
+
+    Mesas sem conexões entram numa fila LRU e ganham um prazo de expiração
+    (TTL de ociosidade). Cada mesa vazia tem um único timer no TimerScheduler
+    compartilhado, com a chave ("idle", table_id); renovar o prazo de uma mesa
+    que já está vazia só atualiza a LRU, e o timer se reagenda ao disparar.
+    """
+
+    def __init__(self, scheduler: TimerScheduler, evict: Callable[[str], None], *, idle_ttl: Optional[float] = None,
+                 max_tables: Optional[int] = None, hibernate: Optional[bool] = None):
+        self.scheduler = scheduler
+        self.evict = evict
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv("TABLE_IDLE_TTL", "600"))
+        self.max_tables = max_tables if max_tables is not None else int(os.getenv("MAX_TABLES", "1000"))
+        self.hibernate = hibernate if hibernate is not None else _env_flag("TABLE_HIBERNATE")
+        # mesas vazias em ordem LRU: {table_id: prazo de expiração}
+        self.idle: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark_busy(self, table_id: str) -> None:
+        """A mesa tem conexões: não pode ser removida."""
+        self.forget(table_id)
+
+    def mark_idle(self, table_id: str, now: Optional[float] = None) -> None:
+        """A mesa ficou (ou continua) vazia: renova o prazo e move para o fim da LRU."""
+        deadline = (now if now is not None else time.monotonic()) + self.idle_ttl
+        renewing = table_id in self.idle
+        self.idle[table_id] = deadline
+        self.idle.move_to_end(table_id)
+        if not renewing:
+            self._schedule(table_id, deadline)
+
+    def forget(self, table_id: str) -> None:
+        if self.idle.pop(table_id, None) is not None:
+            self.scheduler.cancel(("idle", table_id))
+
+    def lru_victim(self) -> Optional[str]:
+        """Mesa vazia usada há mais tempo (candidata a despejo quando o nó está cheio)."""
+        return next(iter(self.idle), None)
+
+    def _schedule(self, table_id: str, deadline: float) -> None:
+        async def expire() -> None:
+            self._expire(table_id)
+        self.scheduler.schedule(("idle", table_id), deadline, expire)
+
+    def _expire(self, table_id: str, now: Optional[float] = None) -> None:
+        deadline = self.idle.get(table_id)
+        if deadline is None:
+            return
+        if deadline > (now if now is not None else time.monotonic()):
+            # o prazo foi renovado depois do agendamento
+            self._schedule(table_id, deadline)
+            return
+        try:
+            self.evict(table_id)
+        except Exception as e:
+            print(f"[ERROR] Erro ao remover mesa ociosa {table_id}: {e}")
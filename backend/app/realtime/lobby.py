@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+from fastapi import WebSocket
+
+
+class LobbyIndex:
+    """Índice das mesas do lobby, atualizado quando mesas ou assentos mudam.
+
+    O ConnectionManager chama `upsert`/`remove` nos eventos de mesa; as
+    listagens são serializadas uma vez por versão e filtro e reaproveitadas
+    (com ETag) até a próxima mudança.
+    """
+
+    MAX_CACHED_VIEWS = 256
+
+    def __init__(self):
+        self.entries: Dict[str, Dict] = {}
+        self.version: int = 0
+        # {(game, open_seats, offset, limit): (version, body, etag, total)}
+        self._cache: Dict[Tuple, Tuple[int, bytes, str, int]] = {}
+        # Entrada de cada mesa alterada desde o último drain (None = não existia)
+        self._pending: Dict[str, Optional[Dict]] = {}
+
+    @property
+    def pending_changes(self) -> int:
+        """Mesas alteradas desde o último drain_changes"""
+        return len(self._pending)
+
+    def upsert(self, table_id: str, entry: Dict) -> bool:
+        """Atualiza a entrada da mesa. Retorna True se algo mudou."""
+        prev = self.entries.get(table_id)
+        if prev == entry:
+            return False
+        self._pending.setdefault(table_id, prev)
+        self.entries[table_id] = entry
+        self._bump()
+        return True
+
+    def remove(self, table_id: str) -> bool:
+        prev = self.entries.pop(table_id, None)
+        if prev is None:
+            return False
+        self._pending.setdefault(table_id, prev)
+        self._bump()
+        return True
+
+    def drain_changes(self) -> List[Dict[str, Any]]:
+        """Retorna as mudanças acumuladas como diffs mínimos e limpa o acúmulo.
+
+        Várias mudanças da mesma mesa dentro do intervalo viram um único diff.
+        """
+        changes = []
+        for table_id, prev in self._pending.items():
+            cur = self.entries.get(table_id)
+            if cur is None:
+                if prev is not None:
+                    changes.append({"op": "remove", "id": table_id})
+            elif prev is None:
+                changes.append({"op": "add", "table": cur})
+            else:
+                fields = {k: v for k, v in cur.items() if prev.get(k) != v}
+                if fields:
+                    changes.append({"op": "update", "id": table_id, **fields})
+        self._pending = {}
+        return changes
+
+    def _bump(self) -> None:
+        self.version += 1
+        self._cache.clear()
+
+    def listing(self, *, game: Optional[str] = None, open_seats: Optional[bool] = None,
+                offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        tables = [
+            t for t in self.entries.values()
+            if (game is None or t["game"] == game)
+            and (open_seats is None or (t["player_count"] < t["max_players"]) == open_seats)
+        ]
+        end = None if limit is None else offset + limit
+        return tables[offset:end]
+
+    def serialized(self, *, game: Optional[str] = None, open_seats: Optional[bool] = None,
+                   offset: int = 0, limit: Optional[int] = None) -> Tuple[bytes, str, int]:
+        """Retorna (corpo JSON, etag, total sem paginação) em cache para o filtro dado."""
+        key = (game, open_seats, offset, limit)
+        cached = self._cache.get(key)
+        if cached and cached[0] == self.version:
+            return cached[1], cached[2], cached[3]
+        total = len(self.listing(game=game, open_seats=open_seats))
+        page = self.listing(game=game, open_seats=open_seats, offset=offset, limit=limit)
+        body = json.dumps(page).encode("utf-8")
+        etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+        if len(self._cache) >= self.MAX_CACHED_VIEWS:
+            self._cache.clear()
+        self._cache[key] = (self.version, body, etag, total)
+        return body, etag, total
+
+
+class LobbyFeed:
+    """Stream do lobby via websocket: um snapshot ao assinar e diffs em lote.
+
+    Os diffs saem do LobbyIndex a cada `interval` segundos, codificados uma
+    única vez para todos os assinantes; sem mudanças, nada é enviado.
+    """
+
+    def __init__(self, index: LobbyIndex, interval: Optional[float] = None):
+        self.index = index
+        self.interval = interval if interval is not None else float(os.getenv("LOBBY_FEED_INTERVAL", "0.5"))
+        self.subscribers: Set[WebSocket] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        if not self.subscribers:
+            # mudanças antigas já estão no snapshot
+            self.index.drain_changes()
+        snapshot = {"type": "lobby_snapshot", "version": self.index.version, "tables": self.index.listing()}
+        # inscreve antes de enviar: um flush durante o envio já inclui este socket
+        # (os diffs são idempotentes, então o que já está no snapshot pode repetir)
+        self.subscribers.add(websocket)
+        try:
+            await websocket.send_text(json.dumps(snapshot))
+        except Exception:
+            self.subscribers.discard(websocket)
+            raise
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unsubscribe(self, websocket: WebSocket) -> None:
+        self.subscribers.discard(websocket)
+
+    async def _run(self) -> None:
+        while self.subscribers:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        changes = self.index.drain_changes()
+        if not changes or not self.subscribers:
+            return
+        text = json.dumps({"type": "lobby_diff", "version": self.index.version, "changes": changes})
+        subscribers = list(self.subscribers)
+        results = await asyncio.gather(*(ws.send_text(text) for ws in subscribers), return_exceptions=True)
+        for ws, result in zip(subscribers, results):
+            if isinstance(result, Exception):
+                # Conexão fechada, remove do feed
+                self.subscribers.discard(ws)
@@ -1,8 +1,27 @@
+import asyncio
+import itertools
 import json
-from typing import Dict, List, Optional
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import WebSocket
-from ..game.holdem_engine import HoldemTableState
+from ..game.player_stats import PlayerStats
+from ..game.tournament import HandResult, Tournament
+from ..services.hand_history import HandHistoryWriter
+from ..services.leaderboard import Leaderboard
+from ..services.introspection import deep_size
+from ..services.persistence import load_table_snapshot, save_table_snapshot
 from .protocol import state_message, error_message
+from .compression import CompressionPolicy, FrameCompressor
+from .lobby import LobbyFeed, LobbyIndex
+from .lifecycle import TableLifecycle
+from .clocks import ActionClocks, TimerScheduler
+from .heartbeat import Heartbeat
+from .metrics import TableMetrics
+from .quotas import Identity, Quotas, client_identity
+from .sessions import ReplayBuffer, Session, SessionStore
+from .engines import GameEngine, TournamentHoldemEngine, get_engine, max_players_for
+from .inbound import ActionIn, ChatIn, PongIn, StartIn, TokenBucket, connection_bucket, parse_inbound, table_bucket
 
 
 class Connection:
@@ -11,323 +30,672 @@ class Connection:
         self.nick = nick
         self.table_id = table_id
         self.game = game
+        self.session: Optional[Session] = None
+        self.bucket = connection_bucket()  # rate limit das mensagens recebidas
+        self.stats = False  # frames de estado com o campo opcional "stats" (HUD)
+        self.compressor: Optional[FrameCompressor] = None  # ?compress=<modo> (ver compression.py)
+        self.spectator = False
+        self.client: Optional[Identity] = None  # (IP, origem) para as quotas; None = bot do servidor
+        # heartbeat (ver heartbeat.py)
+        self.last_seen = 0.0
+        self.ping_sent: Optional[float] = None
+        self.dead = False
 
 
 class ConnectionManager:
     def __init__(self):
-        self.tables: Dict[str, List[Connection]] = {}
-        self.holdem_state: Dict[str, HoldemTableState] = {}
+        # Conexões de cada mesa, por websocket (remoção O(1), ordem de entrada preservada)
+        self.tables: Dict[str, Dict[Any, Connection]] = {}
+        # Índice global websocket -> conexão (jogadores e espectadores)
+        self.connections: Dict[Any, Connection] = {}
+        # Motor de jogo de cada mesa, resolvido uma vez pelo registro (ver engines.py)
+        self.games: Dict[str, GameEngine] = {}
+        # Torneios (MTT) e o torneio de cada mesa de torneio
+        self.tournaments: Dict[str, Tournament] = {}
+        self.tournament_tables: Dict[str, Tournament] = {}
         # Armazena informações de mesas criadas (mesmo que vazias)
         self.created_tables: Dict[str, Dict] = {}  # {table_id: {game, name, created_at}}
+        # Índice do lobby, atualizado nos eventos de mesa/assento (ver _touch_table)
+        self.lobby = LobbyIndex()
+        self.lobby_feed = LobbyFeed(self.lobby)
+        # Um único agendador para os relógios de ação de todas as mesas
+        self.scheduler = TimerScheduler()
+        # Mesas vazias expiram por TTL / LRU (ver evict_table), no mesmo agendador
+        self.lifecycle = TableLifecycle(self.scheduler, self.evict_table)
+        self.clocks = ActionClocks(self.scheduler, self._on_clock_expired, on_bank=self.broadcast_state)
+        # Ping/pong de todas as conexões no mesmo agendador; conexões mortas saem pelo índice
+        self.heartbeat = Heartbeat(self.scheduler, self._on_dead_connection)
+        # Mãos encerradas vão em lote para o banco (exportadas por GET /api/hands)
+        self.hand_history = HandHistoryWriter(self.scheduler)
+        # Stats de HUD por jogador, atualizadas pelos eventos dos motores (O(1) por ação)
+        self.player_stats = PlayerStats()
+        # Rankings globais (Redis sorted sets ou skip list em memória), atualizados no fim da mão
+        self.leaderboard = Leaderboard()
+        # Sessões retomáveis e frames recentes por mesa (reenvio só do que foi perdido)
+        self.sessions = SessionStore()
+        self.replay: Dict[str, ReplayBuffer] = {}
+        # Espectadores: grupo separado, recebem um único frame público por atualização
+        self.spectators: Dict[str, Dict[Any, Connection]] = {}
+        # Rate limit de mensagens recebidas por mesa (soma de todas as conexões)
+        self.table_buckets: Dict[str, TokenBucket] = {}
+        self.spectator_delay = float(os.getenv("SPECTATOR_DELAY", "0"))
+        # Mesas de torneio: o servidor dá a próxima mão sozinho depois deste intervalo
+        self.tournament_deal_delay = float(os.getenv("TOURNAMENT_DEAL_DELAY", "3"))
+        # Compressão opcional dos frames do /ws, escolhida por conexão
+        self.compression = CompressionPolicy()
+        # Tráfego por mesa para as rotas de admin (ver metrics.py)
+        self.metrics = TableMetrics()
+        # Quotas por cliente/origem e throttling das mesas pesadas (ver quotas.py)
+        self.quotas = Quotas()
+        # Modo drain (deploy sem downtime), ver start_drain
+        self.draining: Optional[Dict[str, Any]] = None
+        self._spectator_frames = itertools.count()
 
-    async def connect(self, websocket: WebSocket, *, game: Optional[str], table: str, nick: str) -> None:
+    async def connect(self, websocket: WebSocket, *, game: Optional[str], table: str, nick: str,
+                      session: Optional[str] = None, last_seq: Optional[int] = None, stats: bool = False,
+                      compress: Optional[str] = None, heartbeat: bool = True) -> None:
         await websocket.accept()
         table_id = table if table != "new" else f"{game}-table-1"
         
+        # Em drain o nó não aceita entradas (nem retomadas): o cliente vai para outro nó
+        if self.draining is not None:
+            await websocket.send_text(self._reconnect_frame(table_id))
+            await websocket.close(code=1012)
+            return
+        
+        # Reconexão com token válido: retoma a sessão sem rebroadcast para a mesa
+        resumed = self.sessions.resume(session, table_id, nick)
+        if resumed is not None:
+            await self._resume(websocket, resumed, game or "", last_seq, stats, compress)
+            return
+        
+        who = client_identity(websocket)
+        error = self.quotas.check_connection(who)
+        if error is None and table_id not in self.lobby.entries:
+            error = self.quotas.check_table(who)
+        if error is not None:
+            await websocket.send_text(json.dumps(error_message(error)))
+            await websocket.close()
+            return
+        
+        # Mesa desconhecida neste nó: respeita o limite de mesas e tenta acordar uma mesa hibernada
+        if table_id not in self.lobby.entries:
+            if not self._ensure_capacity():
+                await websocket.send_text(json.dumps(error_message("Limite de mesas do servidor atingido")))
+                await websocket.close()
+                return
+            self.quotas.table_created(table_id, who)
+            if self.lifecycle.hibernate:
+                await self._restore_table(table_id)
+        
         # Adiciona a conexão primeiro
         conn = Connection(websocket, nick, table_id, game or "")
-        self.tables.setdefault(table_id, []).append(conn)
+        conn.client = who
+        conn.stats = stats
+        conn.compressor = self.compression.compressor(compress)
+        self._add_connection(conn, heartbeat)
         
         # track player in game state
-        if game == "holdem":
-            st = self.holdem_state.setdefault(table_id, HoldemTableState())
-            
-            # Remove jogadores desconectados da lista antes de verificar
-            # (jogadores que estão em st.players mas não estão mais conectados)
-            connected_nicks = [c.nick for c in self.tables.get(table_id, [])]
-            st.players = [p for p in st.players if p in connected_nicks]
-            
-            # Verifica se o jogador já está na mesa (reconexão)
-            if nick not in st.players:
-                # Se não está na mesa, verifica se há espaço
-                # Permite até max_players jogadores (9 no caso padrão)
-                print(f"[DEBUG] Tentando adicionar jogador {nick}. Jogadores atuais: {len(st.players)}/{st.max_players}, Lista: {st.players}")
-                if len(st.players) >= st.max_players:
-                    # Remove a conexão se não conseguiu adicionar o jogador
-                    self.tables[table_id] = [c for c in self.tables.get(table_id, []) if c.websocket is not websocket]
-                    print(f"[DEBUG] Mesa cheia! {len(st.players)} >= {st.max_players}. Removendo conexão.")
-                    await websocket.send_text(json.dumps(error_message(f"Mesa cheia. Máximo de {st.max_players} jogadores.")))
-                    await websocket.close()
-                    return
-            
-            # Verifica novamente antes de adicionar (proteção extra)
-            if nick not in st.players and len(st.players) >= st.max_players:
+        game_engine = self._game_for(table_id, game)
+        if game_engine is not None:
+            connected = {c.nick for c in self.tables[table_id].values()}
+            error = game_engine.join(nick, connected)
+            if error is not None:
                 # Remove a conexão se não conseguiu adicionar o jogador
-                self.tables[table_id] = [c for c in self.tables.get(table_id, []) if c.websocket is not websocket]
-                await websocket.send_text(json.dumps(error_message(f"Mesa cheia. Máximo de {st.max_players} jogadores.")))
+                self._remove_connection(conn)
+                print(f"[DEBUG] {error} Removendo conexão de {nick}.")
+                self._touch_table(table_id)
+                await websocket.send_text(json.dumps(error_message(error)))
                 await websocket.close()
                 return
-            success = st.add_player(nick)
-            if not success:
-                # Remove a conexão se não conseguiu adicionar o jogador
-                self.tables[table_id] = [c for c in self.tables.get(table_id, []) if c.websocket is not websocket]
-                await websocket.send_text(json.dumps(error_message(f"Mesa cheia. Máximo de {st.max_players} jogadores.")))
+        self._touch_table(table_id)
+        conn.session = self.sessions.issue(table_id, nick)
+        await self._send(conn, self._session_frame(conn))
+        await self.broadcast_state(table_id)
+
+    def _add_connection(self, conn: Connection, heartbeat: bool = True) -> None:
+        group = self.spectators if conn.spectator else self.tables
+        group.setdefault(conn.table_id, {})[conn.websocket] = conn
+        self.connections[conn.websocket] = conn
+        self.quotas.connection_opened(conn.client)
+        if heartbeat:
+            self.heartbeat.watch(conn)
+
+    def _remove_connection(self, conn: Connection) -> None:
+        """Tira a conexão do índice e da mesa (O(1)); mesas sem conexões saem do dicionário"""
+        if self.connections.get(conn.websocket) is conn:
+            del self.connections[conn.websocket]
+            self.quotas.connection_closed(conn.client)
+        self.heartbeat.unwatch(conn)
+        group = self.spectators if conn.spectator else self.tables
+        conns = group.get(conn.table_id)
+        if conns is not None and conns.get(conn.websocket) is conn:
+            del conns[conn.websocket]
+            if not conns and conn.spectator:
+                del group[conn.table_id]
+
+    async def _on_dead_connection(self, conn: Connection) -> None:
+        """Heartbeat sem resposta ou envio que falhou: mesma limpeza de um disconnect"""
+        if self.connections.get(conn.websocket) is not conn:
+            return
+        print(f"[DEBUG] Conexão morta removida: {conn.nick or 'espectador'} em {conn.table_id}")
+        if conn.spectator:
+            self.disconnect_spectator(conn.websocket, conn.table_id)
+        else:
+            await self.disconnect(conn.websocket)
+        try:
+            await conn.websocket.close()
+        except Exception:
+            pass
+
+    def _game_for(self, table_id: str, game: Optional[str]) -> Optional[GameEngine]:
+        """Motor da mesa; na primeira vez é criado a partir do registro (None se o jogo não tem motor)"""
+        game_engine = self.games.get(table_id)
+        if game_engine is None:
+            engine_cls = get_engine(game)
+            if engine_cls is not None:
+                game_engine = self._attach_engine(table_id, engine_cls())
+        return game_engine
+
+    def _attach_engine(self, table_id: str, game_engine: GameEngine) -> GameEngine:
+        """Instala o motor da mesa e liga seus eventos às stats dos jogadores"""
+        self.games[table_id] = game_engine
+        game_engine.subscribe(lambda event: self.player_stats.on_event(table_id, event))
+        return game_engine
+
+    def _session_frame(self, conn: Connection) -> str:
+        msg = {"type": "session", "token": conn.session.token}
+        if conn.compressor is not None:
+            msg["compress"] = self.compression.describe(conn.compressor.mode)
+        return json.dumps(msg)
+
+    async def connect_spectator(self, websocket: WebSocket, *, table: str, compress: Optional[str] = None) -> bool:
+        """Entra como espectador: não ocupa assento nem conta para max_players"""
+        await websocket.accept()
+        if table not in self.lobby.entries:
+            await websocket.send_text(json.dumps(error_message("Sala não encontrada")))
+            await websocket.close()
+            return False
+        who = client_identity(websocket)
+        error = self.quotas.check_connection(who)
+        if error is not None:
+            await websocket.send_text(json.dumps(error_message(error)))
+            await websocket.close()
+            return False
+        conn = Connection(websocket, "", table, self.lobby.entries[table]["game"])
+        conn.compressor = self.compression.compressor(compress)
+        conn.spectator = True
+        conn.client = who
+        self._add_connection(conn)
+        self._touch_table(table)
+        if conn.compressor is not None:
+            # espectador não tem sessão: os parâmetros do inflate vão num frame próprio
+            await websocket.send_text(json.dumps({"type": "compression", **self.compression.describe(conn.compressor.mode)}))
+        await self._deliver(conn, self._spectator_frame(table, reveal=False))
+        return True
+
+    def disconnect_spectator(self, websocket: WebSocket, table: str) -> None:
+        conn = self.connections.get(websocket)
+        if conn is None or not conn.spectator:
+            return
+        self._remove_connection(conn)
+        self._touch_table(table)
+
+    def _spectator_frame(self, table_id: str, reveal: bool) -> str:
+        """Frame público da mesa; com `reveal`, inclui as cartas de todos (modo com atraso)"""
+        game_engine = self.games.get(table_id)
+        if game_engine is None:
+            msg = self._state_for(table_id, None)
+        else:
+            msg = game_engine.spectator_view(self._seated_players(table_id), self.clocks.view(table_id), reveal)
+        msg["spectator"] = True
+        return json.dumps(msg)
+
+    async def _broadcast_spectators(self, table_id: str) -> None:
+        if not self.spectators.get(table_id):
+            return
+        started = time.thread_time()
+        if self.spectator_delay <= 0:
+            text = self._spectator_frame(table_id, reveal=False)
+            self._charge(table_id, started)
+            await self._send_spectators(table_id, text)
+            return
+        # Com atraso, o frame (com cartas reveladas) é congelado agora e enviado depois
+        text = self._spectator_frame(table_id, reveal=True)
+        self._charge(table_id, started)
+        async def deliver() -> None:
+            await self._send_spectators(table_id, text)
+        key = ("spectate", table_id, next(self._spectator_frames))
+        self.scheduler.schedule(key, time.monotonic() + self.spectator_delay, deliver)
+
+    async def _send_spectators(self, table_id: str, text: str) -> None:
+        viewers = list(self.spectators.get(table_id, {}).values())
+        # deflate-dict não tem estado por conexão: o frame é comprimido uma vez para todos
+        shared: Dict[str, Optional[bytes]] = {}
+        def frame(c: Connection):
+            if c.compressor is None:
+                self.metrics.sent(table_id, len(text))
+                return c.websocket.send_text(text)
+            if c.compressor.mode == "deflate-dict":
+                if "dict" not in shared:
+                    shared["dict"] = c.compressor.compress(text)
+                data = shared["dict"]
+            else:
+                data = c.compressor.compress(text)
+            self.metrics.sent(table_id, len(data) if data is not None else len(text))
+            return c.websocket.send_bytes(data) if data is not None else c.websocket.send_text(text)
+        started = time.thread_time()
+        sends = [frame(c) for c in viewers]  # compressão acontece aqui, antes dos envios
+        self._charge(table_id, started)
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        for c, result in zip(viewers, results):
+            if isinstance(result, Exception):
+                # Conexão fechada: sai do grupo no próximo ciclo do heartbeat
+                self.heartbeat.mark_dead(c)
+
+    async def _resume(self, websocket: WebSocket, session: Session, game: str, last_seq: Optional[int],
+                      stats: bool = False, compress: Optional[str] = None) -> None:
+        table_id = session.table_id
+        who = client_identity(websocket)
+        # Conexões antigas da mesma sessão (meio-abertas) são substituídas
+        stale = [c for c in self.tables.get(table_id, {}).values() if c.session is session]
+        # substituir uma conexão do mesmo cliente não muda a contagem da quota
+        if not any(c.client == who for c in stale):
+            error = self.quotas.check_connection(who)
+            if error is not None:
+                await websocket.send_text(json.dumps(error_message(error)))
                 await websocket.close()
                 return
-        await self.broadcast_state(table_id)
+        self.scheduler.cancel(("session", session.token))
+        conn = Connection(websocket, session.nick, table_id, game)
+        conn.session = session
+        conn.client = who
+        conn.stats = stats
+        conn.compressor = self.compression.compressor(compress)
+        for c in stale:
+            self._remove_connection(c)
+        self._add_connection(conn)
+        for c in stale:
+            try:
+                await c.websocket.close()
+            except Exception:
+                pass
+        self._touch_table(table_id)
+        buf = self._replay_buffer(table_id)
+        frames = buf.missed(session, last_seq) if last_seq is not None else None
+        if frames is None:
+            # Sem last_seq ou buffer não cobre o intervalo: estado completo só para esta conexão
+            await self._send(conn, self._session_frame(conn))
+            await self._send(conn, json.dumps(self._state_for(table_id, conn)))
+            return
+        for text in frames:
+            await self._deliver(conn, text)
+        if session.detached_at is not None and session.detached_at != buf.broadcasts:
+            # a mesa mudou enquanto a sessão estava desconectada
+            await self._send(conn, json.dumps(self._state_for(table_id, conn)))
+        session.detached_at = None
+
+    def _replay_buffer(self, table_id: str) -> ReplayBuffer:
+        buf = self.replay.get(table_id)
+        if buf is None:
+            buf = self.replay[table_id] = ReplayBuffer()
+        return buf
+
+    async def _send(self, conn: Connection, text: str) -> None:
+        """Envia um frame; com sessão, numera (seq) e guarda no buffer de replay da mesa"""
+        session = conn.session
+        if session is not None:
+            session.seq += 1
+            text = '{"seq": %d, ' % session.seq + text[1:]
+            self._replay_buffer(conn.table_id).record(session.token, session.seq, text)
+        await self._deliver(conn, text)
+
+    def _charge(self, table_id: str, started: float) -> None:
+        """CPU (tempo de thread) gasta pela mesa desde `started`, para o throttling"""
+        self.metrics.cpu(table_id, time.thread_time() - started)
+
+    async def _deliver(self, conn: Connection, text: str) -> None:
+        """Texto, ou binário comprimido se a conexão negociou compressão"""
+        data = None
+        if conn.compressor is not None:
+            started = time.thread_time()
+            data = conn.compressor.compress(text)
+            self._charge(conn.table_id, started)
+        if data is not None:
+            self.metrics.sent(conn.table_id, len(data))
+            await conn.websocket.send_bytes(data)
+        else:
+            self.metrics.sent(conn.table_id, len(text))
+            await conn.websocket.send_text(text)
+
+    def _expire_session_later(self, session: Session) -> None:
+        async def expire() -> None:
+            self.sessions.expire(session.token)
+        self.scheduler.schedule(("session", session.token), time.monotonic() + self.sessions.ttl_seconds, expire)
 
     async def disconnect(self, websocket: WebSocket) -> None:
-        for table_id, conns in list(self.tables.items()):
-            # Remove a conexão
-            disconnected_nick = None
-            for c in conns:
-                if c.websocket is websocket:
-                    disconnected_nick = c.nick
-                    break
-            self.tables[table_id] = [c for c in conns if c.websocket is not websocket]
-            if not self.tables[table_id]:
-                del self.tables[table_id]
-                # Se não há mais conexões, reseta o estado do jogo
-                if table_id in self.holdem_state:
-                    st = self.holdem_state[table_id]
-                    st.started = False
-                    st.community = []
-                    st.hole = {}
-                    st.street = "preflop"
-            else:
-                # Se ainda há conexões mas a mão estava ativa, verifica se precisa resetar
-                if table_id in self.holdem_state:
-                    st = self.holdem_state[table_id]
-                    # Se não há mais jogadores conectados que estavam na mão, reseta
-                    active_players_in_hand = [p for p in st.players if any(c.nick == p for c in self.tables.get(table_id, []))]
-                    if st.started and len(active_players_in_hand) < 2:
-                        st.started = False
-                        st.community = []
-                        st.hole = {}
-                        st.street = "preflop"
-                        await self.broadcast_state(table_id)
+        # Busca pelo índice: conexões já substituídas (retomada) ou removidas não fazem nada
+        c = self.connections.get(websocket)
+        if c is None or c.spectator:
+            return
+        table_id = c.table_id
+        if c.session is not None:
+            # mantém a sessão por SESSION_TTL para permitir retomada
+            c.session.detached_at = self._replay_buffer(table_id).broadcasts
+            self._expire_session_later(c.session)
+        self._remove_connection(c)
+        game_engine = self.games.get(table_id)
+        if not self.tables.get(table_id):
+            self.tables.pop(table_id, None)
+            # Se não há mais conexões, o motor decide o que fazer com a mão
+            if game_engine is not None:
+                game_engine.leave(set())
+            self._touch_table(table_id)
+        elif game_engine is not None and game_engine.leave({c.nick for c in self.tables[table_id].values()}):
+            # Ainda há conexões, mas a mão foi encerrada/resetada pelo motor
+            self._touch_table(table_id)
+            await self.broadcast_state(table_id)
+        else:
+            self._touch_table(table_id)
 
     async def broadcast(self, table_id: str, message: dict) -> None:
         text = json.dumps(message)
-        conns = self.tables.get(table_id, [])
-        # Remove conexões fechadas durante o broadcast
-        active_conns = []
+        conns = list(self.tables.get(table_id, {}).values())
+        self._replay_buffer(table_id).broadcasts += 1
+        self.metrics.broadcast(table_id)
         for c in conns:
             try:
-                await c.websocket.send_text(text)
-                active_conns.append(c)
+                await self._send(c, text)
             except (RuntimeError, ConnectionError, Exception):
-                # Conexão fechada, não adiciona à lista ativa
-                pass
-        # Atualiza lista removendo conexões fechadas
-        if len(active_conns) < len(conns):
-            self.tables[table_id] = active_conns
+                # Conexão fechada: o heartbeat a remove fora deste laço
+                self.heartbeat.mark_dead(c)
+        if self.spectators.get(table_id):
+            await self._send_spectators(table_id, text)
 
     async def broadcast_state(self, table_id: str) -> None:
-        conns = self.tables.get(table_id, [])
-        # Usa a lista de jogadores do estado do jogo, não das conexões
-        # Isso garante que apenas jogadores realmente no jogo recebam cartas
-        st = self.holdem_state.get(table_id)
-        if st:
-            # Sincroniza jogadores: apenas jogadores conectados E no estado do jogo
-            players = [p for p in st.players if any(c.nick == p for c in conns)]
-        else:
-            # Se não há estado, usa jogadores conectados
-            players = [c.nick for c in conns]
+        # Sincroniza o relógio de ação com a vez atual antes de montar os frames
+        self._arm_clock(table_id)
+        conns = list(self.tables.get(table_id, {}).values())
+        players = self._seated_players(table_id)
+        self._replay_buffer(table_id).broadcasts += 1
+        self.metrics.broadcast(table_id)
         
         # Hold'em per-connection hole visibility
+        cpu = 0.0
         for c in conns:
-            if st and st.started:
-                # Só envia cartas se o jogador está realmente no jogo (estava na mesa quando a mão começou)
-                hole = st.hole.get(c.nick, []) if c.nick in st.players else []
-                winners = st.get_winner() if st.street == "showdown" else None
-                call_amt = st.call_amount(c.nick) if c.nick == st.to_act() else None
-                dealer_name = st.players[st.dealer_index] if st.players else None
-                sb_name = st.get_sb_player() if st.started else None
-                bb_name = st.get_bb_player() if st.started else None
-                # no showdown, mostra cartas de todos os jogadores (apenas não-folded)
-                all_holes = None
-                if st.street == "showdown":
-                    all_holes = {p: st.hole.get(p, []) for p in st.players if not st.folded.get(p, False)}
-                msg = state_message(
-                    players=players,
-                    started=True,
-                    community=st.community,
-                    hole_self=hole,
-                    pot=st.pot,
-                    street=st.street,
-                    to_act=st.to_act(),
-                    winners=winners,
-                    recent_actions=st.recent_actions,
-                    call_amount=call_amt,
-                    stacks=st.stacks,
-                    dealer=dealer_name,
-                    sb=sb_name,
-                    bb=bb_name,
-                    min_raise=st.min_raise_amount() if st.to_act() else None,
-                    all_holes=all_holes,
-                )
-            else:
-                dealer_name = st.players[st.dealer_index] if (st and st.players) else None
-                sb_name = st.get_sb_player() if (st and st.started) else None
-                bb_name = st.get_bb_player() if (st and st.started) else None
-                # Só envia community se a mão realmente começou e não está em preflop
-                community_cards = []
-                if st and st.started and st.street != "preflop":
-                    community_cards = st.community
-                msg = state_message(
-                    players=players,
-                    started=bool(st and st.started),
-                    community=community_cards,
-                    hole_self=[],
-                    pot=st.pot if st else 0,
-                    street=st.street if st else None,
-                    to_act=st.to_act() if st else None,
-                    winners=None,
-                    recent_actions=st.recent_actions if st else [],
-                    call_amount=None,
-                    stacks=st.stacks if st else {},
-                    dealer=dealer_name,
-                    sb=sb_name,
-                    bb=bb_name,
-                    min_raise=None,
-                    all_holes=None,
-                )
+            if c.dead:
+                continue
+            started = time.thread_time()
+            text = json.dumps(self._state_for(table_id, c, players))
+            cpu += time.thread_time() - started
             try:
-                await c.websocket.send_text(json.dumps(msg))
+                await self._send(c, text)
             except (RuntimeError, ConnectionError, Exception):
-                # Conexão fechada, remove da lista
-                self.tables[table_id] = [conn for conn in self.tables.get(table_id, []) if conn.websocket is not c.websocket]
+                # Conexão fechada: o heartbeat a remove fora deste laço
+                self.heartbeat.mark_dead(c)
+        self.metrics.cpu(table_id, cpu)
+        await self._broadcast_spectators(table_id)
+
+    def _seated_players(self, table_id: str) -> List[str]:
+        conns = self.tables.get(table_id, {}).values()
+        # Usa a lista de jogadores do estado do jogo, não das conexões
+        # Isso garante que apenas jogadores realmente no jogo recebam cartas
+        game_engine = self.games.get(table_id)
+        if game_engine is not None:
+            # Sincroniza jogadores: apenas jogadores conectados E no estado do jogo
+            connected = {c.nick for c in conns}
+            return [p for p in game_engine.players if p in connected]
+        # Se não há estado, usa jogadores conectados
+        return [c.nick for c in conns]
+
+    def _state_for(self, table_id: str, c: Optional[Connection], players: Optional[List[str]] = None) -> Dict:
+        """Monta o frame de estado visto pela conexão `c` (None = visão pública, sem cartas)"""
+        if players is None:
+            players = self._seated_players(table_id)
+        game_engine = self.games.get(table_id)
+        if game_engine is None:
+            return state_message(players=players, started=False, community=[], hole_self=[])
+        msg = game_engine.private_view(c.nick if c is not None else None, players, self.clocks.view(table_id))
+        if c is not None and c.stats:
+            msg["stats"] = self.player_stats.view(players)
+        return msg
 
     async def handle_message(self, websocket: WebSocket, data: str) -> None:
-        # MVP: ecoa chat e atualiza estado simples
-        try:
-            msg = json.loads(data)
-        except Exception:
+        conn = self.connections.get(websocket)
+        if conn is None:
             return
-        table_id = None
-        for t, conns in self.tables.items():
-            if any(c.websocket is websocket for c in conns):
-                table_id = t
-                break
-        if not table_id:
+        # qualquer frame recebido é sinal de vida para o heartbeat
+        self.heartbeat.seen(conn)
+        if conn.spectator:
             return
-        if msg.get("type") == "chat":
-            await self.broadcast(table_id, {"type": "chat", "from": msg.get("from"), "text": msg.get("text")})
-        elif msg.get("type") == "start":
-            st = self.holdem_state.get(table_id)
-            if not st:
-                await websocket.send_text(json.dumps(error_message("jogo não suportado ou estado ausente")))
-                return
-            if not st.players:
-                await websocket.send_text(json.dumps(error_message("sem jogadores")))
+        table_id = conn.table_id
+        self.metrics.received(table_id)
+        # Pipeline de entrada: rate limit (conexão e mesa) antes de qualquer parse
+        if not conn.bucket.allow():
+            return
+        bucket = self.table_buckets.get(table_id)
+        if bucket is None:
+            bucket = self.table_buckets[table_id] = table_bucket()
+        if not bucket.allow():
+            return
+        # Mesa acima do limite de CPU/bytes: a mensagem espera, e o loop atende as outras mesas
+        delay = self.quotas.throttle(table_id, self.metrics)
+        if delay:
+            await asyncio.sleep(delay)
+            if self.connections.get(websocket) is not conn:
                 return
-            # Debug: log dos jogadores e stacks
-            print(f"[DEBUG] Iniciar mão - Jogadores na mesa: {len(st.players)}")
-            print(f"[DEBUG] Jogadores: {st.players}")
-            print(f"[DEBUG] Stacks: {st.stacks}")
-            print(f"[DEBUG] Todos os stacks: {[(p, st.stacks.get(p, 'NÃO ENCONTRADO')) for p in st.players]}")
-            players_with_stack = [p for p in st.players if st.stacks.get(p, 0) > 0]
-            print(f"[DEBUG] Jogadores com stack > 0: {len(players_with_stack)}")
-            print(f"[DEBUG] Jogadores com stack: {players_with_stack}")
-            
-            # Verifica número de jogadores
-            if len(st.players) < 2:
-                error_msg = f"É necessário pelo menos 2 jogadores para iniciar a mão. Atualmente há {len(st.players)} jogador(es) na mesa: {st.players}"
-                print(f"[DEBUG] {error_msg}")
-                await websocket.send_text(json.dumps(error_message(error_msg)))
+        # Tamanho + JSON + schema numa única passada; frames inválidos são descartados
+        msg = parse_inbound(data)
+        if msg is None:
+            await self._send(conn, json.dumps(error_message("mensagem inválida")))
+            return
+        if isinstance(msg, PongIn):
+            return
+        if self.draining is not None and (isinstance(msg, StartIn) or (isinstance(msg, ActionIn) and msg.action == "new_hand")):
+            # sem mãos novas durante o drain: a mesa é transferida agora
+            await self._drain_table_if_idle(table_id)
+            return
+        if isinstance(msg, ChatIn):
+            # o remetente é sempre o nick da conexão (não o informado pelo cliente)
+            await self.broadcast(table_id, {"type": "chat", "from": conn.nick, "text": msg.text})
+        elif isinstance(msg, StartIn):
+            game_engine = self.games.get(table_id)
+            if game_engine is None:
+                await self._send(conn, json.dumps(error_message("jogo não suportado ou estado ausente")))
                 return
-            # Verifica se há jogadores com stack antes de iniciar
-            if len(players_with_stack) < 2:
-                error_msg = f"É necessário pelo menos 2 jogadores com fichas para iniciar a mão. Há {len(st.players)} jogador(es) na mesa, mas apenas {len(players_with_stack)} têm fichas. Jogadores sem fichas: {[p for p in st.players if st.stacks.get(p, 0) <= 0]}"
-                print(f"[DEBUG] {error_msg}")
-                await websocket.send_text(json.dumps(error_message(error_msg)))
+            started = time.thread_time()
+            error = game_engine.start()
+            self._charge(table_id, started)
+            if error is not None:
+                print(f"[DEBUG] {error}")
+                await self._send(conn, json.dumps(error_message(error)))
                 return
-            st.start_hand()
+            self._touch_table(table_id)
             await self.broadcast_state(table_id)
-        elif msg.get("type") == "action":
-            action = msg.get("action")
-            st = self.holdem_state.get(table_id)
-            if not st:
-                await websocket.send_text(json.dumps(error_message("estado não encontrado")))
+        elif isinstance(msg, ActionIn):
+            game_engine = self.games.get(table_id)
+            if game_engine is None:
+                await self._send(conn, json.dumps(error_message("estado não encontrado")))
+                return
+            started = time.thread_time()
+            accepted = game_engine.apply(conn.nick, msg)
+            self._charge(table_id, started)
+            if accepted is None:
+                await self._send(conn, json.dumps(error_message("ação não suportada neste jogo")))
+                return
+            if not accepted:
+                # Ação recusada (fora da vez, valor inválido): só o remetente recebe o estado
+                await self._send(conn, json.dumps(self._state_for(table_id, conn)))
                 return
-            elif action in ("check", "call", "fold", "raise", "all_in"):
-                amount = msg.get("amount")
-                # find nick of sender
-                nick = next((c.nick for c in self.tables.get(table_id, []) if c.websocket is websocket), None)
-                if nick:
-                    st.apply_action(nick, action, amount)
-                    # Após ação, verifica se pode avançar automaticamente até showdown
-                    await self._auto_advance_to_showdown(st, table_id)
-            elif action == "new_hand":
-                # Reseta o estado antes de iniciar nova mão
-                st.started = False
-                st.community = []
-                st.hole = {}
-                st.street = "preflop"
-                st.pot = 0
-                st.bets = {}
-                st.total_committed = {p: 0 for p in st.players}
-                st.folded = {}
-                st.all_in = {p: False for p in st.players}
-                st.recent_actions = []
-                # Inicia nova mão
-                st.start_hand()
+            if msg.action == "new_hand":
+                self._touch_table(table_id)
             await self.broadcast_state(table_id)
+            self._record_finished_hand(table_id)
+            await self._settle_tournament_hand(table_id)
+            await self._drain_table_if_idle(table_id)
+    
+    def _arm_clock(self, table_id: str) -> None:
+        """Liga o relógio para quem está na vez (ou desliga se ninguém precisa agir)"""
+        game_engine = self.games.get(table_id)
+        player = game_engine.to_act() if game_engine is not None else None
+        if player is None:
+            self.clocks.stop(table_id)
         else:
+            self.clocks.arm(table_id, player, game_engine.turn_token())
+
+    async def _on_clock_expired(self, table_id: str, nick: str, token: int) -> None:
+        """Tempo esgotado (incluindo time bank): jogada automática definida pelo motor"""
+        game_engine = self.games.get(table_id)
+        if game_engine is None or game_engine.to_act() != nick or game_engine.turn_token() != token:
+            return
+        print(f"[DEBUG] Tempo esgotado para {nick} na mesa {table_id}")
+        started = time.thread_time()
+        game_engine.on_timeout(nick)
+        self._charge(table_id, started)
+        await self.broadcast_state(table_id)
+        self._record_finished_hand(table_id)
+        await self._settle_tournament_hand(table_id)
+        await self._drain_table_if_idle(table_id)
+
+    def _record_finished_hand(self, table_id: str) -> None:
+        game_engine = self.games.get(table_id)
+        hand = game_engine.finished_hand() if game_engine is not None else None
+        if hand is not None:
+            self.hand_history.record(table_id, game_engine.name, hand)
+            if table_id not in self.tournament_tables:
+                self.leaderboard.hand_finished(hand)
+
+    def create_tournament(self, tournament_id: str, players: List[str], *, table_size: int = 9,
+                          name: Optional[str] = None, owner: Optional[Identity] = None) -> Dict:
+        """Cria um torneio multi-mesa; cada mesa do torneio vira uma mesa normal do lobby"""
+        if self.draining is not None:
+            return {"error": "Servidor em manutenção"}
+        if tournament_id in self.tournaments:
+            return {"error": "Torneio já existe"}
+        try:
+            tournament = Tournament(tournament_id, players, table_size=table_size)
+        except ValueError as e:
+            return {"error": str(e)}
+        if len(self.lobby.entries) + len(tournament.tables) > self.lifecycle.max_tables:
+            return {"error": "Limite de mesas do servidor atingido"}
+        error = self.quotas.check_table(owner, len(tournament.tables))
+        if error is not None:
+            return {"error": error, "quota": True}
+        self.tournaments[tournament_id] = tournament
+        for i, table_id in enumerate(tournament.tables):
+            self.tournament_tables[table_id] = tournament
+            self._attach_engine(table_id, TournamentHoldemEngine(tournament, table_id))
+            self.created_tables[table_id] = {
+                "game": "holdem",
+                "name": f"{name or tournament_id} #{i + 1}",
+                "created_at": None,
+            }
+            self.tables.setdefault(table_id, {})
+            self.quotas.table_created(table_id, owner)
+            self._touch_table(table_id)
+        return self.tournament_info(tournament_id)
+
+    def tournament_info(self, tournament_id: str) -> Optional[Dict]:
+        tournament = self.tournaments.get(tournament_id)
+        if tournament is None:
+            return None
+        level = tournament.level()
+        return {
+            "id": tournament_id,
+            "remaining": tournament.remaining(),
+            "tables": {t: tournament.size(t) for t in tournament.tables},
+            "level": tournament.level_index() + 1,
+            "sb": level.sb,
+            "bb": level.bb,
+            "finished": tournament.finished(),
+            "standings": tournament.standings() if tournament.finished() else [],
+        }
+
+    async def _settle_tournament_hand(self, table_id: str) -> None:
+        """Mão de torneio encerrada: elimina, transfere jogadores e faz um broadcast por mesa afetada"""
+        tournament = self.tournament_tables.get(table_id)
+        if tournament is None or table_id not in tournament.tables:
+            return
+        st = tournament.tables[table_id]
+        if not st.started or st.street != "showdown":
+            return
+        result = tournament.hand_finished(table_id)
+        await self._apply_tournament_result(tournament, table_id, result)
+
+    async def _apply_tournament_result(self, tournament: Tournament, table_id: str, result: HandResult) -> None:
+        for nick in result.eliminated:
+            place = tournament.remaining() + len(tournament.finish_order) - tournament.finish_order.index(nick)
+            for c in list(self.tables.get(table_id, {}).values()):
+                if c.nick == nick:
+                    await self._send(c, json.dumps({"type": "eliminated", "tournament": tournament.id, "place": place}))
+        # move as conexões junto com os assentos, sem broadcast por movimento
+        for move in result.moves:
+            conns = self.tables.get(move.source, {})
+            moving = [c for c in conns.values() if c.nick == move.nick]
+            for c in moving:
+                del conns[c.websocket]
+                await self._send(c, json.dumps({"type": "moved", "table": move.target}))
+                c.table_id = move.target
+                if c.session is not None:
+                    c.session.table_id = move.target
+                self.tables.setdefault(move.target, {})[c.websocket] = c
+        if result.broken is not None:
+            self.tournament_tables.pop(result.broken, None)
+            # eliminados (e espectadores) que ainda estavam olhando a mesa desfeita:
+            # avisa, fecha o socket e libera a conexão (índice, heartbeat e quota)
+            leftover = [*self.tables.get(result.broken, {}).values(), *self.spectators.get(result.broken, {}).values()]
+            for c in leftover:
+                self._remove_connection(c)
+                try:
+                    await self._send(c, json.dumps({"type": "table_closed", "tournament": tournament.id}))
+                    await c.websocket.close()
+                except Exception:
+                    pass
+            self._unload_table(result.broken)
+        for t in result.tables:
+            if t != result.broken:
+                self._touch_table(t)
+                await self.broadcast_state(t)
+                self._schedule_tournament_deal(tournament, t)
+
+    def _schedule_tournament_deal(self, tournament: Tournament, table_id: str) -> None:
+        """Agenda a próxima mão da mesa do torneio (não depende de um jogador pedir new_hand)"""
+        async def deal() -> None:
+            game_engine = self.games.get(table_id)
+            if tournament.finished() or not isinstance(game_engine, TournamentHoldemEngine) or game_engine.hand_live():
+                return
+            if self.draining is not None:
+                await self._drain_table_if_idle(table_id)
+                return
+            started = time.thread_time()
+            error = game_engine.next_hand()
+            self._charge(table_id, started)
+            if error is not None:
+                print(f"[DEBUG] Torneio {tournament.id}, mesa {table_id}: {error}")
+                return
+            self._touch_table(table_id)
             await self.broadcast_state(table_id)
-    
-    async def _auto_advance_to_showdown(self, st: HoldemTableState, table_id: str) -> None:
-        """Avança automaticamente até showdown se todos estão all-in ou não há mais ação possível"""
-        # Continua avançando streets enquanto houver jogadores ativos e não estiver no showdown
-        max_iterations = 10  # Evita loop infinito
-        iteration = 0
-        
-        while iteration < max_iterations and st.street != "showdown":
-            iteration += 1
-            active = [p for p in st.players if not st.folded.get(p, False)]
-            
-            # Se só sobrou 1 jogador, vai para showdown
-            if len(active) <= 1:
-                st.street = "showdown"
-                break
-            
-            # Se todos ativos estão all-in, avança automaticamente até showdown
-            all_all_in = all(st.all_in.get(p, False) for p in active)
-            
-            if all_all_in:
-                # Avança até river/showdown
-                while st.street != "showdown":
-                    if st.street == "preflop":
-                        st.next_street()  # vai para flop
-                    elif st.street == "flop":
-                        st.next_street()  # vai para turn
-                    elif st.street == "turn":
-                        st.next_street()  # vai para river
-                    elif st.street == "river":
-                        st.street = "showdown"
-                        break
-                break
-            
-            # Verifica se há alguém para agir
-            to_act_player = st.to_act()
-            if to_act_player is None:
-                # Não há mais ninguém para agir, avança street
-                if st.street != "showdown":
-                    st.next_street()
-                    # Se avançou e ainda não há ninguém para agir, continua
-                    if st.to_act() is None and st.street != "showdown":
-                        continue
-                    else:
-                        break
-                else:
-                    break
-            
-            # Se chegou aqui, há alguém para agir, para o loop
-            break
-        
-        # Se chegou no showdown, calcula vencedores
-        if st.street == "showdown":
-            st.get_winner()
+            # blinds all-in podem levar a mão direto ao showdown
+            self._record_finished_hand(table_id)
+            await self._settle_tournament_hand(table_id)
+        self.scheduler.schedule(("deal", table_id), time.monotonic() + self.tournament_deal_delay, deal)
 
-    def create_table(self, table_id: str, game: str, name: Optional[str] = None) -> Dict:
-        """Cria uma nova mesa (mesmo que vazia)"""
+    def create_table(self, table_id: str, game: str, name: Optional[str] = None,
+                     owner: Optional[Identity] = None) -> Dict:
+        """Cria uma nova mesa (mesmo que vazia); `owner` conta para as quotas de quem criou"""
         if table_id in self.created_tables:
             return {"error": "Mesa já existe"}
+        if self.draining is not None:
+            return {"error": "Servidor em manutenção"}
+        error = self.quotas.check_table(owner)
+        if error is not None:
+            return {"error": error, "quota": True}
+        if not self._ensure_capacity():
+            return {"error": "Limite de mesas do servidor atingido"}
+        self.quotas.table_created(table_id, owner)
         
-        # Inicializa o estado do jogo se for holdem
-        if game == "holdem":
-            self.holdem_state.setdefault(table_id, HoldemTableState())
+        # Inicializa o motor do jogo (se o jogo tem um registrado)
+        self._game_for(table_id, game)
         
         # Armazena informações da mesa
         self.created_tables[table_id] = {
@@ -338,7 +706,8 @@ class ConnectionManager:
         
         # Inicializa lista vazia de conexões se não existir
         if table_id not in self.tables:
-            self.tables[table_id] = []
+            self.tables[table_id] = {}
+        self._touch_table(table_id)
         
         return {
             "id": table_id,
@@ -346,63 +715,255 @@ class ConnectionManager:
             "name": name or table_id,
             "players": [],
             "player_count": 0,
-            "max_players": 9 if game == "holdem" else 4,
+            "max_players": max_players_for(game),
             "started": False,
         }
 
-    def get_tables_info(self) -> List[Dict]:
-        """Retorna informações de todas as salas/tabelas (incluindo vazias)"""
-        tables = []
-        
-        # Adiciona mesas criadas (mesmo que vazias)
-        for table_id, table_info in self.created_tables.items():
-            conns = self.tables.get(table_id, [])
+    def _lobby_entry(self, table_id: str) -> Optional[Dict]:
+        """Monta o resumo de uma mesa para o lobby (None se a mesa não deve aparecer)"""
+        conns = list(self.tables.get(table_id, {}).values())
+        table_info = self.created_tables.get(table_id)
+        if table_info is None and not conns:
+            return None
+        if table_info is not None:
             game = table_info.get("game", "unknown")
-            players = [c.nick for c in conns]
-            
-            # Obtém informações do estado do jogo se for holdem
-            started = False
-            if game == "holdem" and table_id in self.holdem_state:
-                st = self.holdem_state[table_id]
-                started = st.started
-                players = st.players.copy()
-            
-            table_data = {
-                "id": table_id,
-                "game": game,
-                "name": table_info.get("name", table_id),
-                "players": players,
-                "player_count": len(players),
-                "max_players": 9 if game == "holdem" else 4,
-                "started": started,
-            }
-            tables.append(table_data)
+            name = table_info.get("name", table_id)
+        else:
+            # Mesa legacy: tem conexões mas não foi criada explicitamente
+            game = conns[0].game if conns else "unknown"
+            name = table_id
+        players = [c.nick for c in conns]
         
-        # Adiciona mesas que têm conexões mas não foram criadas explicitamente (legacy)
-        for table_id, conns in self.tables.items():
-            if table_id not in self.created_tables and conns:
-                game = conns[0].game if conns else "unknown"
-                players = [c.nick for c in conns]
-                
-                # Obtém informações do estado do jogo se for holdem
-                started = False
-                if game == "holdem" and table_id in self.holdem_state:
-                    st = self.holdem_state[table_id]
-                    started = st.started
-                    players = st.players.copy()
-                
-                table_data = {
-                    "id": table_id,
-                    "game": game,
-                    "name": table_id,
-                    "players": players,
-                    "player_count": len(players),
-                    "max_players": 9 if game == "holdem" else 4,
-                    "started": started,
-                }
-                tables.append(table_data)
+        # Jogadores e estado vêm do motor, se a mesa tiver um
+        started = False
+        max_players = max_players_for(game)
+        game_engine = self.games.get(table_id)
+        if game_engine is not None:
+            started = game_engine.summary()["started"]
+            players = list(game_engine.players)
+            max_players = game_engine.max_players
         
-        return tables
+        return {
+            "id": table_id,
+            "game": game,
+            "name": name,
+            "players": players,
+            "player_count": len(players),
+            "max_players": max_players,
+            "started": started,
+        }
+
+    def _touch_table(self, table_id: str) -> None:
+        """Atualiza a entrada da mesa no índice do lobby após mudança de mesa/assento"""
+        entry = self._lobby_entry(table_id)
+        if entry is None:
+            self.lobby.remove(table_id)
+            self.lifecycle.forget(table_id)
+        else:
+            self.lobby.upsert(table_id, entry)
+            if self.tables.get(table_id) or self.spectators.get(table_id) or table_id in self.tournament_tables:
+                # mesas de torneio nunca expiram enquanto o torneio existe
+                self.lifecycle.mark_busy(table_id)
+            else:
+                self.lifecycle.mark_idle(table_id)
+
+    def _ensure_capacity(self) -> bool:
+        """Garante espaço para mais uma mesa, despejando a mesa vazia menos recente se preciso"""
+        if len(self.lobby.entries) < self.lifecycle.max_tables:
+            return True
+        victim = self.lifecycle.lru_victim()
+        if victim is None:
+            return False
+        self.evict_table(victim)
+        return True
+
+    def evict_table(self, table_id: str) -> None:
+        """Remove uma mesa vazia da memória (hibernando no Redis se configurado)"""
+        if self.tables.get(table_id) or self.spectators.get(table_id):
+            # voltou a ter conexões, não remove
+            self.lifecycle.mark_busy(table_id)
+            return
+        table_info, game_engine = self._unload_table(table_id)
+        if self.lifecycle.hibernate and table_info is not None:
+            snapshot = {"table": table_info, "state": game_engine.snapshot() if game_engine else None}
+            try:
+                asyncio.get_running_loop().create_task(self._hibernate(table_id, snapshot))
+            except RuntimeError:
+                pass  # sem event loop (ex.: chamada síncrona fora do servidor)
+
+    def _unload_table(self, table_id: str) -> Tuple[Optional[Dict], Optional[GameEngine]]:
+        """Tira a mesa da memória do nó; retorna a definição e o motor (para snapshot)"""
+        table_info = self.created_tables.pop(table_id, None)
+        game_engine = self.games.pop(table_id, None)
+        self.player_stats.forget_table(table_id)
+        self.tables.pop(table_id, None)
+        self.spectators.pop(table_id, None)
+        self.lobby.remove(table_id)
+        self.lifecycle.forget(table_id)
+        self.clocks.forget_table(table_id)
+        self.scheduler.cancel(("deal", table_id))
+        self.sessions.forget_table(table_id)
+        self.replay.pop(table_id, None)
+        self.table_buckets.pop(table_id, None)
+        self.metrics.forget(table_id)
+        self.quotas.table_removed(table_id)
+        return table_info, game_engine
+
+    def start_drain(self, *, deadline_seconds: Optional[float] = None, target: Optional[str] = None) -> Dict:
+        """Entra em modo drain (SIGUSR1 ou POST /api/admin/drain).
+
+        O nó para de aceitar mesas, jogadores e mãos novas. Mesas sem mão em
+        andamento são transferidas logo; as outras quando a mão termina ou no
+        prazo (DRAIN_DEADLINE). Transferir = salvar o snapshot no Redis (o nó
+        de destino restaura com TABLE_HIBERNATE=1) e mandar {"type": "reconnect"}
+        aos clientes, com o destino (DRAIN_TARGET; sem destino, o cliente
+        reconecta na mesma URL e o balanceador escolhe outro nó).
+        """
+        if self.draining is None:
+            seconds = deadline_seconds if deadline_seconds is not None else float(os.getenv("DRAIN_DEADLINE", "120"))
+            self.draining = {
+                "since": time.time(),
+                "deadline": time.time() + seconds,
+                "target": target if target is not None else os.getenv("DRAIN_TARGET"),
+                "released": 0,
+                "done": False,
+            }
+            print(f"[DEBUG] Drain iniciado: prazo de {seconds:g}s, destino {self.draining['target']}")
+            now = time.monotonic()
+            self.scheduler.schedule(("drain", "idle"), now, self._drain_idle_tables)
+            self.scheduler.schedule(("drain", "deadline"), now + seconds, self.finish_drain)
+        return self.drain_status()
+
+    def drain_status(self) -> Dict:
+        status = {"draining": self.draining is not None, "tables": len(self.lobby.entries),
+                  "connections": len(self.connections)}
+        if self.draining is not None:
+            status.update(self.draining)
+        return status
+
+    async def _drain_idle_tables(self) -> None:
+        for table_id in list(self.lobby.entries):
+            await self._drain_table_if_idle(table_id)
+
+    async def _drain_table_if_idle(self, table_id: str) -> None:
+        """Em drain, transfere a mesa se não há mão em andamento (torneios só no prazo)"""
+        if self.draining is None or table_id in self.tournament_tables:
+            return
+        game_engine = self.games.get(table_id)
+        if game_engine is not None and game_engine.to_act() is not None:
+            return
+        await self._release_table(table_id)
+
+    async def finish_drain(self) -> None:
+        """Prazo do drain (ou shutdown): transfere todas as mesas restantes, com mão em andamento ou não"""
+        if self.draining is None:
+            self.draining = {"since": time.time(), "deadline": time.time(), "target": os.getenv("DRAIN_TARGET"),
+                             "released": 0, "done": False}
+        for table_id in list(self.lobby.entries):
+            await self._release_table(table_id)
+        self._drain_done()
+
+    def _drain_done(self) -> None:
+        if self.draining["done"]:
+            return
+        self.draining["done"] = True
+        self.scheduler.cancel(("drain", "deadline"))
+        print(f"[DEBUG] Drain concluído: {self.draining['released']} mesa(s) transferida(s)")
+
+    def _reconnect_frame(self, table_id: str) -> str:
+        target = self.draining["target"] if self.draining is not None else None
+        return json.dumps({"type": "reconnect", "table": table_id, "target": target})
+
+    async def _release_table(self, table_id: str) -> None:
+        """Salva a mesa no store compartilhado, manda reconnect aos clientes e a tira do nó"""
+        if table_id not in self.lobby.entries:
+            return
+        game_engine = self.games.get(table_id)
+        table_info = self.created_tables.get(table_id) or {
+            "game": self.lobby.entries[table_id]["game"], "name": table_id, "created_at": None,
+        }
+        if table_id in self.tournament_tables:
+            # mesas de torneio dependem do Tournament deste nó: não são restauráveis em outro nó
+            print(f"[ERROR] Mesa de torneio {table_id} encerrada pelo drain sem snapshot")
+        else:
+            snapshot = {"table": table_info, "state": game_engine.snapshot() if game_engine else None}
+            try:
+                await save_table_snapshot(table_id, snapshot)
+            except Exception as e:
+                print(f"[ERROR] Erro ao salvar mesa {table_id} no drain: {e}")
+        frame = self._reconnect_frame(table_id)
+        conns = list(self.tables.get(table_id, {}).values()) + list(self.spectators.get(table_id, {}).values())
+        for c in conns:
+            self._remove_connection(c)
+            try:
+                await c.websocket.send_text(frame)
+                await c.websocket.close(code=1012)  # 1012 = service restart
+            except Exception:
+                pass
+        self.tournament_tables.pop(table_id, None)
+        self._unload_table(table_id)
+        self.draining["released"] += 1
+        if not self.lobby.entries:
+            self._drain_done()
+
+    async def _hibernate(self, table_id: str, snapshot: Dict) -> None:
+        try:
+            await save_table_snapshot(table_id, snapshot)
+        except Exception as e:
+            print(f"[ERROR] Erro ao hibernar mesa {table_id}: {e}")
+
+    async def _restore_table(self, table_id: str) -> None:
+        try:
+            snapshot = await load_table_snapshot(table_id)
+        except Exception as e:
+            print(f"[ERROR] Erro ao restaurar mesa {table_id}: {e}")
+            return
+        if not snapshot:
+            return
+        self.created_tables[table_id] = snapshot["table"]
+        engine_cls = get_engine(snapshot["table"].get("game"))
+        data = snapshot.get("state")
+        if engine_cls is not None and data:
+            self._attach_engine(table_id, engine_cls.restore(data))
+        self.tables.setdefault(table_id, {})
+        self._touch_table(table_id)
+
+    def table_report(self, table_id: str, memory: bool = False) -> Dict:
+        """Diagnóstico de uma mesa (admin): conexões, tráfego, buffers e, com `memory`, memória do motor"""
+        replay = self.replay.get(table_id)
+        report = {
+            "id": table_id,
+            "game": (self.lobby.entries.get(table_id) or {}).get("game"),
+            "connections": len(self.tables.get(table_id, {})),
+            "spectators": len(self.spectators.get(table_id, {})),
+            "replayFrames": len(replay.frames) if replay is not None else 0,
+            **self.metrics.view(table_id),
+            "throttleDelay": self.quotas.throttled.get(table_id, 0.0),
+            "owner": self.quotas.owners.get(table_id),
+        }
+        if memory:
+            game_engine = self.games.get(table_id)
+            # listeners apontam para o manager inteiro: ficam fora da conta
+            report["engineBytes"] = deep_size(game_engine.state) if game_engine is not None else 0
+            report["replayBytes"] = deep_size(replay) if replay is not None else 0
+        return report
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Filas e trabalho pendente do nó (admin)"""
+        return {
+            "timers": len(self.scheduler),
+            "timerHeap": self.scheduler.heap_size,
+            "handHistoryPending": len(self.hand_history.pending),
+            "handHistoryTasks": self.hand_history.in_flight,
+            "leaderboardTasks": self.leaderboard.in_flight,
+            "lobbyPending": self.lobby.pending_changes,
+            "lobbySubscribers": len(self.lobby_feed.subscribers),
+            "sessions": len(self.sessions.sessions),
+        }
+
+    def get_tables_info(self) -> List[Dict]:
+        """Retorna informações de todas as salas/tabelas (incluindo vazias)"""
+        return self.lobby.listing()
 
     def get_table_info(self, table_id: str) -> Optional[Dict]:
         """Retorna informações detalhadas de uma sala específica"""
@@ -416,49 +977,27 @@ class ConnectionManager:
             game = table_info_data.get("game", "unknown")
         else:
             # Mesa legacy (não foi criada explicitamente)
-            conns = self.tables.get(table_id, [])
+            conns = list(self.tables.get(table_id, {}).values())
             if not conns:
                 return None
             game = conns[0].game if conns else "unknown"
         
-        conns = self.tables.get(table_id, [])
+        conns = self.tables.get(table_id, {}).values()
         players = [c.nick for c in conns] if conns else []
         
-        # Obtém informações do estado do jogo se for holdem
-        started = False
-        street = None
-        pot = 0
-        dealer = None
-        sb = None
-        bb = None
-        
-        if game == "holdem" and table_id in self.holdem_state:
+        # Obtém informações do estado do jogo pelo motor da mesa
+        summary = {"started": False, "street": None, "pot": 0, "dealer": None, "sb": None, "bb": None}
+        max_players = max_players_for(game)
+        game_engine = self.games.get(table_id)
+        if game_engine is not None:
             try:
-                st = self.holdem_state[table_id]
-                started = getattr(st, "started", False)
-                street = getattr(st, "street", None)
-                pot = getattr(st, "pot", 0)
-                dealer = getattr(st, "dealer", None)
-                sb = getattr(st, "sb", None)
-                bb = getattr(st, "bb", None)
-                # Atualiza players do estado do jogo se existir
-                if hasattr(st, "players"):
-                    players = st.players.copy() if st.players else []
+                summary.update(game_engine.summary())
+                players = list(game_engine.players)
+                max_players = game_engine.max_players
             except Exception as e:
                 # Se houver erro ao acessar o estado, usa valores padrão
                 print(f"[ERROR] Erro ao acessar estado da mesa {table_id}: {e}")
-                started = False
-                street = None
-                pot = 0
-                dealer = None
-                sb = None
-                bb = None
-                # Garante que players está definido
-                if not players:
-                    players = []
         
-        # Determina slots disponíveis (1-9 para holdem, 1-4 para sueca)
-        max_players = 9 if game == "holdem" else 4
         # Slots ocupados são baseados na ordem dos jogadores (1 = primeiro, 2 = segundo, etc)
         occupied_slots = list(range(1, len(players) + 1))
         available_slots = [i for i in range(1, max_players + 1) if i not in occupied_slots]
@@ -475,12 +1014,7 @@ class ConnectionManager:
             "players": players,
             "player_count": len(players),
             "max_players": max_players,
-            "started": started,
-            "street": street,
-            "pot": pot,
-            "dealer": dealer,
-            "sb": sb,
-            "bb": bb,
+            **summary,
             "occupied_slots": list(occupied_slots),
             "available_slots": available_slots,
         }
@@ -0,0 +1,108 @@
+import heapq
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Rate:
+    """Taxa por segundo com decaimento exponencial (constante `tau`): O(1) por evento, sem janelas"""
+
+    __slots__ = ("value", "at")
+
+    def __init__(self):
+        self.value = 0.0
+        self.at = 0.0
+
+    def add(self, amount: float, now: float, tau: float) -> None:
+        self.value = self.value * math.exp((self.at - now) / tau) + amount / tau
+        self.at = now
+
+    def get(self, now: float, tau: float) -> float:
+        return self.value * math.exp((self.at - now) / tau)
+
+
+class TableCounters:
+    __slots__ = ("messages_in", "frames_out", "bytes_out", "broadcasts", "cpu_seconds",
+                 "message_rate", "byte_rate", "cpu_rate")
+
+    def __init__(self):
+        self.messages_in = 0
+        self.frames_out = 0
+        self.bytes_out = 0
+        self.broadcasts = 0
+        self.cpu_seconds = 0.0
+        self.message_rate = Rate()
+        self.byte_rate = Rate()
+        self.cpu_rate = Rate()
+
+
+class TableMetrics:
+    """Contadores de tráfego por mesa (GET /api/admin/tables): mensagens recebidas,
+    frames/bytes enviados, CPU gasta pela mesa e taxas recentes (média móvel de
+    METRICS_RATE_SECONDS)."""
+
+    def __init__(self, *, tau: Optional[float] = None):
+        self.tau = tau if tau is not None else float(os.getenv("METRICS_RATE_SECONDS", "30"))
+        self.tables: Dict[str, TableCounters] = {}
+
+    def _counters(self, table_id: str) -> TableCounters:
+        c = self.tables.get(table_id)
+        if c is None:
+            c = self.tables[table_id] = TableCounters()
+        return c
+
+    def received(self, table_id: str) -> None:
+        c = self._counters(table_id)
+        c.messages_in += 1
+        c.message_rate.add(1, time.monotonic(), self.tau)
+
+    def sent(self, table_id: str, size: int) -> None:
+        c = self._counters(table_id)
+        c.frames_out += 1
+        c.bytes_out += size
+        c.byte_rate.add(size, time.monotonic(), self.tau)
+
+    def cpu(self, table_id: str, seconds: float) -> None:
+        c = self._counters(table_id)
+        c.cpu_seconds += seconds
+        c.cpu_rate.add(seconds, time.monotonic(), self.tau)
+
+    def load(self, table_id: str) -> Tuple[float, float]:
+        """(fração de um core, bytes/s) recentes da mesa, para o throttling"""
+        c = self.tables.get(table_id)
+        if c is None:
+            return 0.0, 0.0
+        now = time.monotonic()
+        return c.cpu_rate.get(now, self.tau), c.byte_rate.get(now, self.tau)
+
+    def broadcast(self, table_id: str) -> None:
+        self._counters(table_id).broadcasts += 1
+
+    def forget(self, table_id: str) -> None:
+        self.tables.pop(table_id, None)
+
+    def view(self, table_id: str, now: Optional[float] = None) -> Dict[str, Any]:
+        now = now if now is not None else time.monotonic()
+        c = self.tables.get(table_id) or TableCounters()
+        return {
+            "messagesIn": c.messages_in,
+            "framesOut": c.frames_out,
+            "bytesOut": c.bytes_out,
+            "broadcasts": c.broadcasts,
+            "messagesPerSecond": round(c.message_rate.get(now, self.tau), 2),
+            "bytesPerSecond": round(c.byte_rate.get(now, self.tau), 1),
+            "cpuSeconds": round(c.cpu_seconds, 4),
+            "cpuShare": round(c.cpu_rate.get(now, self.tau), 4),
+        }
+
+    def hottest(self, k: int, by: str = "bytes") -> List[str]:
+        """Top-K mesas pela taxa recente de bytes enviados, mensagens recebidas ou CPU"""
+        now = time.monotonic()
+        if by == "messages":
+            key = lambda t: self.tables[t].message_rate.get(now, self.tau)
+        elif by == "cpu":
+            key = lambda t: self.tables[t].cpu_rate.get(now, self.tau)
+        else:
+            key = lambda t: self.tables[t].byte_rate.get(now, self.tau)
+        return heapq.nlargest(k, self.tables, key=key)
@@ -1,7 +1,7 @@
 from typing import Any, Dict, List, Optional
 
 
-def state_message(*, players: List[str], started: bool, community: List[str], hole_self: List[str], pot: int = 0, street: Optional[str] = None, to_act: Optional[str] = None, winners: Optional[List[str]] = None, recent_actions: Optional[List[Dict[str, Any]]] = None, call_amount: Optional[int] = None, stacks: Optional[Dict[str, int]] = None, dealer: Optional[str] = None, sb: Optional[str] = None, bb: Optional[str] = None, min_raise: Optional[int] = None, all_holes: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+def state_message(*, players: List[str], started: bool, community: List[str], hole_self: List[str], pot: int = 0, street: Optional[str] = None, to_act: Optional[str] = None, winners: Optional[List[str]] = None, recent_actions: Optional[List[Dict[str, Any]]] = None, call_amount: Optional[int] = None, stacks: Optional[Dict[str, int]] = None, dealer: Optional[str] = None, sb: Optional[str] = None, bb: Optional[str] = None, min_raise: Optional[int] = None, all_holes: Optional[Dict[str, List[str]]] = None, pots: Optional[List[Dict[str, Any]]] = None, action_clock: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     return {
         "type": "state",
         "players": players,
@@ -20,6 +20,31 @@ def state_message(*, players: List[str], started: bool, community: List[str], ho
         "bb": bb,
         "minRaise": min_raise,
         "allHoles": all_holes or {},
+        "pots": pots or [],
+        "actionClock": action_clock,
+    }
+
+def sueca_state_message(*, players: List[str], started: bool, finished: bool, hand_self: List[str], legal: List[str], trump: Optional[str], trump_card: Optional[str], trick: List[Dict[str, str]], last_trick: List[Dict[str, str]], last_trick_winner: Optional[str], to_act: Optional[str], dealer: Optional[str], points: List[int], score: List[int], hand_counts: Dict[str, int], recent_actions: Optional[List[Dict[str, Any]]] = None, action_clock: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "type": "state",
+        "game": "sueca",
+        "players": players,
+        "started": started,
+        "finished": finished,
+        "hand": hand_self,
+        "legal": legal,
+        "trump": trump,
+        "trumpCard": trump_card,
+        "trick": trick,
+        "lastTrick": last_trick,
+        "lastTrickWinner": last_trick_winner,
+        "toAct": to_act,
+        "dealer": dealer,
+        "points": points,
+        "score": score,
+        "handCounts": hand_counts,
+        "recentActions": recent_actions or [],
+        "actionClock": action_clock,
     }
 
 def error_message(text: str) -> Dict[str, Any]:
@@ -0,0 +1,188 @@
+import collections
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from .inbound import TokenBucket
+from .metrics import TableMetrics
+
+# (cliente, origem) de quem abriu a conexão / fez a requisição; None = fora das quotas
+Identity = Tuple[str, str]
+
+
+def client_identity(conn: Any) -> Optional[Identity]:
+    """IP do cliente (1º X-Forwarded-For com QUOTA_TRUST_PROXY=1) e header Origin.
+
+    Atrás de um proxy reverso / balanceador, sem QUOTA_TRUST_PROXY=1 todos
+    os clientes aparecem com o IP do proxy e dividem a mesma quota. Só ligue
+    se o proxy sobrescreve o X-Forwarded-For; exposto direto, o header é do
+    cliente e pode ser forjado. Usuários atrás do mesmo NAT continuam
+    dividindo o IP: ajuste QUOTA_*_PER_CLIENT para isso.
+
+    Aceita WebSocket ou Request; os bots do servidor (BotSocket) não têm
+    headers e contam para quem criou a mesa (None se a mesa não tem dono).
+    """
+    headers = getattr(conn, "headers", None)
+    if headers is None:
+        return getattr(conn, "owner", None)
+    client = getattr(conn, "client", None)
+    host = client.host if client is not None else "-"
+    if os.getenv("QUOTA_TRUST_PROXY", "0").lower() in ("1", "true", "yes", "on"):
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            host = forwarded.split(",")[0].strip()
+    return host, headers.get("origin") or "-"
+
+
+class ClientBuckets:
+    """Token bucket por cliente (IP) para rotas HTTP caras e sem login.
+
+    Guarda no máximo `max_clients` buckets; os usados há mais tempo saem
+    primeiro (um bucket recriado começa cheio, o que só favorece quem sumiu).
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets: "collections.OrderedDict[str, TokenBucket]" = collections.OrderedDict()
+        self.refused = 0
+
+    def allow(self, host: str) -> bool:
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(host)
+        if bucket.allow():
+            return True
+        self.refused += 1
+        return False
+
+
+class Quotas:
+    """Quotas por cliente/origem (mesas vivas e conexões simultâneas) e throttling por mesa.
+
+    Limites 0 desligam a quota. As quotas por origem vêm desligadas: todos os
+    usuários do próprio site chegam com a mesma Origin, então elas só fazem
+    sentido para limitar sites de terceiros (ex.: QUOTA_TABLES_PER_ORIGIN
+    num nó que aceita embeds). Uma mesa cuja média recente de CPU
+    (fração de um core) ou de bytes enviados passa de TABLE_CPU_LIMIT /
+    TABLE_BYTES_LIMIT entra em throttling suave: as mensagens recebidas
+    dela esperam um atraso proporcional ao excesso antes de serem
+    processadas, e o loop atende as outras mesas nesse meio tempo.
+    """
+
+    def __init__(self, *, tables_per_client: Optional[int] = None, tables_per_origin: Optional[int] = None,
+                 connections_per_client: Optional[int] = None, connections_per_origin: Optional[int] = None,
+                 cpu_limit: Optional[float] = None, bytes_limit: Optional[float] = None,
+                 throttle_delay: Optional[float] = None):
+        self.tables_per_client = tables_per_client if tables_per_client is not None else int(os.getenv("QUOTA_TABLES_PER_CLIENT", "20"))
+        self.tables_per_origin = tables_per_origin if tables_per_origin is not None else int(os.getenv("QUOTA_TABLES_PER_ORIGIN", "0"))
+        self.connections_per_client = connections_per_client if connections_per_client is not None else int(os.getenv("QUOTA_CONNECTIONS_PER_CLIENT", "50"))
+        self.connections_per_origin = connections_per_origin if connections_per_origin is not None else int(os.getenv("QUOTA_CONNECTIONS_PER_ORIGIN", "0"))
+        self.cpu_limit = cpu_limit if cpu_limit is not None else float(os.getenv("TABLE_CPU_LIMIT", "0.2"))
+        self.bytes_limit = bytes_limit if bytes_limit is not None else float(os.getenv("TABLE_BYTES_LIMIT", "1000000"))
+        self.throttle_delay = throttle_delay if throttle_delay is not None else float(os.getenv("TABLE_THROTTLE_DELAY", "0.05"))
+        self.owners: Dict[str, Identity] = {}
+        self.tables_by_client: collections.Counter = collections.Counter()
+        self.tables_by_origin: collections.Counter = collections.Counter()
+        self.connections_by_client: collections.Counter = collections.Counter()
+        self.connections_by_origin: collections.Counter = collections.Counter()
+        self.throttled: Dict[str, float] = {}  # mesa -> atraso atual (s)
+        self.refused = {"tables": 0, "connections": 0}
+
+    @staticmethod
+    def _decrement(counter: collections.Counter, key: str) -> None:
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+
+    @staticmethod
+    def _over(counter: collections.Counter, key: str, limit: int, count: int) -> bool:
+        return limit > 0 and counter[key] + count > limit
+
+    def check_table(self, who: Optional[Identity], count: int = 1) -> Optional[str]:
+        """Erro se `who` não pode criar mais `count` mesas; None se pode"""
+        if who is None:
+            return None
+        host, origin = who
+        if self._over(self.tables_by_client, host, self.tables_per_client, count):
+            error = "Limite de mesas por cliente atingido"
+        elif self._over(self.tables_by_origin, origin, self.tables_per_origin, count):
+            error = "Limite de mesas por origem atingido"
+        else:
+            return None
+        self.refused["tables"] += 1
+        return error
+
+    def table_created(self, table_id: str, who: Optional[Identity]) -> None:
+        if who is None or table_id in self.owners:
+            return
+        self.owners[table_id] = who
+        self.tables_by_client[who[0]] += 1
+        self.tables_by_origin[who[1]] += 1
+
+    def table_removed(self, table_id: str) -> None:
+        self.throttled.pop(table_id, None)
+        who = self.owners.pop(table_id, None)
+        if who is not None:
+            self._decrement(self.tables_by_client, who[0])
+            self._decrement(self.tables_by_origin, who[1])
+
+    def check_connection(self, who: Optional[Identity]) -> Optional[str]:
+        if who is None:
+            return None
+        host, origin = who
+        if self._over(self.connections_by_client, host, self.connections_per_client, 1):
+            error = "Limite de conexões por cliente atingido"
+        elif self._over(self.connections_by_origin, origin, self.connections_per_origin, 1):
+            error = "Limite de conexões por origem atingido"
+        else:
+            return None
+        self.refused["connections"] += 1
+        return error
+
+    def connection_opened(self, who: Optional[Identity]) -> None:
+        if who is not None:
+            self.connections_by_client[who[0]] += 1
+            self.connections_by_origin[who[1]] += 1
+
+    def connection_closed(self, who: Optional[Identity]) -> None:
+        if who is not None:
+            self._decrement(self.connections_by_client, who[0])
+            self._decrement(self.connections_by_origin, who[1])
+
+    def throttle(self, table_id: str, metrics: TableMetrics) -> float:
+        """Atraso (s) a aplicar às mensagens da mesa agora; 0 se ela está dentro dos limites"""
+        cpu, out = metrics.load(table_id)
+        over = max(cpu / self.cpu_limit if self.cpu_limit > 0 else 0.0,
+                   out / self.bytes_limit if self.bytes_limit > 0 else 0.0)
+        if over <= 1:
+            if self.throttled.pop(table_id, None) is not None:
+                print(f"[DEBUG] Mesa {table_id} saiu do throttling")
+            return 0.0
+        delay = min(self.throttle_delay * over, self.throttle_delay * 20)
+        if table_id not in self.throttled:
+            print(f"[DEBUG] Mesa {table_id} em throttling: CPU {cpu:.1%}, {out:.0f} B/s")
+        self.throttled[table_id] = delay
+        return delay
+
+    def view(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "limits": {
+                "tablesPerClient": self.tables_per_client,
+                "tablesPerOrigin": self.tables_per_origin,
+                "connectionsPerClient": self.connections_per_client,
+                "connectionsPerOrigin": self.connections_per_origin,
+                "tableCpu": self.cpu_limit,
+                "tableBytesPerSecond": self.bytes_limit,
+            },
+            "tablesByClient": dict(self.tables_by_client.most_common(top)),
+            "tablesByOrigin": dict(self.tables_by_origin.most_common(top)),
+            "connectionsByClient": dict(self.connections_by_client.most_common(top)),
+            "connectionsByOrigin": dict(self.connections_by_origin.most_common(top)),
+            "throttled": {t: round(d, 3) for t, d in self.throttled.items()},
+            "refused": dict(self.refused),
+        }
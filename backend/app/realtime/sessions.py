@@ -0,0 +1,62 @@
+import os
+import secrets
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class Session:
+    """Sessão de um jogador numa mesa, sobrevive a reconexões do websocket."""
+
+    __slots__ = ("token", "table_id", "nick", "seq", "detached_at")
+
+    def __init__(self, token: str, table_id: str, nick: str):
+        self.token = token
+        self.table_id = table_id
+        self.nick = nick
+        self.seq = 0  # número de sequência do último frame enviado
+        self.detached_at: Optional[int] = None  # broadcasts da mesa quando a conexão caiu
+
+
+class SessionStore:
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("SESSION_TTL", "120"))
+        self.sessions: Dict[str, Session] = {}
+
+    def issue(self, table_id: str, nick: str) -> Session:
+        session = Session(secrets.token_urlsafe(16), table_id, nick)
+        self.sessions[session.token] = session
+        return session
+
+    def resume(self, token: Optional[str], table_id: str, nick: str) -> Optional[Session]:
+        """Retorna a sessão se o token pertence a este jogador nesta mesa."""
+        session = self.sessions.get(token) if token else None
+        if session is None or session.table_id != table_id or session.nick != nick:
+            return None
+        return session
+
+    def expire(self, token: str) -> None:
+        self.sessions.pop(token, None)
+
+    def forget_table(self, table_id: str) -> None:
+        for token in [t for t, s in self.sessions.items() if s.table_id == table_id]:
+            del self.sessions[token]
+
+
+class ReplayBuffer:
+    """Últimos frames enviados numa mesa, para reenviar só o que o cliente perdeu."""
+
+    def __init__(self, maxlen: Optional[int] = None):
+        self.frames: Deque[Tuple[str, int, str]] = deque(maxlen=maxlen or int(os.getenv("REPLAY_BUFFER", "512")))
+        self.broadcasts = 0  # broadcasts feitos na mesa (detecta mudanças com a sessão desconectada)
+
+    def record(self, token: str, seq: int, text: str) -> None:
+        self.frames.append((token, seq, text))
+
+    def missed(self, session: Session, last_seq: int) -> Optional[List[str]]:
+        """Frames da sessão com seq > last_seq, ou None se o buffer não cobre o intervalo."""
+        if last_seq >= session.seq:
+            return []
+        frames = [text for token, seq, text in self.frames if token == session.token and seq > last_seq]
+        if len(frames) != session.seq - last_seq:
+            return None
+        return frames
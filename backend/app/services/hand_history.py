@@ -0,0 +1,153 @@
+import asyncio
+import json
+import os
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from ..deps import get_engine, init_db
+
+if TYPE_CHECKING:
+    from ..models import HandRecord
+
+# sqlmodel e os modelos são importados só no primeiro acesso ao banco (ver deps.py)
+
+# Colunas exportadas (na ordem do NDJSON e dos arquivos colunares)
+COLUMNS = ["id", "table_id", "game", "ended_at", "players", "winners", "pot", "data"]
+_RECORD_FIELDS = ("players", "winners", "pot")  # viram colunas próprias, fora de `data`
+
+
+def save_hands(records: List[Dict[str, Any]]) -> None:
+    """Grava um lote (roda no executor; na primeira vez espera o banco ficar pronto)"""
+    from sqlmodel import Session
+    from ..models import HandRecord
+    init_db()
+    with Session(get_engine()) as session:
+        session.add_all([HandRecord(**r) for r in records])
+        session.commit()
+
+
+def iter_hands(table_id: Optional[str] = None, since: int = 0, *, batch: int = 500,
+               limit: Optional[int] = None) -> Iterator["HandRecord"]:
+    """Mãos com id > `since`, em ordem de id.
+
+    Paginação por chave (id > último id visto, LIMIT batch): cada página é
+    uma consulta curta, então a memória não depende do tamanho do intervalo
+    e não há transação aberta durante o envio.
+    """
+    from sqlmodel import Session, select
+    from ..models import HandRecord
+    init_db()
+    cursor = since
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch if remaining is None else min(batch, remaining)
+        query = select(HandRecord).where(HandRecord.id > cursor)
+        if table_id is not None:
+            query = query.where(HandRecord.table_id == table_id)
+        with Session(get_engine()) as session:
+            rows = session.exec(query.order_by(HandRecord.id).limit(size)).all()
+        if not rows:
+            return
+        yield from rows
+        cursor = rows[-1].id
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < size:
+            return
+
+
+def holdem_actions(before: Optional[float] = None, batch: int = 5000) -> Iterator[Tuple[List[str], List[List[Any]]]]:
+    """(jogadores, ações) de cada mão de Hold'em gravada (encerrada antes de `before`), para PlayerStats.from_history"""
+    for row in iter_hands(batch=batch):
+        if row.game == "holdem" and (before is None or row.ended_at < before):
+            yield row.players.split(","), json.loads(row.data).get("actions", [])
+
+
+def hand_to_dict(row: "HandRecord") -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "table_id": row.table_id,
+        "game": row.game,
+        "ended_at": row.ended_at,
+        "players": row.players.split(",") if row.players else [],
+        "winners": row.winners.split(",") if row.winners else [],
+        "pot": row.pot,
+        "data": json.loads(row.data),
+    }
+
+
+def ndjson_lines(rows: Iterable["HandRecord"], chunk_rows: int = 100) -> Iterator[bytes]:
+    """NDJSON em blocos de `chunk_rows` linhas (menos chamadas de escrita no socket)"""
+    chunk: List[str] = []
+    for row in rows:
+        chunk.append(json.dumps(hand_to_dict(row), separators=(",", ":")))
+        if len(chunk) >= chunk_rows:
+            yield ("\n".join(chunk) + "\n").encode()
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Um único stream gzip; cada bloco é descarregado (Z_SYNC_FLUSH) para o cliente descomprimir incrementalmente"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = cabeçalho gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class HandHistoryWriter:
+    """Grava as mãos encerradas em lote, fora do event loop.
+
+    record() só enfileira; o flush roda num executor a cada
+    HAND_HISTORY_FLUSH_SECONDS ou quando o lote chega a HAND_HISTORY_BATCH.
+    """
+
+    def __init__(self, scheduler, *, flush_seconds: Optional[float] = None, batch: Optional[int] = None):
+        self.scheduler = scheduler
+        self.flush_seconds = flush_seconds if flush_seconds is not None else float(os.getenv("HAND_HISTORY_FLUSH_SECONDS", "1"))
+        self.batch = batch or int(os.getenv("HAND_HISTORY_BATCH", "200"))
+        self.enabled = os.getenv("HAND_HISTORY", "1").lower() in ("1", "true", "yes", "on")
+        self.pending: List[Dict[str, Any]] = []  # colunas de HandRecord, gravadas no flush
+        self.written = 0
+        self._tasks: set = set()
+
+    @property
+    def in_flight(self) -> int:
+        """Flushes em andamento"""
+        return len(self._tasks)
+
+    def record(self, table_id: str, game: str, hand: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        self.pending.append(dict(
+            table_id=table_id,
+            game=game,
+            ended_at=time.time(),
+            players=",".join(hand.get("players", [])),
+            winners=",".join(hand.get("winners") or []),
+            pot=hand.get("pot", 0),
+            data=json.dumps({k: v for k, v in hand.items() if k not in _RECORD_FIELDS}, separators=(",", ":")),
+        ))
+        if len(self.pending) >= self.batch:
+            self.scheduler.schedule(("hands", "flush"), 0, self._start_flush)
+        elif len(self.pending) == 1:
+            self.scheduler.schedule(("hands", "flush"), time.monotonic() + self.flush_seconds, self._start_flush)
+
+    async def _start_flush(self) -> None:
+        # o scheduler executa os timers em série: a gravação não pode segurar os relógios das mesas
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        records, self.pending = self.pending, []
+        if not records:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, save_hands, records)
+            self.written += len(records)
+        except Exception as e:
+            print(f"[ERROR] Erro ao gravar {len(records)} mãos no histórico: {e}")
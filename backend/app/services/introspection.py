@@ -0,0 +1,126 @@
+import collections
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+# Ferramentas de diagnóstico das rotas /api/admin (sob demanda; nada roda sem ser pedido)
+
+
+def deep_size(obj: Any, limit: int = 200_000) -> int:
+    """Tamanho aproximado (bytes) de um objeto e de tudo que ele referencia.
+
+    Percorre dicts, sequências, conjuntos, __dict__ e __slots__, contando cada
+    objeto uma vez; para em `limit` objetos para não travar o loop em
+    estruturas enormes.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < limit:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, type):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, bytearray, int, float, bool)) or o is None:
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(o)
+        if hasattr(o, "__dict__"):
+            stack.append(vars(o))
+        for cls in type(o).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(o, name):
+                    stack.append(getattr(o, name))
+    return total
+
+
+class MemoryTracer:
+    """tracemalloc sob demanda: cada snapshot é comparado com o anterior (diff por linha)"""
+
+    def __init__(self):
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._previous = None
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._previous = None
+
+    def snapshot(self, top: int = 20) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            return {"error": "tracemalloc desligado (POST /api/admin/tracemalloc/start)"}
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        if self._previous is None:
+            stats = snap.statistics("lineno")[:top]
+            entries = [{"where": str(s.traceback), "size": s.size, "count": s.count} for s in stats]
+        else:
+            stats = snap.compare_to(self._previous, "lineno")[:top]
+            entries = [{"where": str(s.traceback), "size": s.size, "sizeDiff": s.size_diff,
+                        "count": s.count, "countDiff": s.count_diff} for s in stats]
+        diff = self._previous is not None
+        self._previous = snap
+        return {"traced": current, "peak": peak, "diff": diff, "top": entries}
+
+
+class LoopSampler:
+    """Profiler por amostragem da thread do event loop.
+
+    Uma thread auxiliar lê a pilha da thread do loop (sys._current_frames) a
+    cada `interval` segundos; o resultado são as pilhas mais frequentes (no
+    formato "collapsed" dos flamegraphs) e as funções onde o loop mais parou.
+    O loop não é instrumentado: o custo fica na thread de amostragem.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.running = False
+
+    def capture(self, seconds: float, interval: Optional[float] = None, top: int = 30) -> Dict[str, Any]:
+        """Bloqueante: rodar fora do loop (ex.: run_in_executor)"""
+        interval = interval if interval is not None else float(os.getenv("PROFILE_INTERVAL", "0.005"))
+        stacks: collections.Counter = collections.Counter()
+        leaves: collections.Counter = collections.Counter()
+        samples = 0
+        self.running = True
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                frame = sys._current_frames().get(self.thread_id)
+                if frame is not None:
+                    stack = []
+                    f = frame
+                    while f is not None:
+                        code = f.f_code
+                        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                        f = f.f_back
+                    stacks[";".join(reversed(stack))] += 1
+                    leaves[stack[0]] += 1
+                    samples += 1
+                time.sleep(interval)
+        finally:
+            self.running = False
+        return {
+            "seconds": seconds,
+            "samples": samples,
+            "functions": [{"function": name, "samples": n, "share": round(n / samples, 3)}
+                          for name, n in leaves.most_common(top)] if samples else [],
+            "collapsed": [f"{stack} {n}" for stack, n in stacks.most_common(top)],
+        }
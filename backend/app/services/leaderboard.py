@@ -0,0 +1,158 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .persistence import get_redis
+from .sorted_set import SortedSet
+
+# Rankings globais de Hold'em (mesas de cash; torneios ficam de fora):
+#   winnings  saldo acumulado de fichas (soma dos deltas de cada mão)
+#   chips     stack do jogador ao fim da última mão jogada
+BOARDS = ("winnings", "chips")
+
+
+class MemoryBoards:
+    """Fallback em memória (skip list indexável por board): O(log n) por atualização e rank"""
+
+    def __init__(self):
+        self.sets: Dict[str, SortedSet] = {board: SortedSet() for board in BOARDS}
+
+    async def apply(self, deltas: Dict[str, int], stacks: Dict[str, int]) -> None:
+        for nick, delta in deltas.items():
+            self.sets["winnings"].incr(nick, delta)
+        for nick, stack in stacks.items():
+            self.sets["chips"].add(nick, stack)
+
+    async def top(self, board: str, offset: int, limit: int) -> Tuple[List[Tuple[str, float]], int]:
+        s = self.sets[board]
+        return s.range(offset, offset + limit - 1), len(s)
+
+    async def rank(self, board: str, nick: str) -> Optional[Tuple[int, float]]:
+        s = self.sets[board]
+        rank = s.rank(nick)
+        return (rank, s.scores[nick]) if rank is not None else None
+
+
+class RedisBoards:
+    """Sorted sets do Redis (ZINCRBY / ZADD / ZREVRANK / ZREVRANGE), um pipeline por mão"""
+
+    def __init__(self, prefix: str = "leaderboard"):
+        self.prefix = prefix
+
+    def _key(self, board: str) -> str:
+        return f"{self.prefix}:{board}"
+
+    async def apply(self, deltas: Dict[str, int], stacks: Dict[str, int]) -> None:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            for nick, delta in deltas.items():
+                pipe.zincrby(self._key("winnings"), delta, nick)
+            if stacks:
+                pipe.zadd(self._key("chips"), stacks)
+            await pipe.execute()
+
+    async def top(self, board: str, offset: int, limit: int) -> Tuple[List[Tuple[str, float]], int]:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(self._key(board), offset, offset + limit - 1, withscores=True)
+            pipe.zcard(self._key(board))
+            entries, total = await pipe.execute()
+        return [(nick, score) for nick, score in entries], total
+
+    async def rank(self, board: str, nick: str) -> Optional[Tuple[int, float]]:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(self._key(board), nick)
+            pipe.zscore(self._key(board), nick)
+            rank, score = await pipe.execute()
+        return (rank, score) if rank is not None else None
+
+
+class Leaderboard:
+    """Rankings alimentados no fim de cada mão.
+
+    Usa Redis com LEADERBOARD_REDIS=1; se o Redis falhar, passa a usar o
+    fallback em memória até o processo reiniciar. As páginas do top-N ficam
+    em cache por LEADERBOARD_CACHE_SECONDS (as leituras do REST não batem
+    no backend a cada requisição).
+    """
+
+    def __init__(self, *, use_redis: Optional[bool] = None, cache_seconds: Optional[float] = None):
+        if use_redis is None:
+            use_redis = os.getenv("LEADERBOARD_REDIS", "0").lower() in ("1", "true", "yes", "on")
+        self.backend: Any = RedisBoards() if use_redis else MemoryBoards()
+        self.cache_seconds = cache_seconds if cache_seconds is not None else float(os.getenv("LEADERBOARD_CACHE_SECONDS", "2"))
+        self._cache: Dict[Tuple[str, int, int], Tuple[float, Dict[str, Any]]] = {}
+        self._tasks: set = set()
+
+    @property
+    def in_flight(self) -> int:
+        """Atualizações ainda não aplicadas no backend"""
+        return len(self._tasks)
+
+    def _fallback(self, error: Exception) -> None:
+        if not isinstance(self.backend, MemoryBoards):
+            print(f"[ERROR] Redis indisponível para o leaderboard, usando memória: {error}")
+            self.backend = MemoryBoards()
+            self._cache.clear()
+
+    def hand_finished(self, hand: Dict[str, Any]) -> None:
+        """Registra os deltas/stacks de uma mão encerrada (não bloqueia o chamador)"""
+        deltas = {nick: d for nick, d in (hand.get("deltas") or {}).items() if d}
+        stacks = {nick: hand["stacks"][nick] for nick in hand.get("deltas") or {} if nick in hand.get("stacks", {})}
+        if not deltas and not stacks:
+            return
+        task = asyncio.get_running_loop().create_task(self._apply(deltas, stacks))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _apply(self, deltas: Dict[str, int], stacks: Dict[str, int]) -> None:
+        try:
+            await self.backend.apply(deltas, stacks)
+        except Exception as e:
+            self._fallback(e)
+            await self.backend.apply(deltas, stacks)
+
+    async def top(self, board: str, offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        key = (board, offset, limit)
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        try:
+            entries, total = await self.backend.top(board, offset, limit)
+        except Exception as e:
+            self._fallback(e)
+            entries, total = await self.backend.top(board, offset, limit)
+        page = {
+            "board": board,
+            "total": total,
+            "offset": offset,
+            "entries": [{"rank": offset + i + 1, "nick": nick, "score": int(score)}
+                        for i, (nick, score) in enumerate(entries)],
+        }
+        if len(self._cache) > 1000:
+            self._cache.clear()
+        self._cache[key] = (now + self.cache_seconds, page)
+        return page
+
+    async def around(self, board: str, nick: str, radius: int = 5) -> Optional[Dict[str, Any]]:
+        """Posição do jogador e os `radius` vizinhos de cada lado"""
+        try:
+            found = await self.backend.rank(board, nick)
+        except Exception as e:
+            self._fallback(e)
+            found = await self.backend.rank(board, nick)
+        if found is None:
+            return None
+        rank, score = found
+        start = max(0, rank - radius)
+        entries, total = await self.backend.top(board, start, rank - start + radius + 1)
+        return {
+            "board": board,
+            "nick": nick,
+            "rank": rank + 1,
+            "score": int(score),
+            "total": total,
+            "entries": [{"rank": start + i + 1, "nick": n, "score": int(s)} for i, (n, s) in enumerate(entries)],
+        }
@@ -1,15 +1,32 @@
+import json
 import os
-from redis import asyncio as aioredis
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
+if TYPE_CHECKING:
+    from redis import asyncio as aioredis
 
-_redis: aioredis.Redis | None = None
 
+_redis: "aioredis.Redis | None" = None
 
-async def get_redis() -> aioredis.Redis:
+
+async def get_redis() -> "aioredis.Redis":
     global _redis
     if _redis is None:
+        # cliente criado (e o pacote importado) só quando alguma feature usa o Redis
+        from redis import asyncio as aioredis
         url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         _redis = aioredis.from_url(url, decode_responses=True)
     return _redis
 
 
+async def save_table_snapshot(table_id: str, snapshot: Dict[str, Any], ttl_seconds: int = 86400) -> None:
+    """Hiberna o estado de uma mesa no Redis"""
+    redis = await get_redis()
+    await redis.set(f"table:{table_id}", json.dumps(snapshot), ex=ttl_seconds)
+
+
+async def load_table_snapshot(table_id: str) -> Optional[Dict[str, Any]]:
+    """Recupera (e remove) o estado hibernado de uma mesa, se existir"""
+    redis = await get_redis()
+    raw = await redis.getdel(f"table:{table_id}")
+    return json.loads(raw) if raw else None
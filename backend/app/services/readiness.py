@@ -0,0 +1,116 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Instante em que o módulo foi importado (fallback do início do processo)
+_IMPORTED_AT = time.time()
+
+
+def process_started_at() -> float:
+    """Início do processo (epoch), lido de /proc no Linux; senão, o import deste módulo"""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/stat") as f:
+            boot = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return boot + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration, AttributeError):
+        return _IMPORTED_AT
+
+
+class Readiness:
+    """Inicialização dos subsistemas pesados (banco, stats, Redis...) e tempos de partida.
+
+    Com STARTUP_MODE=background o startup só agenda os componentes e o
+    servidor já atende /health e /ws; GET /ready responde 503 até os
+    componentes obrigatórios ficarem prontos. No modo eager (padrão) o
+    startup espera cada componente, como antes.
+    """
+
+    def __init__(self, *, mode: Optional[str] = None):
+        self.mode = mode or os.getenv("STARTUP_MODE", "eager")
+        self.started_at = process_started_at()
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self._steps: List[tuple] = []
+        self._tasks: set = set()
+        self.startup_done: Optional[float] = None
+        self.first_request: Optional[float] = None
+        self.first_websocket: Optional[float] = None
+
+    def add(self, name: str, init: Callable[[], Awaitable[None]], *, required: bool = True,
+            after: Optional[str] = None) -> None:
+        """Registra um componente; `after` = nome de um componente que precisa terminar antes"""
+        self.components[name] = {"status": "pending", "required": required}
+        self._steps.append((name, init, after))
+
+    async def start(self) -> None:
+        done: Dict[str, asyncio.Event] = {name: asyncio.Event() for name, _, _ in self._steps}
+        for name, init, after in self._steps:
+            coro = self._run(name, init, done[name], done.get(after))
+            if self.mode == "background":
+                task = asyncio.get_running_loop().create_task(coro)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            else:
+                await coro
+        self.startup_done = time.time()
+
+    async def _run(self, name: str, init: Callable[[], Awaitable[None]], done: asyncio.Event,
+                   after: Optional[asyncio.Event]) -> None:
+        component = self.components[name]
+        try:
+            if after is not None:
+                await after.wait()
+            start = time.perf_counter()
+            component["status"] = "starting"
+            await init()
+            component["status"] = "ready"
+            component["seconds"] = round(time.perf_counter() - start, 3)
+        except Exception as e:
+            component["status"] = "error"
+            component["error"] = str(e)
+            print(f"[ERROR] Falha ao inicializar {name}: {e}")
+            if self.mode != "background" and component["required"]:
+                raise
+        finally:
+            done.set()
+
+    @property
+    def ready(self) -> bool:
+        return all(c["status"] == "ready" for c in self.components.values() if c["required"])
+
+    def seen_request(self, websocket: bool = False) -> None:
+        now = time.time()
+        if self.first_request is None:
+            self.first_request = now
+            print(f"[DEBUG] Primeira requisição {now - self.started_at:.3f}s após o início do processo")
+        if websocket and self.first_websocket is None:
+            self.first_websocket = now
+
+    def view(self) -> Dict[str, Any]:
+        def since_start(t: Optional[float]) -> Optional[float]:
+            return round(t - self.started_at, 3) if t is not None else None
+        return {
+            "ready": self.ready,
+            "mode": self.mode,
+            "components": self.components,
+            "startupSeconds": since_start(self.startup_done),
+            "firstRequestSeconds": since_start(self.first_request),
+            "firstWebsocketSeconds": since_start(self.first_websocket),
+        }
+
+
+class FirstRequestTimer:
+    """Middleware ASGI que só marca a primeira requisição HTTP / WebSocket (custo zero depois)"""
+
+    def __init__(self, app, readiness: Readiness):
+        self.app = app
+        self.readiness = readiness
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.readiness.first_request is None:
+            self.readiness.seen_request()
+        elif scope["type"] == "websocket" and self.readiness.first_websocket is None:
+            self.readiness.seen_request(websocket=True)
+        await self.app(scope, receive, send)
@@ -0,0 +1,136 @@
+import random
+from typing import Dict, List, Optional, Tuple
+
+_MAX_LEVEL = 32
+_P = 0.25
+
+
+class _Node:
+    __slots__ = ("key", "member", "forward", "width")
+
+    def __init__(self, key: Tuple[float, str], member: Optional[str], level: int):
+        self.key = key
+        self.member = member
+        self.forward: List[Optional["_Node"]] = [None] * level
+        self.width: List[int] = [1] * level  # quantos nós o link de cada nível pula
+
+
+class SortedSet:
+    """Conjunto ordenado por score decrescente (semântica de ZREVRANK/ZREVRANGE do Redis).
+
+    Skip list indexável: cada link guarda quantos nós pula, então inserir,
+    remover e calcular o rank de um membro custam O(log n) esperado, e um
+    intervalo por posição custa O(log n + k). Empates no score são
+    desempatados pelo membro, como no Redis.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self._head = _Node((float("-inf"), ""), None, _MAX_LEVEL)
+        self._level = 1
+        self.scores: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @staticmethod
+    def _key(member: str, score: float) -> Tuple[float, str]:
+        # ordem crescente da chave = score decrescente
+        return (-score, member)
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < _MAX_LEVEL and self._rng.random() < _P:
+            level += 1
+        return level
+
+    def _path(self, key: Tuple[float, str]) -> Tuple[List[_Node], List[int]]:
+        """Último nó antes de `key` em cada nível e a posição (rank) desse nó"""
+        update: List[_Node] = [self._head] * _MAX_LEVEL
+        rank = [0] * _MAX_LEVEL
+        node = self._head
+        pos = 0
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                pos += node.width[i]
+                node = node.forward[i]
+            update[i] = node
+            rank[i] = pos
+        return update, rank
+
+    def add(self, member: str, score: float) -> None:
+        """ZADD: define o score do membro"""
+        if member in self.scores:
+            if self.scores[member] == score:
+                return
+            self.remove(member)
+        key = self._key(member, score)
+        update, rank = self._path(key)
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                update[i] = self._head
+                rank[i] = 0
+                self._head.width[i] = len(self.scores) + 1
+            self._level = level
+        node = _Node(key, member, level)
+        pos = rank[0] + 1  # posição (1-based) do novo nó
+        for i in range(level):
+            prev = update[i]
+            node.forward[i] = prev.forward[i]
+            prev.forward[i] = node
+            # o link antigo de prev foi dividido em dois na posição do novo nó
+            node.width[i] = prev.width[i] - (pos - rank[i]) + 1
+            prev.width[i] = pos - rank[i]
+        for i in range(level, self._level):
+            update[i].width[i] += 1
+        self.scores[member] = score
+
+    def incr(self, member: str, delta: float) -> float:
+        """ZINCRBY"""
+        score = self.scores.get(member, 0) + delta
+        self.add(member, score)
+        return score
+
+    def remove(self, member: str) -> bool:
+        score = self.scores.pop(member, None)
+        if score is None:
+            return False
+        key = self._key(member, score)
+        update, _ = self._path(key)
+        target = update[0].forward[0]
+        for i in range(self._level):
+            if update[i].forward[i] is target:
+                update[i].width[i] += target.width[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].width[i] -= 1
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        return True
+
+    def rank(self, member: str) -> Optional[int]:
+        """ZREVRANK: posição 0-based (0 = maior score)"""
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        _, rank = self._path(self._key(member, score))
+        return rank[0]
+
+    def range(self, start: int, stop: int) -> List[Tuple[str, float]]:
+        """ZREVRANGE start stop WITHSCORES (stop inclusivo, como no Redis)"""
+        if start < 0 or stop < start or start >= len(self.scores):
+            return []
+        # desce pelos níveis até a posição `start` (O(log n)) e anda no nível 0
+        node = self._head
+        pos = 0
+        target = start + 1
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and pos + node.width[i] <= target:
+                pos += node.width[i]
+                node = node.forward[i]
+        out = []
+        while node is not None and len(out) <= stop - start:
+            out.append((node.member, self.scores[node.member]))
+            node = node.forward[0]
+        return out
@@ -0,0 +1,43 @@
+"""Teste de carga com bots: N mesas cheias de bots rodando no mesmo processo.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_bots [mesas] [segundos] [estratégia]
+"""
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("BOT_THINK_DELAY", "0")
+os.environ.setdefault("BOT_HAND_DELAY", "0")
+# as mãos dos bots não vão para o histórico (nem para o ./app.db do desenvolvimento)
+os.environ.setdefault("HAND_HISTORY", "0")
+
+from app.realtime.bots import BotRunner  # noqa: E402
+from app.realtime.manager import ConnectionManager  # noqa: E402
+
+
+async def run(tables: int, seconds: float, strategy: str) -> None:
+    manager = ConnectionManager()
+    manager.scheduler.start()
+    runner = BotRunner(manager)
+    for i in range(tables):
+        table_id = f"bench-{i}"
+        manager.create_table(table_id, "holdem")
+        await runner.fill(table_id, game="holdem", count=6, strategy=strategy)
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    stats = runner.stats()
+    for i in range(tables):
+        await runner.remove_table(f"bench-{i}")
+    runner.shutdown()
+    await manager.scheduler.stop()
+    print(f"{tables} mesas x 6 bots ({strategy}) por {elapsed:.1f}s")
+    print(f"  {stats['hands'] / elapsed:,.1f} mãos/s  {stats['decisions'] / elapsed:,.1f} decisões/s")
+    print(f"  p99 da decisão: {stats['decisionP99Ms']} ms  orçamento estourado: {stats['timeouts']}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(run(int(args[0]) if args else 100, float(args[1]) if len(args) > 1 else 10, args[2] if len(args) > 2 else "random"))
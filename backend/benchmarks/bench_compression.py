@@ -0,0 +1,87 @@
+"""Compressão dos frames do /ws: razão e CPU por frame para cada política.
+
+Gera frames de estado reais de Hold'em (motor jogando ações aleatórias, um
+frame por jogador a cada ação, como no broadcast_state) e compara: sem
+compressão, deflate por conexão em vários níveis / janelas, e deflate com o
+dicionário compartilhado.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_compression [mãos] [jogadores]
+"""
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+
+from app.realtime.compression import SHARED_DICTIONARY, CompressionPolicy
+from app.realtime.engines import HoldemEngine
+from app.realtime.inbound import ActionIn
+
+ACTIONS = ("check", "call", "call", "fold", "raise")
+
+
+def holdem_frames(hands: int, seats: int, seed: int = 1):
+    """Frames de estado por jogador, na ordem em que cada conexão os receberia"""
+    rng = random.Random(seed)
+    engine = HoldemEngine()
+    nicks = [f"jogador{i}" for i in range(seats)]
+    frames = {nick: [] for nick in nicks}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for nick in nicks:
+            engine.join(nick, set(nicks))
+        engine.start()
+        seq = 0
+        while hands > 0:
+            seq += 1
+            clock = {"player": engine.to_act(), "expiresAt": time.time() + 20, "usingBank": False, "timeBank": 30.0}
+            for nick in nicks:
+                view = engine.private_view(nick, nicks, clock if clock["player"] else None)
+                frames[nick].append('{"seq": %d, ' % seq + json.dumps(view)[1:])
+            actor = engine.to_act()
+            if actor is None:
+                hands -= 1
+                for nick in nicks:
+                    engine.state.stacks[nick] = max(engine.state.stacks.get(nick, 0), 200)
+                engine.apply(nicks[0], ActionIn(type="action", action="new_hand"))
+                continue
+            action = rng.choice(ACTIONS)
+            amount = engine.state.min_raise if action == "raise" else None
+            if not engine.apply(actor, ActionIn(type="action", action=action, amount=amount)):
+                engine.apply(actor, ActionIn(type="action", action="fold"))
+    return frames
+
+
+def measure(name: str, policy: CompressionPolicy, mode: str, frames) -> None:
+    raw = wire = 0
+    start = time.perf_counter()
+    for stream in frames.values():
+        compressor = policy.compressor(mode)  # uma conexão por jogador
+        for text in stream:
+            data = compressor.compress(text)
+            raw += len(text)
+            wire += len(data) if data is not None else len(text)
+    elapsed = time.perf_counter() - start
+    n = sum(len(s) for s in frames.values())
+    print(f"  {name:<28} razão {wire / raw:6.3f}  {wire / n:7.1f} B/frame  {elapsed / n * 1e6:6.1f} µs/frame")
+
+
+def run(hands: int, seats: int) -> None:
+    frames = holdem_frames(hands, seats)
+    n = sum(len(s) for s in frames.values())
+    raw = sum(len(t) for s in frames.values() for t in s)
+    print(f"{hands} mãos, {seats} jogadores: {n} frames, {raw / n:.0f} B/frame sem compressão")
+    print(f"  dicionário compartilhado: {len(SHARED_DICTIONARY)} B")
+    for level in (1, 6, 9):
+        for window_bits in (9, 12, 15):
+            policy = CompressionPolicy(level=level, window_bits=window_bits, min_bytes=0)
+            measure(f"deflate nível {level} janela 2^{window_bits}", policy, "deflate", frames)
+    for level in (1, 6, 9):
+        policy = CompressionPolicy(level=level, window_bits=15, min_bytes=0)
+        measure(f"deflate-dict nível {level}", policy, "deflate-dict", frames)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 50, int(args[1]) if len(args) > 1 else 6)
@@ -0,0 +1,47 @@
+"""Equity range x range: tempo por consulta para tamanhos típicos de range e street.
+
+Usa as tabelas do avaliador (HAND_TABLES_PATH ou o arquivo do build; sem
+elas, o avaliador direto). Cada caso roda duas vezes: a primeira com o
+cache de classes por board frio, a segunda com o cache quente.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_equity [max_boards]
+"""
+import random
+import sys
+import time
+
+from app.game.equity import board_classes, equity, parse_range
+from app.game.hand_tables import get_tables
+
+TIGHT = "TT+, AQs+, AKo"                                        # ~3%
+TOP15 = "55+, A7s+, K9s+, Q9s+, J9s+, T9s, ATo+, KTo+, QJo"     # ~15%
+WIDE = "22+, A2s+, K5s+, Q8s+, J8s+, T8s+, 97s+, 87s, 76s, A7o+, K9o+, QTo+, JTo"  # ~30%
+
+CASES = [
+    ("mão x range, flop", "AhKh", TOP15, "Kd7h2h"),
+    ("mão x range, turn", "AhKh", WIDE, "Kd7h2h9c"),
+    ("range x range, pré-flop", TIGHT, TOP15, ""),
+    ("range x range, flop", TOP15, WIDE, "Ts9d4c"),
+    ("range x range, turn", TOP15, WIDE, "Ts9d4c2h"),
+    ("range x range, river", WIDE, WIDE, "Ts9d4c2hKs"),
+]
+
+
+def run(max_boards: int) -> None:
+    print("tabelas:", "mmap" if get_tables() is not None else "indisponíveis (avaliador direto)")
+    print(f"combos: tight {len(parse_range(TIGHT))}, top15 {len(parse_range(TOP15))}, wide {len(parse_range(WIDE))}")
+    for name, hero, villain, board in CASES:
+        board_classes.cache_clear()
+        times = []
+        for _ in range(2):
+            start = time.perf_counter()
+            result = equity(hero, villain, board, max_boards=max_boards, time_budget=60, rng=random.Random(1))
+            times.append(time.perf_counter() - start)
+        print(f"  {name:<26} {result['hero']['equity']:.3f}  {result['boards']:5d} boards"
+              f"{' (exato)' if result['exact'] else '':<9}  frio {times[0] * 1000:7.0f} ms  quente {times[1] * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 1500)
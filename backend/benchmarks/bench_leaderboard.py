@@ -0,0 +1,48 @@
+"""Leaderboard em memória (skip list indexável): atualizações, rank e top-N.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_leaderboard [jogadores] [atualizações]
+"""
+import random
+import sys
+import time
+
+from app.services.sorted_set import SortedSet
+
+
+def run(players: int, updates: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    board = SortedSet(random.Random(seed))
+    nicks = [f"p{i}" for i in range(players)]
+    start = time.perf_counter()
+    for nick in nicks:
+        board.add(nick, rng.randrange(100000))
+    print(f"{players} jogadores: carga inicial {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        board.incr(rng.choice(nicks), rng.randrange(-500, 500))
+    elapsed = time.perf_counter() - start
+    print(f"  ZINCRBY: {elapsed / updates * 1e6:.1f} µs/op")
+
+    queries = min(updates, 100000)
+    start = time.perf_counter()
+    for _ in range(queries):
+        board.rank(rng.choice(nicks))
+    print(f"  ZREVRANK: {(time.perf_counter() - start) / queries * 1e6:.1f} µs/op")
+
+    start = time.perf_counter()
+    for _ in range(queries // 10):
+        offset = rng.randrange(players)
+        board.range(offset, offset + 19)
+    print(f"  página de 20 em offset aleatório: {(time.perf_counter() - start) / (queries // 10) * 1e6:.1f} µs/op")
+
+    ordered = sorted(board.scores, key=lambda n: (-board.scores[n], n))
+    probe = rng.sample(range(players), 100)
+    assert all(board.rank(ordered[i]) == i for i in probe)
+    assert [n for n, _ in board.range(0, 99)] == ordered[:100]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 100000, int(args[1]) if len(args) > 1 else 200000)
@@ -0,0 +1,55 @@
+"""Stats de HUD: custo por ação (incremental) e recálculo a partir do histórico.
+
+Gera um histórico sintético de mãos (sem banco) com ações [nick, ação, valor, street].
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_player_stats [mãos] [jogadores]
+"""
+import random
+import sys
+import time
+
+from app.game.player_stats import PlayerStats
+
+STREETS = ("preflop", "flop", "turn", "river")
+ACTIONS = ("fold", "check", "call", "raise", "all_in")
+
+
+def synthetic_history(hands: int, population: int, seed: int = 1):
+    rng = random.Random(seed)
+    history = []
+    for _ in range(hands):
+        players = rng.sample(range(population), 6)
+        nicks = [f"p{i}" for i in players]
+        actions = []
+        for street in STREETS:
+            for nick in nicks:
+                actions.append([nick, rng.choice(ACTIONS), None, street])
+        history.append((nicks, actions))
+    return history
+
+
+def run(hands: int, population: int) -> None:
+    history = synthetic_history(hands, population)
+    n_actions = sum(len(a) for _, a in history)
+
+    stats = PlayerStats()
+    start = time.perf_counter()
+    for i, (players, actions) in enumerate(history):
+        table_id = f"t{i % 100}"
+        stats.hand_started(table_id, players)
+        for nick, action, _amount, street in actions:
+            stats.action(table_id, nick, action, street)
+    elapsed = time.perf_counter() - start
+    print(f"{hands} mãos, {n_actions} ações, {population} jogadores")
+    print(f"  incremental: {elapsed / n_actions * 1e9:.0f} ns/ação")
+
+    start = time.perf_counter()
+    batch = PlayerStats.from_history(iter(history))
+    print(f"  recálculo do histórico: {time.perf_counter() - start:.3f}s")
+    assert batch.columns == stats.columns, "histórico difere do incremental"
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 100000, int(args[1]) if len(args) > 1 else 5000)
@@ -0,0 +1,86 @@
+"""Embaralhamento: vazão do SecureShuffler/SeededShuffler/pool e testes de uniformidade.
+
+Uniformidade (qui-quadrado):
+  - permutações de um baralho de 4 cartas: 24 classes, gl = 23
+  - posição x carta no baralho de 52: 52*52 células, gl = 51*51 (aproximação normal)
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_shuffle [embaralhamentos]
+"""
+import math
+import random
+import sys
+import time
+from itertools import permutations
+
+from app.game.cards import standard_deck
+from app.game.shuffler import DeckPool, SecureShuffler, SeededShuffler
+
+CHI2_23_P001 = 49.73  # valor crítico do qui-quadrado com 23 gl, p = 0.001
+
+
+def throughput(name: str, shuffle, n: int) -> None:
+    deck = standard_deck()
+    start = time.perf_counter()
+    for _ in range(n):
+        shuffle(deck)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<28} {n / elapsed:>10,.0f} embaralhamentos/s")
+
+
+def chi2_permutations(shuffler, n: int) -> float:
+    counts = dict.fromkeys(permutations(range(4)), 0)
+    for _ in range(n):
+        deck = [0, 1, 2, 3]
+        shuffler.shuffle(deck)
+        counts[tuple(deck)] += 1
+    expected = n / 24
+    return sum((c - expected) ** 2 / expected for c in counts.values())
+
+
+def z_positions(shuffler, n: int) -> float:
+    counts = [[0] * 52 for _ in range(52)]
+    for _ in range(n):
+        deck = list(range(52))
+        shuffler.shuffle(deck)
+        for pos, card in enumerate(deck):
+            counts[pos][card] += 1
+    expected = n / 52
+    chi2 = sum((c - expected) ** 2 / expected for row in counts for c in row)
+    df = 51 * 51
+    return (chi2 - df) / math.sqrt(2 * df)
+
+
+def run(n: int) -> None:
+    secure = SecureShuffler()
+    seeded = SeededShuffler(1)
+    print(f"vazão ({n} embaralhamentos de 52 cartas):")
+    throughput("random.shuffle (MT global)", random.shuffle, n)
+    throughput("SecureShuffler", secure.shuffle, n)
+    throughput("SeededShuffler", seeded.shuffle, n)
+    pool = DeckPool(standard_deck(), SecureShuffler(), size=n)
+    pool.fill()
+    start = time.perf_counter()
+    for _ in range(n):
+        pool.take()
+    print(f"  {'DeckPool.take (pool cheio)':<28} {n / (time.perf_counter() - start):>10,.0f} baralhos/s")
+    print(f"  entropia: {secure.refills} leituras de os.urandom para {n} embaralhamentos")
+
+    a, b = SeededShuffler(42), SeededShuffler(42)
+    decks_a, decks_b = standard_deck(), standard_deck()
+    a.shuffle(decks_a)
+    b.shuffle(decks_b)
+    assert decks_a == decks_b, "modo com semente não é determinístico"
+
+    print("uniformidade:")
+    for name, shuffler in (("SecureShuffler", SecureShuffler()), ("SeededShuffler", SeededShuffler(7))):
+        chi2 = chi2_permutations(shuffler, 240000)
+        z = z_positions(shuffler, 20000)
+        ok = chi2 < CHI2_23_P001 and abs(z) < 3.3
+        print(f"  {name:<16} permutações qui2={chi2:6.1f} (crítico {CHI2_23_P001})  posições z={z:+.2f}  "
+              f"{'ok' if ok else 'FALHOU'}")
+        assert ok
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
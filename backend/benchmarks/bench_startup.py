@@ -0,0 +1,89 @@
+"""Cold start: tempo até o primeiro /health e até o /ready, por STARTUP_MODE.
+
+Sobe o uvicorn num subprocesso (banco novo a cada rodada, com N mãos no
+histórico para o recálculo das stats de HUD) e mede, a partir do spawn:
+primeiro 200 no /health (nó aceita tráfego) e primeiro 200 no /ready
+(banco e stats prontos).
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_startup [rodadas] [mãos no histórico]
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed_history(url: str, hands: int) -> None:
+    """Preenche o histórico com mãos sintéticas de Hold'em (num processo à parte: DATABASE_URL é lido no import)"""
+    code = (
+        "import json, sys, time\n"
+        "from app.services.hand_history import save_hands\n"
+        "from benchmarks.bench_player_stats import synthetic_history\n"
+        "save_hands([{'table_id': 'bench', 'game': 'holdem', 'ended_at': time.time(), 'players': ','.join(nicks),\n"
+        "             'winners': nicks[0], 'pot': 0, 'data': json.dumps({'actions': actions})}\n"
+        "            for nicks, actions in synthetic_history(int(sys.argv[1]), 200)])\n"
+    )
+    subprocess.run([sys.executable, "-c", code, str(hands)], env={**os.environ, "DATABASE_URL": url}, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def wait_for(url: str, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as r:
+                if r.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(url)
+
+
+def run_once(mode: str, url: str) -> dict:
+    port = free_port()
+    env = {**os.environ, "STARTUP_MODE": mode, "DATABASE_URL": url}
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        health = wait_for(f"http://127.0.0.1:{port}/health", start + 60)
+        ready = wait_for(f"http://127.0.0.1:{port}/ready", start + 60)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready") as r:
+            view = json.load(r)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {"health": health - start, "ready": ready - start, "components": view["components"]}
+
+
+def run(rounds: int, hands: int) -> None:
+    print(f"{rounds} rodadas por modo, {hands} mãos no histórico")
+    for mode in ("eager", "background"):
+        results = []
+        for _ in range(rounds):
+            with tempfile.TemporaryDirectory() as tmp:
+                url = f"sqlite:///{tmp}/bench.db"
+                if hands:
+                    seed_history(url, hands)
+                results.append(run_once(mode, url))
+        health = sorted(r["health"] for r in results)[len(results) // 2]
+        ready = sorted(r["ready"] for r in results)[len(results) // 2]
+        parts = ", ".join(f"{name} {c.get('seconds', 0) * 1000:.0f} ms" for name, c in results[-1]["components"].items())
+        print(f"  {mode:<11} /health {health * 1000:7.0f} ms   /ready {ready * 1000:7.0f} ms   ({parts})")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 5, int(args[1]) if len(args) > 1 else 2000)
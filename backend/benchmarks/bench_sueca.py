@@ -0,0 +1,36 @@
+"""Throughput do motor de Sueca: mãos completas com jogadas aleatórias válidas.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_sueca [mãos]
+"""
+import random
+import sys
+import time
+
+from app.game.sueca_engine import CARD_NAMES, TOTAL_POINTS, SuecaTableState
+
+
+def run(hands: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    st = SuecaTableState()
+    for nick in ("n", "e", "s", "w"):
+        st.add_player(nick)
+    plays = 0
+    start = time.perf_counter()
+    for _ in range(hands):
+        deck = list(range(40))
+        rng.shuffle(deck)
+        st.start_hand(deck)
+        while not st.finished:
+            card = rng.choice(st.legal_cards(st.current))
+            st.play(st.players[st.current], CARD_NAMES[card])
+            plays += 1
+        assert sum(st.points) == TOTAL_POINTS
+    elapsed = time.perf_counter() - start
+    print(f"{hands} mãos, {plays} jogadas em {elapsed:.3f}s")
+    print(f"  {hands / elapsed:,.0f} mãos/s  {plays / elapsed:,.0f} jogadas/s  {hands * 10 / elapsed:,.0f} vazas/s")
+    print(f"  placar final: {st.score}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
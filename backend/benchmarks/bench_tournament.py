@@ -0,0 +1,51 @@
+"""Simulação de MTT: balanceamento e quebra de mesas do início até o heads-up final.
+
+As mãos não são jogadas: cada "mão" transfere fichas entre jogadores de uma
+mesa sorteada (às vezes eliminando alguém) e chama Tournament.hand_finished,
+que é o caminho medido.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_tournament [jogadores]
+"""
+import random
+import sys
+import time
+
+from app.game.tournament import BlindSchedule, Tournament
+
+
+def run(entrants: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    now = [0.0]
+    tournament = Tournament("bench", [f"p{i}" for i in range(entrants)], starting_stack=10000,
+                            schedule=BlindSchedule(level_seconds=600), clock=lambda: now[0])
+    total_chips = entrants * 10000
+    hands = moves = broken = 0
+    spent = 0.0
+    while not tournament.finished():
+        table_id = rng.choice(list(tournament.tables))
+        st = tournament.tables[table_id]
+        if len(st.players) >= 2:
+            winner, loser = rng.sample(st.players, 2)
+            # ~1 em 6 mãos elimina alguém; nas demais troca parte do stack
+            amount = st.stacks[loser] if rng.random() < 1 / 6 else st.stacks[loser] // 4
+            st.stacks[loser] -= amount
+            st.stacks[winner] += amount
+        now[0] += 2.0
+        start = time.perf_counter()
+        result = tournament.hand_finished(table_id)
+        spent += time.perf_counter() - start
+        assert all(tournament.size(t) <= tournament.table_size for t in result.tables if t != result.broken)
+        hands += 1
+        moves += len(result.moves)
+        broken += result.broken is not None
+    chips = sum(sum(st.stacks.values()) for st in tournament.tables.values())
+    assert chips == total_chips, (chips, total_chips)
+    assert len(tournament.standings()) == entrants
+    print(f"{entrants} jogadores: {hands} mãos, {moves} transferências, {broken} mesas desfeitas")
+    print(f"  hand_finished: {spent:.3f}s no total, {spent / hands * 1e6:.1f} µs/mão")
+    print(f"  nível final: {tournament.level_index() + 1}, campeão: {tournament.winner()}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from app.realtime.clocks import ActionClocks, TimerScheduler
+from app.realtime.engines import HoldemEngine
+from app.realtime.inbound import ActionIn
+
+
+def seated(*nicks: str) -> HoldemEngine:
+    engine = HoldemEngine()
+    connected = set()
+    for nick in nicks:
+        connected.add(nick)
+        assert engine.join(nick, connected) is None
+    assert engine.start() is None
+    return engine
+
+
+def clocks_for(engine: HoldemEngine, turn_seconds: float) -> ActionClocks:
+    async def on_expire(table_id, nick, token):
+        # mesma checagem do ConnectionManager._on_clock_expired
+        if engine.to_act() == nick and engine.turn_token() == token:
+            engine.on_timeout(nick)
+    return ActionClocks(TimerScheduler(), on_expire, turn_seconds=turn_seconds, bank_seconds=0)
+
+
+def run_due(clocks: ActionClocks, callbacks=None) -> int:
+    callbacks = callbacks if callbacks is not None else clocks.scheduler.pop_due(time.monotonic() + 3600)
+    async def run():
+        for callback in callbacks:
+            await callback()
+    asyncio.run(run())
+    return len(callbacks)
+
+
+def test_acting_cancels_the_clock():
+    engine = seated("a", "b", "c")
+    clocks = clocks_for(engine, 30)
+    player = engine.to_act()
+    clocks.arm("t", player, engine.turn_token())
+    assert engine.apply(player, ActionIn(type="action", action="call")) is True
+    clocks.arm("t", engine.to_act(), engine.turn_token())
+    assert clocks.active["t"].player != player
+    clocks.stop("t")
+    assert len(clocks.scheduler) == 0
+    assert run_due(clocks) == 0
+    assert [a[0] for a in engine.actions] == [player]
+
+
+def test_late_timeout_auto_acts_once():
+    engine = seated("a", "b", "c")
+    clocks = clocks_for(engine, 0)
+    player = engine.to_act()
+    clocks.arm("t", player, engine.turn_token())
+    due = clocks.scheduler.pop_due(time.monotonic() + 1)
+    assert run_due(clocks, due) == 1
+    assert engine.actions == [[player, "fold", None, "preflop"]]
+    # o mesmo timer disparando de novo e um on_timeout direto, ambos atrasados
+    run_due(clocks, due)
+    engine.on_timeout(player)
+    assert len(engine.actions) == 1
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from app.game.equity import equity, parse_range
+
+
+def test_parse_range_counts_combos():
+    assert len(parse_range("AA")) == 6
+    assert len(parse_range("AKs")) == 4
+    assert len(parse_range("AK")) == 16
+    assert len(parse_range("TT+")) == 30
+    assert len(parse_range("A5s-A2s")) == 16
+    with pytest.raises(ValueError):
+        parse_range("AKx")
+
+
+def test_river_is_decided():
+    r = equity("AhAd", "KsKc", "2c7d9s3hJh")
+    assert r["exact"] and r["boards"] == 1
+    assert r["hero"]["equity"] == 1.0
+
+
+def test_board_plays_for_both_is_a_split():
+    r = equity("AhAd", "KsKc", "QhJhTh9h8h")
+    assert r["hero"]["equity"] == 0.5 and r["hero"]["tie"] == 1.0
+
+
+def test_turn_outs_are_counted_exactly():
+    # KK precisa de um dos 2 reis restantes entre 44 cartas
+    r = equity("AhAd", "KsKc", "2c7d9s3h")
+    assert r["exact"]
+    assert r["hero"]["equity"] == pytest.approx(42 / 44, abs=1e-4)
+    # flush draw + overcards: 9 copas + 3 ases + 3 reis = 15 outs
+    r = equity("AhKh", "QsQd", "2h7h9c3s")
+    assert r["hero"]["equity"] == pytest.approx(15 / 44, abs=1e-4)
+
+
+def test_dead_cards_remove_outs():
+    r = equity("AhKh", "QsQd", "2h7h9c3s", "4h5h")
+    assert r["hero"]["equity"] == pytest.approx(13 / 42, abs=1e-4)
+
+
+def test_card_removal_weights_villain_combos():
+    # com Ah e Ad na mão do herói, o AA do vilão só pode ser AsAc: 1 empate + 6 KK
+    r = equity("AhAd", "AA, KK", "2c7d9s3hJh")
+    assert r["hero"]["equity"] == pytest.approx(6.5 / 7, abs=1e-4)
+
+
+def test_preflop_aces_against_kings_is_sampled():
+    r = equity("AA", "KK", "", max_boards=2000, time_budget=60, rng=random.Random(1))
+    assert not r["exact"] and r["boards"] == 2000
+    assert r["hero"]["equity"] == pytest.approx(0.82, abs=0.03)
+
+
+def test_invalid_boards_are_rejected():
+    with pytest.raises(ValueError):
+        equity("AA", "KK", "2c7d")
+    with pytest.raises(ValueError):
+        equity("AA", "KK", "2c7d9s", "2c")
+    with pytest.raises(ValueError):
+        equity("AhAd", "KK", "KsKcKd")  # sobra um rei só: sem combos de KK
@@ -0,0 +1,36 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.realtime.quotas import ClientBuckets
+
+BODY = {"hero": "AhKh", "villain": "QQ", "board": "2c7d9s", "max_boards": 50}
+
+
+def test_equity_is_rate_limited_per_client(monkeypatch):
+    monkeypatch.setattr(main, "equity_buckets", ClientBuckets(rate=0, burst=2))
+    client = TestClient(main.app)
+    assert client.post("/api/equity", json=BODY).status_code == 200
+    assert client.post("/api/equity", json=BODY).status_code == 200
+    refused = client.post("/api/equity", json=BODY)
+    assert refused.status_code == 429
+    assert refused.headers["Retry-After"] == "1"
+    # outro IP (X-Forwarded-For só vale com QUOTA_TRUST_PROXY=1) tem o próprio bucket
+    monkeypatch.setenv("QUOTA_TRUST_PROXY", "1")
+    assert client.post("/api/equity", json=BODY, headers={"x-forwarded-for": "10.0.0.2"}).status_code == 200
+
+
+def test_equity_refuses_when_all_slots_are_busy(monkeypatch):
+    monkeypatch.setattr(main, "equity_buckets", ClientBuckets(rate=0, burst=100))
+    monkeypatch.setattr(main, "equity_slots", asyncio.Semaphore(0))
+    client = TestClient(main.app)
+    assert client.post("/api/equity", json=BODY).status_code == 429
+
+
+def test_client_buckets_are_bounded():
+    buckets = ClientBuckets(rate=0, burst=1, max_clients=2)
+    assert buckets.allow("a") and buckets.allow("b") and buckets.allow("c")
+    assert list(buckets.buckets) == ["b", "c"]
+    assert not buckets.allow("c")
+    assert buckets.refused == 1
@@ -0,0 +1,51 @@
+from app.realtime.engines import HoldemEngine
+from app.realtime.inbound import ActionIn
+
+
+def seated(*nicks: str) -> HoldemEngine:
+    engine = HoldemEngine()
+    connected = set()
+    for nick in nicks:
+        connected.add(nick)
+        assert engine.join(nick, connected) is None
+    return engine
+
+
+def chips(engine: HoldemEngine) -> int:
+    st = engine.state
+    return sum(st.stacks.values()) + st.pot
+
+
+def test_restart_refused_while_hand_is_live():
+    engine = seated("a", "b", "c")
+    total = chips(engine)
+    assert engine.start() is None
+    st = engine.state
+    engine.apply(engine.to_act(), ActionIn(type="action", action="raise", amount=st.bb_size * 3))
+    pot = st.pot
+    assert engine.start() is not None
+    assert engine.apply("a", ActionIn(type="action", action="new_hand")) is False
+    assert st.pot == pot
+    assert chips(engine) == total
+
+
+def test_new_hand_after_showdown_keeps_chips():
+    engine = seated("a", "b")
+    total = chips(engine)
+    assert engine.start() is None
+    engine.apply(engine.to_act(), ActionIn(type="action", action="fold"))
+    assert engine.state.street == "showdown"
+    assert engine.apply("a", ActionIn(type="action", action="new_hand")) is True
+    assert engine.state.started
+    assert chips(engine) == total
+
+
+def test_aborted_hand_refunds_committed_chips():
+    engine = seated("a", "b", "c")
+    start = dict(engine.state.stacks)
+    assert engine.start() is None
+    engine.apply(engine.to_act(), ActionIn(type="action", action="call"))
+    assert engine.state.pot > 0
+    assert engine.leave({"a"}) is True
+    assert engine.state.pot == 0
+    assert engine.state.stacks == start
@@ -0,0 +1,56 @@
+import random
+
+from app.game.holdem_engine import HoldemTableState
+from app.realtime.engines import HoldemEngine
+from app.realtime.inbound import ActionIn
+
+# campos que o replay do log precisa reproduzir
+FIELDS = ("players", "stacks", "dealer_index", "started", "street", "pot", "community", "hole",
+          "bets", "folded", "all_in", "current_index", "sb_size", "bb_size")
+
+
+def assert_replays(st: HoldemTableState) -> None:
+    replayed = HoldemTableState.replay(st.log)
+    for field in FIELDS:
+        assert getattr(replayed, field) == getattr(st, field), field
+
+
+def test_join_after_disconnect_replays_seats():
+    engine = HoldemEngine()
+    connected = set()
+    for nick in "abc":
+        connected.add(nick)
+        assert engine.join(nick, connected) is None
+    connected.discard("c")
+    engine.leave(connected)
+    connected.add("d")
+    assert engine.join("d", connected) is None
+    assert engine.players == ["a", "b", "d"]
+    assert_replays(engine.state)
+
+
+def test_replay_matches_live_table_with_disconnects():
+    rng = random.Random(7)
+    engine = HoldemEngine()
+    st = engine.state
+    connected = set()
+    names = iter(f"p{i}" for i in range(1000))
+    for _ in range(3000):
+        roll = rng.random()
+        if roll < 0.08:
+            nick = next(names)
+            connected.add(nick)
+            if engine.join(nick, connected) is not None:
+                connected.discard(nick)
+        elif roll < 0.14 and connected:
+            connected.discard(rng.choice(sorted(connected)))
+            engine.leave(connected)
+        elif roll < 0.2:
+            engine.start()
+        elif engine.to_act() is not None:
+            action = rng.choice(["check", "call", "fold", "raise", "all_in"])
+            amount = rng.choice([None, st.bb_size * 2, st.bb_size * 5])
+            engine.apply(engine.to_act(), ActionIn(type="action", action=action, amount=amount))
+        elif st.started:
+            engine.apply(rng.choice(st.players), ActionIn(type="action", action="new_hand"))
+        assert_replays(st)
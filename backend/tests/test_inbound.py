@@ -0,0 +1,46 @@
+import json
+
+from app.realtime.inbound import (MAX_MESSAGE_BYTES, ActionIn, ChatIn, PongIn, StartIn, TokenBucket,
+                                  parse_inbound)
+
+
+def test_valid_frames_are_parsed_by_type():
+    assert isinstance(parse_inbound('{"type": "start"}'), StartIn)
+    assert isinstance(parse_inbound('{"type": "pong"}'), PongIn)
+    chat = parse_inbound('{"type": "chat", "text": "oi"}')
+    assert isinstance(chat, ChatIn) and chat.text == "oi"
+    action = parse_inbound('{"type": "action", "action": "raise", "amount": 40}')
+    assert isinstance(action, ActionIn) and (action.action, action.amount) == ("raise", 40)
+    play = parse_inbound('{"type": "action", "action": "play", "card": "AS"}')
+    assert play.card == "AS"
+
+
+def test_invalid_frames_are_dropped():
+    for frame in (
+        "não é json",
+        "[]",
+        '{"type": "desconhecido"}',
+        '{"action": "call"}',
+        '{"type": "action", "action": "steal"}',
+        '{"type": "action", "action": "raise", "amount": -5}',
+        '{"type": "action", "action": "raise", "amount": "muito"}',
+        '{"type": "action", "action": "play", "card": "10 de copas"}',
+        json.dumps({"type": "chat", "text": "x" * 501}),
+    ):
+        assert parse_inbound(frame) is None, frame
+
+
+def test_oversized_frames_are_dropped_before_parsing():
+    padding = " " * MAX_MESSAGE_BYTES
+    assert parse_inbound('{"type": "start"}' + padding) is None
+
+
+def test_token_bucket_allows_bursts_then_refills_at_rate():
+    bucket = TokenBucket(rate=2, burst=3)
+    now = bucket.updated
+    assert [bucket.allow(now) for _ in range(4)] == [True, True, True, False]
+    assert bucket.allow(now + 0.25) is False  # meio token
+    assert bucket.allow(now + 0.5) is True
+    # parado por muito tempo, acumula no máximo `burst`
+    later = now + 100
+    assert [bucket.allow(later) for _ in range(4)] == [True, True, True, False]
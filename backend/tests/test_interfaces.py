@@ -0,0 +1,37 @@
+import pytest
+
+from app.game.bot_strategies import STRATEGIES, BotStrategy
+from app.game.shuffler import SecureShuffler, SeededShuffler, Shuffler
+from app.realtime.compression import CompressionPolicy, DictCompressor, FrameCompressor, StreamCompressor
+from app.realtime.engines import ENGINES, GameEngine
+
+
+def test_incomplete_implementations_fail_on_creation():
+    class NoDeflate(FrameCompressor):
+        mode = "x"
+
+    class NoBelow(Shuffler):
+        pass
+
+    class NoDecision(BotStrategy):
+        name = "x"
+
+    class NoViews(GameEngine):
+        def new_state(self):
+            return None
+
+    for cls, args in ((NoDeflate, (CompressionPolicy(),)), (NoBelow, ()), (NoDecision, ()), (NoViews, ())):
+        with pytest.raises(TypeError):
+            cls(*args)
+
+
+def test_registered_implementations_are_complete():
+    policy = CompressionPolicy()
+    StreamCompressor(policy)
+    DictCompressor(policy)
+    SecureShuffler()
+    SeededShuffler(1)
+    for strategy in STRATEGIES.values():
+        strategy()
+    for engine in ENGINES.values():
+        engine()
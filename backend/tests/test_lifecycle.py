@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+from app.realtime.clocks import TimerScheduler
+from app.realtime.lifecycle import TableLifecycle
+
+
+def make_lifecycle():
+    evicted = []
+    scheduler = TimerScheduler()
+    lifecycle = TableLifecycle(scheduler, evicted.append, idle_ttl=10, max_tables=10, hibernate=False)
+    return scheduler, lifecycle, evicted
+
+
+def fire(scheduler: TimerScheduler, now: float) -> None:
+    async def run():
+        for callback in scheduler.pop_due(now):
+            await callback()
+    asyncio.run(run())
+
+
+def test_one_timer_per_idle_table():
+    scheduler, lifecycle, evicted = make_lifecycle()
+    now = time.monotonic()
+    for i in range(5):
+        lifecycle.mark_idle("a", now=now + 100 * i)
+    assert scheduler.heap_size == 1
+    assert len(scheduler) == 1
+    # o primeiro prazo venceu, mas foi renovado: reagenda em vez de despejar
+    fire(scheduler, now + 10)
+    assert evicted == []
+    assert len(scheduler) == 1
+    lifecycle._expire("a", now=now + 410)
+    assert evicted == ["a"]
+
+
+def test_busy_table_is_not_evicted():
+    scheduler, lifecycle, evicted = make_lifecycle()
+    now = time.monotonic() - 100
+    lifecycle.mark_idle("a", now=now)
+    lifecycle.mark_idle("b", now=now + 1)
+    assert lifecycle.lru_victim() == "a"
+    lifecycle.mark_busy("a")
+    assert len(scheduler) == 1
+    assert lifecycle.lru_victim() == "b"
+    fire(scheduler, time.monotonic())
+    assert evicted == ["b"]
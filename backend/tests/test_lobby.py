@@ -0,0 +1,48 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.realtime.lobby import LobbyIndex
+
+
+def entry(table_id: str, game: str = "holdem", players=(), max_players: int = 9) -> dict:
+    return {"id": table_id, "game": game, "name": table_id, "players": list(players),
+            "player_count": len(players), "max_players": max_players, "started": False}
+
+
+def test_listing_is_cached_until_the_index_changes():
+    index = LobbyIndex()
+    index.upsert("a", entry("a"))
+    body, etag, total = index.serialized()
+    assert index.serialized() == (body, etag, total)
+    assert index.upsert("a", entry("a")) is False  # sem mudança, mesma versão
+    assert index.serialized()[1] == etag
+    assert index.upsert("a", entry("a", players=["x"])) is True
+    assert index.serialized()[1] != etag
+
+
+def test_filters_and_pagination_report_the_full_total():
+    index = LobbyIndex()
+    for i in range(5):
+        index.upsert(f"h{i}", entry(f"h{i}", max_players=1, players=["x"] if i % 2 else []))
+    index.upsert("s", entry("s", game="sueca", max_players=4))
+    assert [t["id"] for t in index.listing(game="holdem", open_seats=True)] == ["h0", "h2", "h4"]
+    body, _, total = index.serialized(game="holdem", offset=1, limit=2)
+    assert total == 5
+    assert [t["id"] for t in json.loads(body)] == ["h1", "h2"]
+
+
+def test_tables_endpoint_answers_304_while_the_lobby_is_unchanged():
+    client = TestClient(main.app)
+    first = client.get("/api/tables")
+    etag = first.headers["etag"]
+    again = client.get("/api/tables", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert client.post("/api/tables", json={"game": "holdem", "table_id": "lobby-etag"}).status_code == 201
+    changed = client.get("/api/tables", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "lobby-etag" in [t["id"] for t in changed.json()]
+    main.manager.evict_table("lobby-etag")
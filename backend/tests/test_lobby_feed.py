@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from app.realtime.lobby import LobbyFeed, LobbyIndex
+
+
+class FakeSocket:
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.fail = fail
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.fail:
+            raise ConnectionError("fechado")
+        self.sent.append(json.loads(text))
+
+
+def entry(table_id: str, players=()) -> dict:
+    return {"id": table_id, "game": "holdem", "name": table_id, "players": list(players),
+            "player_count": len(players), "max_players": 9, "started": False}
+
+
+def test_changes_coalesce_into_minimal_diffs():
+    index = LobbyIndex()
+    index.upsert("kept", entry("kept"))
+    index.upsert("gone", entry("gone"))
+    index.drain_changes()
+    index.upsert("kept", entry("kept", players=["a"]))
+    index.upsert("kept", entry("kept", players=["a", "b"]))
+    index.remove("gone")
+    index.upsert("new", entry("new"))
+    index.upsert("brief", entry("brief"))
+    index.remove("brief")  # criada e removida no mesmo intervalo: nenhum diff
+    assert index.drain_changes() == [
+        {"op": "update", "id": "kept", "players": ["a", "b"], "player_count": 2},
+        {"op": "remove", "id": "gone"},
+        {"op": "add", "table": entry("new")},
+    ]
+    assert index.drain_changes() == []
+
+
+def test_feed_sends_snapshot_then_one_diff_per_flush():
+    async def scenario():
+        index = LobbyIndex()
+        index.upsert("a", entry("a"))
+        feed = LobbyFeed(index, interval=3600)
+        ok, broken = FakeSocket(), FakeSocket()
+        await feed.subscribe(ok)
+        await feed.subscribe(broken)
+        assert ok.sent[0]["type"] == "lobby_snapshot"
+        assert [t["id"] for t in ok.sent[0]["tables"]] == ["a"]
+        await feed.flush()
+        assert len(ok.sent) == 1  # sem mudanças, nada é enviado
+        index.upsert("a", entry("a", players=["x"]))
+        broken.fail = True
+        await feed.flush()
+        assert ok.sent[1] == {"type": "lobby_diff", "version": index.version,
+                              "changes": [{"op": "update", "id": "a", "players": ["x"], "player_count": 1}]}
+        assert feed.subscribers == {ok}  # socket com erro sai do feed
+        feed.unsubscribe(ok)
+        await asyncio.sleep(0)
+    asyncio.run(scenario())
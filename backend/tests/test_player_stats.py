@@ -0,0 +1,31 @@
+from app.game.player_stats import PlayerStats
+
+HISTORY = [
+    (["a", "b"], [["a", "raise", 30, "preflop"], ["b", "call", None, "preflop"],
+                  ["a", "raise", 40, "flop"], ["b", "call", None, "flop"]]),
+    (["a", "b", "c"], [["c", "call", None, "preflop"], ["a", "fold", None, "preflop"],
+                       ["b", "check", None, "preflop"]]),
+]
+
+
+def test_history_matches_incremental_counters():
+    live = PlayerStats()
+    for i, (players, actions) in enumerate(HISTORY):
+        live.hand_started(f"t{i}", players)
+        for nick, action, _amount, street in actions:
+            live.action(f"t{i}", nick, action, street)
+    batch = PlayerStats.from_history(iter(HISTORY))
+    assert {n: batch.get(n) for n in "abc"} == {n: live.get(n) for n in "abc"}
+    assert batch.get("a") == {"hands": 2, "vpip": 50.0, "pfr": 50.0, "af": None}
+    assert batch.get("b")["af"] == 0.0
+
+
+def test_merge_keeps_hands_played_during_recompute():
+    stats = PlayerStats()
+    # mão jogada enquanto o histórico era lido
+    stats.hand_started("t", ["a", "d"])
+    stats.action("t", "d", "raise", "preflop")
+    stats.merge(PlayerStats.from_history(iter(HISTORY)))
+    assert stats.get("a")["hands"] == 3
+    assert stats.get("d") == {"hands": 1, "vpip": 100.0, "pfr": 100.0, "af": None}
+    assert stats.get("c")["hands"] == 1
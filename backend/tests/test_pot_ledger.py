@@ -0,0 +1,81 @@
+import random
+
+from app.game.pot_ledger import PotLedger
+from app.realtime.engines import HoldemEngine
+from app.realtime.inbound import ActionIn
+
+
+def test_all_ins_of_different_sizes_make_side_pots():
+    ledger = PotLedger()
+    ledger.commit(0, 100, all_in=True)
+    ledger.commit(1, 300, all_in=True)
+    ledger.commit(2, 300)
+    assert ledger.view(["a", "b", "c"]) == [
+        {"amount": 300, "eligible": ["a", "b", "c"]},
+        {"amount": 400, "eligible": ["b", "c"]},
+    ]
+    assert ledger.total() == 700
+
+
+def test_short_all_in_splits_the_bets_already_made():
+    ledger = PotLedger()
+    ledger.commit(0, 200)
+    ledger.commit(1, 200)
+    ledger.commit(2, 50, all_in=True)
+    assert ledger.view(["a", "b", "c"]) == [
+        {"amount": 150, "eligible": ["a", "b", "c"]},
+        {"amount": 300, "eligible": ["a", "b"]},
+    ]
+
+
+def test_folded_seats_lose_eligibility_but_chips_stay():
+    ledger = PotLedger()
+    for seat in range(3):
+        ledger.commit(seat, 40)
+    ledger.fold(1)
+    assert ledger.view(["a", "b", "c"]) == [{"amount": 120, "eligible": ["a", "c"]}]
+
+
+def test_showdown_pays_each_pot_only_to_its_players():
+    engine = HoldemEngine()
+    connected = set()
+    for nick in "abc":
+        connected.add(nick)
+        engine.join(nick, connected)
+    st = engine.state
+    st.stacks.update({"a": 100, "b": 300, "c": 600})
+    assert engine.start() is None
+    while engine.to_act() is not None:
+        engine.apply(engine.to_act(), ActionIn(type="action", action="all_in"))
+    assert st.street == "showdown" and st.winners
+    assert sum(st.stacks.values()) == 1000
+    # ninguém ganha mais do que cobre de cada adversário
+    assert st.stacks["a"] <= 300
+    assert st.stacks["b"] <= 300 + 300 + 100
+    assert st.stacks["c"] >= 600 - 300
+
+
+def test_chips_are_conserved_over_many_hands():
+    rng = random.Random(5)
+    engine = HoldemEngine()
+    connected = set()
+    for nick in "abcdef":
+        connected.add(nick)
+        engine.join(nick, connected)
+    st = engine.state
+    for nick in st.players:
+        st.stacks[nick] = rng.randint(20, 2000)
+    total = sum(st.stacks.values())
+    for _ in range(300):
+        if engine.start() is not None:
+            break
+        while engine.to_act() is not None:
+            assert st.pot_ledger.total() == st.pot
+            assert sum(st.stacks.values()) + st.pot == total
+            action = rng.choice(["check", "call", "fold", "raise", "all_in"])
+            amount = rng.choice([None, st.bb_size * 3, st.bb_size * 10])
+            if not engine.apply(engine.to_act(), ActionIn(type="action", action=action, amount=amount)):
+                engine.apply(engine.to_act(), ActionIn(type="action", action="fold"))
+        assert st.street == "showdown"
+        assert sum(st.stacks.values()) == total
+        st.reset_hand()
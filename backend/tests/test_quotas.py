@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.realtime.quotas import Quotas, client_identity
+
+ALICE = ("10.0.0.1", "https://site")
+BOB = ("10.0.0.2", "https://site")
+
+
+def request(host: str, **headers: str) -> SimpleNamespace:
+    return SimpleNamespace(client=SimpleNamespace(host=host), headers=headers)
+
+
+def test_tables_admitted_until_client_quota():
+    quotas = Quotas(tables_per_client=2, tables_per_origin=0)
+    for table_id in ("t1", "t2"):
+        assert quotas.check_table(ALICE) is None
+        quotas.table_created(table_id, ALICE)
+    assert quotas.check_table(ALICE) == "Limite de mesas por cliente atingido"
+    assert quotas.check_table(BOB) is None  # mesma origem, outro cliente
+    assert quotas.check_table(None) is None  # mesas sem dono ficam fora das quotas
+    quotas.table_removed("t1")
+    assert quotas.check_table(ALICE) is None
+    assert quotas.refused["tables"] == 1
+
+
+def test_origin_quota_counts_every_client_of_the_origin():
+    quotas = Quotas(tables_per_client=0, tables_per_origin=3)
+    quotas.table_created("t1", ALICE)
+    quotas.table_created("t2", BOB)
+    assert quotas.check_table(BOB) is None
+    assert quotas.check_table(ALICE, count=2) == "Limite de mesas por origem atingido"
+
+
+def test_connections_admitted_and_released():
+    quotas = Quotas(connections_per_client=1, connections_per_origin=0)
+    assert quotas.check_connection(ALICE) is None
+    quotas.connection_opened(ALICE)
+    assert quotas.check_connection(ALICE) == "Limite de conexões por cliente atingido"
+    quotas.connection_closed(ALICE)
+    assert quotas.check_connection(ALICE) is None
+    assert "10.0.0.1" not in quotas.connections_by_client
+
+
+def test_origin_quotas_are_off_by_default(monkeypatch):
+    monkeypatch.delenv("QUOTA_TABLES_PER_ORIGIN", raising=False)
+    monkeypatch.delenv("QUOTA_CONNECTIONS_PER_ORIGIN", raising=False)
+    quotas = Quotas(tables_per_client=0, connections_per_client=0)
+    assert (quotas.tables_per_origin, quotas.connections_per_origin) == (0, 0)
+    for i in range(1000):
+        quotas.table_created(f"t{i}", (f"10.1.{i // 256}.{i % 256}", "https://site"))
+        quotas.connection_opened((f"10.1.{i // 256}.{i % 256}", "https://site"))
+    assert quotas.check_table(ALICE) is None
+    assert quotas.check_connection(ALICE) is None
+
+
+def test_forwarded_for_only_with_trusted_proxy(monkeypatch):
+    req = request("172.16.0.1", **{"x-forwarded-for": "203.0.113.7, 172.16.0.1", "origin": "https://site"})
+    monkeypatch.delenv("QUOTA_TRUST_PROXY", raising=False)
+    assert client_identity(req) == ("172.16.0.1", "https://site")
+    monkeypatch.setenv("QUOTA_TRUST_PROXY", "1")
+    assert client_identity(req) == ("203.0.113.7", "https://site")
+    assert client_identity(request("172.16.0.1")) == ("172.16.0.1", "-")
+
+
+def test_throttle_delay_grows_with_the_excess():
+    quotas = Quotas(cpu_limit=0.1, bytes_limit=0, throttle_delay=0.05)
+    assert quotas.throttle("t", SimpleNamespace(load=lambda table_id: (0.05, 0))) == 0.0
+    assert quotas.throttle("t", SimpleNamespace(load=lambda table_id: (0.3, 0))) == pytest.approx(0.05 * 3)
+    assert "t" in quotas.throttled
+    quotas.throttle("t", SimpleNamespace(load=lambda table_id: (0.0, 0)))
+    assert "t" not in quotas.throttled
+
+
+def test_create_table_over_quota_returns_429(monkeypatch):
+    monkeypatch.setattr(main.manager, "quotas", Quotas(tables_per_client=1))
+    client = TestClient(main.app)
+    created = client.post("/api/tables", json={"game": "holdem", "table_id": "quota-a"})
+    assert created.status_code == 201
+    refused = client.post("/api/tables", json={"game": "holdem", "table_id": "quota-b"})
+    assert refused.status_code == 429
+    assert refused.json()["quota"] is True
+    assert "quota-b" not in main.manager.created_tables
+    main.manager.evict_table("quota-a")
@@ -0,0 +1,65 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.realtime.sessions import ReplayBuffer, SessionStore
+
+
+def test_replay_buffer_returns_only_missed_frames():
+    store = SessionStore(ttl_seconds=60)
+    session = store.issue("t", "a")
+    other = store.issue("t", "b")
+    buf = ReplayBuffer(maxlen=4)
+    for seq in (1, 2, 3):
+        session.seq = seq
+        buf.record(session.token, seq, f"a{seq}")
+        buf.record(other.token, seq, f"b{seq}")
+    assert buf.missed(session, 1) == ["a2", "a3"]
+    assert buf.missed(session, 3) == []
+    # a2 já saiu do buffer (maxlen=4): não dá para reenviar só o que faltou
+    assert buf.missed(session, 0) is None
+
+
+def test_resume_checks_table_and_nick():
+    store = SessionStore(ttl_seconds=60)
+    session = store.issue("t", "a")
+    assert store.resume(session.token, "t", "a") is session
+    assert store.resume(session.token, "t", "b") is None
+    assert store.resume(session.token, "u", "a") is None
+    assert store.resume("outro", "t", "a") is None
+    store.forget_table("t")
+    assert store.resume(session.token, "t", "a") is None
+
+
+def test_reconnect_replays_the_frames_lost_in_flight():
+    client = TestClient(main.app)
+    with client.websocket_connect("/ws?game=holdem&table=resume-1&nick=a") as wa:
+        hello, state = wa.receive_json(), wa.receive_json()
+        assert (hello["type"], hello["seq"], state["seq"]) == ("session", 1, 2)
+        with client.websocket_connect("/ws?game=holdem&table=resume-1&nick=b") as wb:
+            wb.receive_json(), wb.receive_json()
+            lost = wa.receive_json()  # frame que o cliente "não recebeu"
+            assert lost["seq"] == 3
+            wa.close()
+            time.sleep(0.1)
+            wb.send_text(json.dumps({"type": "chat", "text": "oi"}))
+            assert wb.receive_json()["type"] == "chat"
+            url = f"/ws?game=holdem&table=resume-1&nick=a&session={hello['token']}&last_seq=2"
+            with client.websocket_connect(url) as resumed:
+                # reenvio só do que faltou, com o mesmo seq, e o estado atual (a mesa mudou no meio)
+                assert resumed.receive_json() == lost
+                current = resumed.receive_json()
+                assert (current["type"], current["seq"]) == ("state", 4)
+                assert current["players"] == ["a", "b"]
+    main.manager.evict_table("resume-1")
+
+
+def test_unknown_session_gets_a_fresh_one():
+    client = TestClient(main.app)
+    with client.websocket_connect("/ws?game=holdem&table=resume-2&nick=a&session=nada&last_seq=5") as ws:
+        hello = ws.receive_json()
+        assert hello["type"] == "session" and hello["seq"] == 1 and hello["token"] != "nada"
+        assert ws.receive_json()["type"] == "state"
+    main.manager.evict_table("resume-2")
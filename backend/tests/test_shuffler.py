@@ -0,0 +1,86 @@
+import time
+from array import array
+from collections import Counter
+
+from app.game import shuffler
+from app.game.shuffler import DeckPool, SecureShuffler, SeededShuffler, get_shuffler, set_shuffler, shuffled
+
+DECK = list(range(52))
+
+
+def seeded_decks(seed: int, count: int) -> list:
+    sh = SeededShuffler(seed)
+    decks = []
+    for _ in range(count):
+        deck = list(DECK)
+        sh.shuffle(deck)
+        decks.append(deck)
+    return decks
+
+
+def test_secure_shuffle_is_a_permutation_and_reads_entropy_in_batches():
+    sh = SecureShuffler(batch_bytes=16)  # 4 palavras por leitura do os.urandom
+    deck = list(DECK)
+    sh.shuffle(deck)
+    assert sorted(deck) == DECK
+    assert sh.refills >= 51 // 4
+
+
+def test_secure_below_rejects_words_with_modulo_bias():
+    sh = SecureShuffler()
+    # 2**32 % 3 == 1: a maior palavra cairia sempre no resto 0 e é descartada
+    sh._words = array("I", [0xFFFFFFFF, 7])
+    sh._pos = 0
+    assert sh._below(3) == 1
+    assert sh.refills == 0
+
+
+def test_secure_shuffle_is_roughly_uniform():
+    sh = SecureShuffler()
+    counts = Counter()
+    for _ in range(6000):
+        items = [0, 1, 2]
+        sh.shuffle(items)
+        counts[tuple(items)] += 1
+    assert len(counts) == 6
+    assert all(800 < c < 1200 for c in counts.values())
+
+
+def test_pool_serves_decks_in_shuffler_order():
+    pool = DeckPool(DECK, SeededShuffler(7), size=4)
+    pool.fill()
+    decks = [pool.take() for _ in range(6)]
+    assert decks == seeded_decks(7, 6)
+    assert pool.hits >= 4
+
+
+def test_pool_refills_in_background_when_low():
+    pool = DeckPool(DECK, SeededShuffler(3), size=4)
+    pool.fill()
+    for _ in range(3):
+        pool.take()
+    deadline = time.monotonic() + 5
+    while len(pool._decks) < pool.size and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(pool._decks) == pool.size
+    assert pool._thread is not None and pool._thread.daemon
+
+
+def test_empty_pool_shuffles_on_demand():
+    pool = DeckPool(DECK, SeededShuffler(1), size=0)
+    assert pool.take() == seeded_decks(1, 1)[0]
+    assert (pool.hits, pool.misses) == (0, 1)
+    assert pool._thread is None
+
+
+def test_set_shuffler_makes_shuffled_reproducible():
+    previous = get_shuffler()
+    try:
+        set_shuffler(SeededShuffler(11))
+        first = [shuffled(DECK) for _ in range(3)]
+        set_shuffler(SeededShuffler(11))
+        assert [shuffled(DECK) for _ in range(3)] == first
+        assert first == seeded_decks(11, 3)
+    finally:
+        set_shuffler(previous)
+    assert shuffler._pools == {}
@@ -0,0 +1,100 @@
+from app.game.sueca_engine import CARD_INDEX, CARD_NAMES, SuecaTableState, hand_game_points
+from app.realtime.engines import SuecaEngine
+
+NICKS = ["a", "b", "c", "d"]
+
+
+def mask(*names: str) -> int:
+    return sum(1 << CARD_INDEX[n] for n in names)
+
+
+def dealt(**hands: tuple) -> SuecaTableState:
+    """Mesa com o baralho em ordem (trunfo paus, 'b' sai) e as mãos dadas por jogador"""
+    st = SuecaTableState()
+    for nick in NICKS:
+        st.add_player(nick)
+    assert st.start_hand(list(range(40)))
+    for nick, cards in hands.items():
+        st.hands[st.seat_of(nick)] = mask(*cards)
+    return st
+
+
+def test_highest_card_of_led_suit_wins():
+    st = dealt(b=("KS", "2H"), c=("AD", "3H"), d=("7S", "4H"), a=("QS", "5H"))
+    assert st.to_act() == "b"
+    for nick, card in (("b", "KS"), ("c", "AD"), ("d", "7S"), ("a", "QS")):
+        assert st.play(nick, card)
+    # o ás de ouros é mais forte, mas não é do naipe de saída nem trunfo
+    assert st.last_trick_winner == st.seat_of("d")
+    assert st.points == [0, 4 + 11 + 10 + 2]
+    assert st.to_act() == "d"
+
+
+def test_trump_beats_led_suit_and_must_follow_suit():
+    st = dealt(b=("AS", "6S"), c=("3C", "KS"), d=("2C", "4H"), a=("7S", "5H"))
+    assert not st.play("c", "KS")  # não é a vez
+    assert st.play("b", "AS")
+    assert not st.play("c", "3C")  # tem espadas: tem de assistir
+    assert not st.play("c", "AH")  # não está na mão
+    assert [CARD_INDEX["KS"]] == st.legal_cards(st.seat_of("c"))
+    assert st.play("c", "KS")
+    assert st.play("d", "2C")  # sem espadas: corta com o trunfo mais baixo
+    assert st.play("a", "7S")
+    assert st.last_trick_winner == st.seat_of("d")
+    assert st.points == [0, 11 + 4 + 0 + 10]
+
+
+def test_full_hand_scores_game_points():
+    # baralho em ordem: o dealer 'a' fica com todo o naipe de paus, que é trunfo
+    st = dealt()
+    while st.to_act() is not None:
+        seat = st.current
+        assert st.play(st.players[seat], CARD_NAMES[st.legal_cards(seat)[0]])
+    assert st.finished and st.tricks_played == 10
+    assert st.points == [120, 0]
+    assert st.score == [4, 0]
+
+
+def test_hand_game_points_thresholds():
+    assert [hand_game_points(p) for p in (0, 60, 61, 90, 91, 119, 120)] == [0, 0, 1, 1, 2, 2, 4]
+
+
+def started_engine() -> SuecaEngine:
+    engine = SuecaEngine()
+    for nick in NICKS:
+        assert engine.join(nick, set(NICKS)) is None
+    assert engine.start() is None
+    return engine
+
+
+def test_newcomer_takes_disconnected_seat_mid_hand():
+    engine = started_engine()
+    st = engine.state
+    cards = st.hands[st.seat_of("d")]
+    assert engine.join("e", {"a", "b", "c", "e"}) is None
+    # assume o assento, a equipe e as cartas de quem caiu
+    assert st.players == ["a", "b", "c", "e"]
+    assert st.hands[st.seat_of("e")] == cards
+    assert st.started and not st.finished
+    assert engine.join("f", {"a", "b", "c", "e", "f"}) == "Mesa cheia. Máximo de 4 jogadores."
+
+
+def test_leave_keeps_hand_while_someone_is_connected():
+    engine = started_engine()
+    assert engine.leave({"a", "b", "c"}) is False
+    assert engine.state.players == NICKS and engine.state.started
+    # todos saíram: a mão é descartada e os assentos liberados
+    assert engine.leave(set()) is True
+    assert engine.state.players == [] and not engine.state.started
+
+
+def test_prune_between_hands_frees_seats_and_resets_score():
+    engine = started_engine()
+    st = engine.state
+    st.finished = True
+    st.score = [3, 1]
+    assert engine.leave({"a", "b", "c"}) is True
+    assert st.players == ["a", "b", "c"]
+    assert st.score == [0, 0]
+    assert not st.started
+    assert engine.start() == "A Sueca precisa de 4 jogadores. Atualmente há 3 na mesa."
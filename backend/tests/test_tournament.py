@@ -0,0 +1,106 @@
+import pytest
+
+from app.game.tournament import BlindLevel, BlindSchedule, Tournament
+
+
+def make(n_players: int, table_size: int = 6, clock=None) -> Tournament:
+    players = [f"p{i}" for i in range(n_players)]
+    kwargs = {"clock": clock} if clock is not None else {}
+    return Tournament("mtt", players, table_size=table_size, starting_stack=1000,
+                      schedule=BlindSchedule(level_seconds=60), **kwargs)
+
+
+def bust(tournament: Tournament, table_id: str, count: int) -> list:
+    st = tournament.tables[table_id]
+    busted = st.players[:count]
+    for nick in busted:
+        st.stacks[nick] = 0
+    return busted
+
+
+def sizes(tournament: Tournament) -> dict:
+    return {t: tournament.size(t) for t in tournament.tables}
+
+
+def test_seating_is_round_robin():
+    tournament = make(14)
+    assert sizes(tournament) == {"mtt-t1": 5, "mtt-t2": 5, "mtt-t3": 4}
+    assert tournament.remaining() == 14
+    with pytest.raises(ValueError):
+        Tournament("dup", ["a", "a"])
+
+
+def test_eliminations_then_balancing_moves_one_player():
+    tournament = make(18)
+    busted = bust(tournament, "mtt-t1", 2)
+    result = tournament.hand_finished("mtt-t1")
+    assert result.eliminated == busted and result.moves == [] and result.broken is None
+    assert tournament.finish_order == busted
+    assert all(nick not in tournament.table_of for nick in busted)
+
+    # a mesa cheia só cede jogadores quando termina a mão dela
+    st = tournament.tables["mtt-t2"]
+    mover = st.players[(st.dealer_index + 3) % len(st.players)]
+    stack = st.stacks[mover] = 1234
+    result = tournament.hand_finished("mtt-t2")
+    assert [tuple(m) for m in result.moves] == [(mover, "mtt-t2", "mtt-t1")]
+    assert result.tables == {"mtt-t1", "mtt-t2"}
+    assert tournament.table_of[mover] == "mtt-t1"
+    assert tournament.tables["mtt-t1"].stacks[mover] == stack
+    assert sizes(tournament) == {"mtt-t1": 5, "mtt-t2": 5, "mtt-t3": 6}
+
+
+def test_table_breaks_when_players_fit_in_one_less():
+    tournament = make(14)
+    bust(tournament, "mtt-t3", 2)
+    survivors = list(tournament.tables["mtt-t3"].players[2:])
+    result = tournament.hand_finished("mtt-t3")
+    assert result.broken == "mtt-t3"
+    assert result.tables == {"mtt-t1", "mtt-t2", "mtt-t3"}
+    assert sorted(m.nick for m in result.moves) == sorted(survivors)
+    assert "mtt-t3" not in tournament.tables and "mtt-t3" not in tournament.pending
+    assert sizes(tournament) == {"mtt-t1": 6, "mtt-t2": 6}
+    assert {tournament.table_of[n] for n in survivors} == {"mtt-t1", "mtt-t2"}
+
+
+def test_moves_into_a_live_hand_wait_in_pending():
+    tournament = make(14)
+    for table_id in ("mtt-t1", "mtt-t2"):
+        tournament.tables[table_id].start_hand()
+    bust(tournament, "mtt-t3", 2)
+    survivors = list(tournament.tables["mtt-t3"].players[2:])
+    tournament.hand_finished("mtt-t3")
+    pending = [nick for waiting in tournament.pending.values() for nick, _ in waiting]
+    assert sorted(pending) == sorted(survivors)
+    assert all(n not in st.players for st in tournament.tables.values() for n in survivors)
+    assert sizes(tournament) == {"mtt-t1": 6, "mtt-t2": 6}
+
+    # quando a mão acaba, os pendentes sentam com o stack que trouxeram
+    st = tournament.tables["mtt-t1"]
+    waiting = list(tournament.pending["mtt-t1"])
+    assert len(waiting) == 1
+    st.street = "showdown"
+    tournament.hand_finished("mtt-t1")
+    assert tournament.pending["mtt-t1"] == []
+    assert all(st.stacks[nick] == stack for nick, stack in waiting)
+
+
+def test_blind_level_applies_at_hand_end():
+    now = [0.0]
+    tournament = make(4, clock=lambda: now[0])
+    st = tournament.tables["mtt-t1"]
+    assert (st.sb_size, st.bb_size) == (5, 10)
+    now[0] = 125.0
+    assert tournament.level() == BlindLevel(15, 30)
+    assert (st.sb_size, st.bb_size) == (5, 10)  # só muda entre mãos
+    tournament.hand_finished("mtt-t1")
+    assert (st.sb_size, st.bb_size) == (15, 30)
+
+
+def test_last_player_standing_wins():
+    tournament = make(3)
+    busted = bust(tournament, "mtt-t1", 2)
+    tournament.hand_finished("mtt-t1")
+    assert tournament.finished()
+    winner = tournament.winner()
+    assert tournament.standings() == [winner] + busted[::-1]
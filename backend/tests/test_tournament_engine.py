@@ -0,0 +1,53 @@
+import random
+
+from app.game.tournament import BlindSchedule, Tournament
+from app.realtime.engines import TournamentHoldemEngine
+from app.realtime.inbound import ActionIn
+
+
+def tournament_chips(tournament: Tournament) -> int:
+    total = 0
+    for st in tournament.tables.values():
+        total += sum(st.stacks.values())
+        if st.winners is None:
+            total += st.pot  # pote ainda não pago
+    for pending in tournament.pending.values():
+        total += sum(stack for _, stack in pending)
+    return total
+
+
+def test_chips_are_conserved_through_the_engine():
+    rng = random.Random(11)
+    players = [f"p{i}" for i in range(14)]
+    tournament = Tournament("mtt", players, table_size=6, starting_stack=1000,
+                            schedule=BlindSchedule(level_seconds=1e9))
+    total = tournament_chips(tournament)
+    engines = {t: TournamentHoldemEngine(tournament, t) for t in tournament.tables}
+
+    def settle(table_id: str) -> None:
+        # o que o servidor faz quando a mão chega ao showdown: balanceia e dá a próxima
+        result = tournament.hand_finished(table_id)
+        for t in result.tables:
+            if t != result.broken:
+                engines[t].next_hand()
+
+    for _ in range(20000):
+        if tournament.finished():
+            break
+        table_id = rng.choice(sorted(tournament.tables))
+        engine = engines[table_id]
+        st = engine.state
+        if rng.random() < 0.05 and engine.hand_live():
+            # reinícios pedidos no meio da mão são recusados
+            assert engine.start() is not None
+            assert engine.apply(rng.choice(st.players), ActionIn(type="action", action="new_hand")) is False
+        elif engine.to_act() is not None:
+            action = rng.choice(["check", "call", "fold", "raise", "all_in"])
+            amount = rng.choice([None, st.bb_size * 2, st.bb_size * 5])
+            engine.apply(engine.to_act(), ActionIn(type="action", action=action, amount=amount))
+            if st.started and st.street == "showdown":
+                settle(table_id)
+        else:
+            engine.next_hand()  # timer de próxima mão do servidor
+        assert tournament_chips(tournament) == total
+    assert tournament.finished()
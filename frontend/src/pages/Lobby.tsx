@@ -1,4 +1,5 @@
 import { useEffect, useState } from "react";
+import { createWs } from "../ws/client";
 
 type TableInfo = {
   id: string;
@@ -69,11 +70,52 @@ export function Lobby({ onJoinTable, onBack, nick }: Props) {
     }
   };
 
+  // Aplica um diff do feed do lobby (/ws/lobby) sobre a lista atual
+  const applyLobbyChanges = (prev: TableInfo[], changes: any[]) => {
+    let next = prev;
+    for (const change of changes) {
+      if (change.op === "add") {
+        next = [...next.filter((t) => t.id !== change.table.id), change.table];
+      } else if (change.op === "remove") {
+        next = next.filter((t) => t.id !== change.id);
+      } else if (change.op === "update") {
+        const { op, ...fields } = change;
+        next = next.map((t) => (t.id === change.id ? { ...t, ...fields } : t));
+      }
+    }
+    return next;
+  };
+
   useEffect(() => {
-    fetchTables();
-    // Atualiza a lista de salas a cada 3 segundos
-    const interval = setInterval(fetchTables, 3000);
-    return () => clearInterval(interval);
+    // Recebe snapshot + diffs pelo feed do lobby; se o feed cair, volta ao polling
+    let interval: ReturnType<typeof setInterval> | null = null;
+    const startPolling = () => {
+      if (interval) return;
+      fetchTables();
+      // Atualiza a lista de salas a cada 3 segundos
+      interval = setInterval(fetchTables, 3000);
+    };
+    const u = new URL("/ws/lobby", import.meta.env.VITE_API_URL || "ws://localhost:8000");
+    u.protocol = u.protocol.replace("http", "ws");
+    const ws = createWs(
+      u.toString(),
+      (msg) => {
+        if (msg.type === "lobby_snapshot") {
+          setTables(msg.tables || []);
+          setError(null);
+        } else if (msg.type === "lobby_diff") {
+          setTables((prev) => applyLobbyChanges(prev, msg.changes || []));
+        }
+      },
+      (status) => {
+        if (status !== "open") startPolling();
+      }
+    );
+    return () => {
+      ws.onclose = null;
+      ws.close();
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   const handleSelectTable = async (tableId: string) => {
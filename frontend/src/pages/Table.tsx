@@ -1,7 +1,10 @@
 import { useEffect, useMemo, useRef, useState } from "react";
-import { createWs } from "../ws/client";
+import { createWs, WsCompression } from "../ws/client";
 import { ProfessionalCard } from "../components/ProfessionalCard";
 
+// Compressão dos frames da mesa (feita pelo app; o servidor roda sem permessage-deflate)
+const WS_COMPRESS = (import.meta.env.VITE_WS_COMPRESS ?? "deflate") as WsCompression | "";
+
 type Props = {
   params: { game: string; table: string; nick: string };
   onLeave: () => void;
@@ -518,162 +521,229 @@ export function Table({ params, onLeave }: Props) {
     return u.toString();
   }, [params]);
 
+  // Sessão retomável: token emitido pelo servidor e último seq recebido
+  const sessionRef = useRef<{ url: string; token: string | null; lastSeq: number }>({
+    url: "",
+    token: null,
+    lastSeq: 0,
+  });
+
   useEffect(() => {
-    const ws = createWs(
-      wsUrl,
-      (msg) => {
-        if (msg.type === "state") {
-          setPlayers(msg.players || []);
-          setStarted(Boolean(msg.started));
-          setCommunity(msg.community || []);
-          setHole(msg.hole || []);
-          setPot(msg.pot || 0);
-          setStreet(msg.street || null);
-          setToAct(msg.toAct || null);
-          setWinners(msg.winners || null);
-          setRecentActions(msg.recentActions || []);
-          setCallAmount(msg.callAmount ?? null);
-          setStacks(msg.stacks || {});
-          setDealer(msg.dealer || null);
-          setSb(msg.sb || null);
-          setBb(msg.bb || null);
-          setMinRaise(msg.minRaise ?? null);
-          setAllHoles(msg.allHoles || {});
-          // Ao receber qualquer atualização de estado, liberamos a UI para o próximo clique
-          // Isso evita que os botões "congelem" após a primeira ação
-          setActing(false);
-          // Resetar betAmount quando não é a vez do jogador ou quando muda o estado
-          if (msg.toAct !== params.nick) {
-            setBetAmount(0);
-          } else if (msg.toAct === params.nick && msg.callAmount !== null) {
-            // Se é a vez do jogador, inicializar com call amount
-            setBetAmount(msg.callAmount || 0);
+    if (sessionRef.current.url !== wsUrl) {
+      sessionRef.current = { url: wsUrl, token: null, lastSeq: 0 };
+    }
+    let disposed = false;
+    let retries = 0;
+    let retryTimer: ReturnType<typeof setTimeout> | null = null;
+    // Servidor em drain: a mesa foi transferida e a próxima conexão vai para `base`
+    let base = wsUrl;
+    let moving = false;
+
+    const handleMessage = (msg: any) => {
+      if (msg.type === "state") {
+        setPlayers(msg.players || []);
+        setStarted(Boolean(msg.started));
+        setCommunity(msg.community || []);
+        setHole(msg.hole || []);
+        setPot(msg.pot || 0);
+        setStreet(msg.street || null);
+        setToAct(msg.toAct || null);
+        setWinners(msg.winners || null);
+        setRecentActions(msg.recentActions || []);
+        setCallAmount(msg.callAmount ?? null);
+        setStacks(msg.stacks || {});
+        setDealer(msg.dealer || null);
+        setSb(msg.sb || null);
+        setBb(msg.bb || null);
+        setMinRaise(msg.minRaise ?? null);
+        setAllHoles(msg.allHoles || {});
+        // Ao receber qualquer atualização de estado, liberamos a UI para o próximo clique
+        // Isso evita que os botões "congelem" após a primeira ação
+        setActing(false);
+        // Resetar betAmount quando não é a vez do jogador ou quando muda o estado
+        if (msg.toAct !== params.nick) {
+          setBetAmount(0);
+        } else if (msg.toAct === params.nick && msg.callAmount !== null) {
+          // Se é a vez do jogador, inicializar com call amount
+          setBetAmount(msg.callAmount || 0);
+        }
+
+        // Disparo de animação de distribuição quando entrar em preflop recém-iniciado
+        if (Boolean(msg.started) && (msg.street || null) === "preflop") {
+          // anima cartas "back" saindo do croupier para cada slot visível
+          const wrapper = document.getElementById("table-canvas-wrapper");
+          if (wrapper) {
+            const w = wrapper.clientWidth;
+            const h = wrapper.clientHeight;
+            // posição do croupier
+            const cPos = customPositionsRef.current?.["Croupier"]; // ver abaixo uso de ref
+            const cx = cPos ? (cPos.x / 100) * w : w * 0.5;
+            const cy = cPos ? (cPos.y / 100) * h : h * 0.12;
+            const targets = (msg.players || []).slice(0, 9);
+            const anims: AnimCard[] = [];
+
+            // Limpa animações anteriores
+            setDealAnims([]);
+
+            targets.forEach((p: string, idx: number) => {
+              // usa posições calculadas previamente via customPositions (slots)
+              const slotName = `Slot ${idx + 1}`;
+              const tPos =
+                customPositionsRef.current?.[slotName] ||
+                customPositionsRef.current?.[p];
+              if (tPos) {
+                const tx = (tPos.x / 100) * w;
+                const ty = (tPos.y / 100) * h;
+                const id = `deal-${Date.now()}-${idx}`;
+
+                // Inicia a carta na posição do croupier
+                anims.push({ id, x: cx, y: cy, opacity: 1 });
+
+                // Anima a carta para o jogador com delay escalonado
+                setTimeout(() => {
+                  setDealAnims((prev: AnimCard[]) => {
+                    const existing = prev.find((a) => a.id === id);
+                    if (existing) {
+                      return prev.map((a: AnimCard) =>
+                        a.id === id ? { ...a, x: tx, y: ty, opacity: 1 } : a
+                      );
+                    }
+                    return prev;
+                  });
+
+                  // Remove a animação após completar
+                  setTimeout(
+                    () =>
+                      setDealAnims((prev: AnimCard[]) =>
+                        prev.filter((a: AnimCard) => a.id !== id)
+                      ),
+                    800
+                  );
+                }, 100 + idx * 150); // Delay escalonado para cada jogador
+              }
+            });
+
+            if (anims.length) {
+              setDealAnims(anims);
+            }
           }
+        }
 
-          // Disparo de animação de distribuição quando entrar em preflop recém-iniciado
-          if (Boolean(msg.started) && (msg.street || null) === "preflop") {
-            // anima cartas "back" saindo do croupier para cada slot visível
+        // Animação de fichas para última ação com valor
+        const actions = msg.recentActions || [];
+        if (actions.length > prevRecentLenRef.current) {
+          const last = actions[actions.length - 1];
+          if (last && last.amount && last.player) {
             const wrapper = document.getElementById("table-canvas-wrapper");
             if (wrapper) {
               const w = wrapper.clientWidth;
               const h = wrapper.clientHeight;
-              // posição do croupier
-              const cPos = customPositionsRef.current?.["Croupier"]; // ver abaixo uso de ref
-              const cx = cPos ? (cPos.x / 100) * w : w * 0.5;
-              const cy = cPos ? (cPos.y / 100) * h : h * 0.12;
-              const targets = (msg.players || []).slice(0, 9);
-              const anims: AnimCard[] = [];
-
-              // Limpa animações anteriores
-              setDealAnims([]);
-
-              targets.forEach((p: string, idx: number) => {
-                // usa posições calculadas previamente via customPositions (slots)
-                const slotName = `Slot ${idx + 1}`;
-                const tPos =
-                  customPositionsRef.current?.[slotName] ||
-                  customPositionsRef.current?.[p];
-                if (tPos) {
-                  const tx = (tPos.x / 100) * w;
-                  const ty = (tPos.y / 100) * h;
-                  const id = `deal-${Date.now()}-${idx}`;
-
-                  // Inicia a carta na posição do croupier
-                  anims.push({ id, x: cx, y: cy, opacity: 1 });
-
-                  // Anima a carta para o jogador com delay escalonado
-                  setTimeout(() => {
-                    setDealAnims((prev: AnimCard[]) => {
-                      const existing = prev.find((a) => a.id === id);
-                      if (existing) {
-                        return prev.map((a: AnimCard) =>
-                          a.id === id ? { ...a, x: tx, y: ty, opacity: 1 } : a
-                        );
-                      }
-                      return prev;
-                    });
-
-                    // Remove a animação após completar
-                    setTimeout(
-                      () =>
-                        setDealAnims((prev: AnimCard[]) =>
-                          prev.filter((a: AnimCard) => a.id !== id)
-                        ),
-                      800
-                    );
-                  }, 100 + idx * 150); // Delay escalonado para cada jogador
-                }
-              });
-
-              if (anims.length) {
-                setDealAnims(anims);
+              const playerName: string = last.player;
+              // encontra índice do jogador na lista atual
+              const pIdx = (msg.players || []).indexOf(playerName);
+              const slotName = pIdx >= 0 ? `Slot ${pIdx + 1}` : playerName;
+              const sPos =
+                customPositionsRef.current?.[slotName] ||
+                customPositionsRef.current?.[playerName];
+              if (sPos) {
+                const sx = (sPos.x / 100) * w;
+                const sy = (sPos.y / 100) * h;
+                const potX = (potXPercent / 100) * w;
+                const potY = (potYPercent / 100) * h - 20;
+                const id = `chip-${Date.now()}-${playerName}`;
+                // cria chip na origem
+                setChipAnims((prev) => [
+                  ...prev,
+                  { id, x: sx, y: sy, opacity: 1 },
+                ]);
+                // move ao pote
+                setTimeout(() => {
+                  setChipAnims((prev) =>
+                    prev.map((c) =>
+                      c.id === id
+                        ? { ...c, x: potX, y: potY, opacity: 0.2 }
+                        : c
+                    )
+                  );
+                  // remove depois
+                  setTimeout(
+                    () =>
+                      setChipAnims((prev) => prev.filter((c) => c.id !== id)),
+                    500
+                  );
+                }, 20);
               }
             }
           }
+        }
+        prevRecentLenRef.current = actions.length;
+      } else if (msg.type === "error") {
+        // Exibe mensagem de erro (ex: mesa cheia)
+        setErrorMessage(msg.text || msg.error || "Erro desconhecido");
+        // Auto-remove mensagem após 5 segundos
+        setTimeout(() => setErrorMessage(null), 5000);
+      }
+    };
 
-          // Animação de fichas para última ação com valor
-          const actions = msg.recentActions || [];
-          if (actions.length > prevRecentLenRef.current) {
-            const last = actions[actions.length - 1];
-            if (last && last.amount && last.player) {
-              const wrapper = document.getElementById("table-canvas-wrapper");
-              if (wrapper) {
-                const w = wrapper.clientWidth;
-                const h = wrapper.clientHeight;
-                const playerName: string = last.player;
-                // encontra índice do jogador na lista atual
-                const pIdx = (msg.players || []).indexOf(playerName);
-                const slotName = pIdx >= 0 ? `Slot ${pIdx + 1}` : playerName;
-                const sPos =
-                  customPositionsRef.current?.[slotName] ||
-                  customPositionsRef.current?.[playerName];
-                if (sPos) {
-                  const sx = (sPos.x / 100) * w;
-                  const sy = (sPos.y / 100) * h;
-                  const potX = (potXPercent / 100) * w;
-                  const potY = (potYPercent / 100) * h - 20;
-                  const id = `chip-${Date.now()}-${playerName}`;
-                  // cria chip na origem
-                  setChipAnims((prev) => [
-                    ...prev,
-                    { id, x: sx, y: sy, opacity: 1 },
-                  ]);
-                  // move ao pote
-                  setTimeout(() => {
-                    setChipAnims((prev) =>
-                      prev.map((c) =>
-                        c.id === id
-                          ? { ...c, x: potX, y: potY, opacity: 0.2 }
-                          : c
-                      )
-                    );
-                    // remove depois
-                    setTimeout(
-                      () =>
-                        setChipAnims((prev) => prev.filter((c) => c.id !== id)),
-                      500
-                    );
-                  }, 20);
-                }
-              }
+    const open = () => {
+      // Ao reconectar, envia o token e o último seq para receber só o que foi perdido
+      const u = new URL(base);
+      const session = sessionRef.current;
+      if (session.token) {
+        u.searchParams.set("session", session.token);
+        u.searchParams.set("last_seq", String(session.lastSeq));
+      }
+      const ws = createWs(
+        u.toString(),
+        (msg) => {
+          if (typeof msg.seq === "number") sessionRef.current.lastSeq = msg.seq;
+          if (msg.type === "session") {
+            sessionRef.current.token = msg.token;
+            return;
+          }
+          if (msg.type === "reconnect") {
+            // a sessão não vale no nó de destino: entra de novo com o mesmo nick
+            const u = new URL(wsUrl);
+            if (msg.target) {
+              const t = new URL(msg.target, u);
+              u.protocol = t.protocol;
+              u.host = t.host;
             }
+            base = u.toString();
+            sessionRef.current = { url: wsUrl, token: null, lastSeq: 0 };
+            moving = true;
+            return;
           }
-          prevRecentLenRef.current = actions.length;
-        } else if (msg.type === "error") {
-          // Exibe mensagem de erro (ex: mesa cheia)
-          setErrorMessage(msg.text || msg.error || "Erro desconhecido");
-          // Auto-remove mensagem após 5 segundos
-          setTimeout(() => setErrorMessage(null), 5000);
-        }
-      },
-      (s) => {
-        setStatus(s);
-        // Não mostrar mensagem de erro genérica ao fechar conexão
-        // Apenas mostrar quando receber mensagem de erro explícita do backend
-      }
-    );
-    wsRef.current = ws;
-    return () => ws.close();
+          handleMessage(msg);
+        },
+        (s) => {
+          setStatus(s);
+          if (s === "open") retries = 0;
+          if (s === "close" && moving && !disposed) {
+            // espalha as reconexões para não chegarem todas juntas no destino
+            moving = false;
+            retryTimer = setTimeout(open, 200 + Math.random() * 1000);
+            return;
+          }
+          // Conexão caiu: tenta retomar a sessão com backoff
+          if (s === "close" && !disposed && sessionRef.current.token && retries < 5) {
+            retries += 1;
+            retryTimer = setTimeout(open, 500 * 2 ** retries);
+          }
+          // Não mostrar mensagem de erro genérica ao fechar conexão
+          // Apenas mostrar quando receber mensagem de erro explícita do backend
+        },
+        WS_COMPRESS || undefined
+      );
+      wsRef.current = ws;
+    };
+
+    open();
+    return () => {
+      disposed = true;
+      if (retryTimer) clearTimeout(retryTimer);
+      wsRef.current?.close();
+    };
   }, [wsUrl, potXPercent, potYPercent]);
 
   // Ajusta tamanho do canvas ao container e desenha a mesa
@@ -1,16 +1,57 @@
+import { inflateRaw, slideWindow } from "./inflate";
+
+// Compressão dos frames pedida ao servidor (?compress=); ver backend/app/realtime/compression.py
+export type WsCompression = "deflate" | "deflate-dict";
+
 export function createWs(
   url: string,
   onMessage: (msg: any) => void,
-  onStatus?: (s: "open" | "close" | "error") => void
+  onStatus?: (s: "open" | "close" | "error") => void,
+  compress?: WsCompression
 ) {
-  const ws = new WebSocket(url);
+  const u = new URL(url);
+  if (compress) u.searchParams.set("compress", compress);
+  const ws = new WebSocket(u.toString());
+  ws.binaryType = "arraybuffer";
   ws.onopen = () => onStatus?.("open");
   ws.onclose = () => onStatus?.("close");
   ws.onerror = () => onStatus?.("error");
+
+  // Frames binários são deflate raw: no modo deflate a janela é a saída dos
+  // frames binários anteriores; no deflate-dict, o dicionário compartilhado
+  const utf8 = new TextDecoder();
+  let history = new Uint8Array(0);
+  let dictionary: Promise<Uint8Array> | null = null;
+  if (compress === "deflate-dict") {
+    const d = new URL("/api/ws/dictionary", u);
+    d.protocol = d.protocol.replace("ws", "http");
+    dictionary = fetch(d.toString())
+      .then((r) => r.arrayBuffer())
+      .then((b) => new Uint8Array(b));
+  }
+  const decode = async (data: string | ArrayBuffer): Promise<string> => {
+    if (typeof data === "string") return data;
+    const bytes = new Uint8Array(data);
+    if (dictionary) return utf8.decode(inflateRaw(bytes, await dictionary));
+    const out = inflateRaw(bytes, history);
+    history = slideWindow(history, out);
+    return utf8.decode(out);
+  };
+
+  // fila: mantém a ordem dos frames enquanto o dicionário carrega
+  let queue: Promise<void> = Promise.resolve();
   ws.onmessage = (e) => {
-    try {
-      onMessage(JSON.parse(e.data));
-    } catch {}
+    queue = queue.then(async () => {
+      try {
+        const msg = JSON.parse(await decode(e.data));
+        // heartbeat do servidor: responde e não repassa
+        if (msg.type === "ping") {
+          ws.send(JSON.stringify({ type: "pong" }));
+          return;
+        }
+        onMessage(msg);
+      } catch {}
+    });
   };
   return ws;
 }
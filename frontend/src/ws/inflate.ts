@@ -0,0 +1,182 @@
+// Inflate de deflate raw (RFC 1951) para os frames binários do /ws.
+// O DecompressionStream do browser não aceita dicionário nem guarda a janela
+// entre mensagens, então o decoder é próprio: `window` são os bytes que vêm
+// "antes" do frame (o dicionário no modo deflate-dict, ou a saída dos frames
+// anteriores no modo deflate com context takeover).
+
+const LEN_BASE = [3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31, 35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258];
+const LEN_EXTRA = [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0];
+const DIST_BASE = [1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193, 257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577];
+const DIST_EXTRA = [0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13];
+const CODE_LENGTH_ORDER = [16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14, 1, 15];
+
+// janela máxima do deflate (windowBits 15)
+export const MAX_WINDOW = 32768;
+
+type Huffman = { counts: Uint16Array; symbols: Uint16Array };
+
+function huffman(lengths: ArrayLike<number>): Huffman {
+  const counts = new Uint16Array(16);
+  const symbols = new Uint16Array(lengths.length);
+  for (let i = 0; i < lengths.length; i++) counts[lengths[i]]++;
+  counts[0] = 0;
+  const offsets = new Uint16Array(16);
+  for (let len = 1; len < 15; len++) offsets[len + 1] = offsets[len] + counts[len];
+  for (let i = 0; i < lengths.length; i++) {
+    if (lengths[i]) symbols[offsets[lengths[i]]++] = i;
+  }
+  return { counts, symbols };
+}
+
+const FIXED_LITERALS = huffman(Array.from({ length: 288 }, (_, i) => (i < 144 ? 8 : i < 256 ? 9 : i < 280 ? 7 : 8)));
+const FIXED_DISTANCES = huffman(new Array(30).fill(5));
+
+class Inflater {
+  private pos = 0;
+  private bitBuf = 0;
+  private bitCount = 0;
+  out: Uint8Array;
+  length: number;
+
+  constructor(private input: Uint8Array, window: Uint8Array) {
+    this.out = new Uint8Array(window.length + Math.max(1024, input.length * 4));
+    this.out.set(window);
+    this.length = window.length;
+  }
+
+  private bits(n: number): number {
+    while (this.bitCount < n) {
+      if (this.pos >= this.input.length) throw new Error("frame deflate truncado");
+      this.bitBuf |= this.input[this.pos++] << this.bitCount;
+      this.bitCount += 8;
+    }
+    const value = this.bitBuf & ((1 << n) - 1);
+    this.bitBuf >>>= n;
+    this.bitCount -= n;
+    return value;
+  }
+
+  private decode(h: Huffman): number {
+    // códigos canônicos: percorre um bit por vez, comparando com o primeiro código de cada tamanho
+    let code = 0;
+    let first = 0;
+    let index = 0;
+    for (let len = 1; len < 16; len++) {
+      code |= this.bits(1);
+      const count = h.counts[len];
+      if (code - first < count) return h.symbols[index + code - first];
+      index += count;
+      first = (first + count) << 1;
+      code <<= 1;
+    }
+    throw new Error("código huffman inválido");
+  }
+
+  private reserve(n: number): void {
+    if (this.length + n <= this.out.length) return;
+    const grown = new Uint8Array(Math.max(this.out.length * 2, this.length + n));
+    grown.set(this.out.subarray(0, this.length));
+    this.out = grown;
+  }
+
+  private stored(): void {
+    this.bitBuf = 0;
+    this.bitCount = 0;
+    const input = this.input;
+    if (this.pos + 4 > input.length) throw new Error("frame deflate truncado");
+    const len = input[this.pos] | (input[this.pos + 1] << 8);
+    const nlen = input[this.pos + 2] | (input[this.pos + 3] << 8);
+    if (len !== (~nlen & 0xffff)) throw new Error("bloco stored inválido");
+    this.pos += 4;
+    if (this.pos + len > input.length) throw new Error("frame deflate truncado");
+    this.reserve(len);
+    this.out.set(input.subarray(this.pos, this.pos + len), this.length);
+    this.length += len;
+    this.pos += len;
+  }
+
+  private codes(literals: Huffman, distances: Huffman): void {
+    for (;;) {
+      const symbol = this.decode(literals);
+      if (symbol < 256) {
+        this.reserve(1);
+        this.out[this.length++] = symbol;
+      } else if (symbol === 256) {
+        return;
+      } else {
+        const i = symbol - 257;
+        if (i >= LEN_BASE.length) throw new Error("comprimento inválido");
+        const len = LEN_BASE[i] + this.bits(LEN_EXTRA[i]);
+        const d = this.decode(distances);
+        if (d >= DIST_BASE.length) throw new Error("distância inválida");
+        const dist = DIST_BASE[d] + this.bits(DIST_EXTRA[d]);
+        if (dist > this.length) throw new Error("distância antes do início da janela");
+        this.reserve(len);
+        // cópia byte a byte: a origem pode se sobrepor ao destino
+        for (let k = 0; k < len; k++, this.length++) this.out[this.length] = this.out[this.length - dist];
+      }
+    }
+  }
+
+  private dynamic(): void {
+    const nlen = this.bits(5) + 257;
+    const ndist = this.bits(5) + 1;
+    const ncode = this.bits(4) + 4;
+    const lengths = new Uint8Array(19);
+    for (let i = 0; i < ncode; i++) lengths[CODE_LENGTH_ORDER[i]] = this.bits(3);
+    const lencode = huffman(lengths);
+    const all = new Uint8Array(nlen + ndist);
+    for (let i = 0; i < nlen + ndist; ) {
+      const symbol = this.decode(lencode);
+      if (symbol < 16) {
+        all[i++] = symbol;
+        continue;
+      }
+      let value = 0;
+      let repeat: number;
+      if (symbol === 16) {
+        if (i === 0) throw new Error("repetição sem comprimento anterior");
+        value = all[i - 1];
+        repeat = 3 + this.bits(2);
+      } else if (symbol === 17) {
+        repeat = 3 + this.bits(3);
+      } else {
+        repeat = 11 + this.bits(7);
+      }
+      if (i + repeat > nlen + ndist) throw new Error("comprimentos demais");
+      all.fill(value, i, i + repeat);
+      i += repeat;
+    }
+    this.codes(huffman(all.subarray(0, nlen)), huffman(all.subarray(nlen)));
+  }
+
+  run(): void {
+    let last = 0;
+    // frames com Z_SYNC_FLUSH terminam num bloco stored vazio, alinhado no byte e sem BFINAL
+    while (!last && (this.pos < this.input.length || this.bitCount > 0)) {
+      last = this.bits(1);
+      const type = this.bits(2);
+      if (type === 0) this.stored();
+      else if (type === 1) this.codes(FIXED_LITERALS, FIXED_DISTANCES);
+      else if (type === 2) this.dynamic();
+      else throw new Error("tipo de bloco inválido");
+    }
+  }
+}
+
+/** Descomprime `data` (deflate raw) com `window` como histórico; retorna só os bytes novos */
+export function inflateRaw(data: Uint8Array, window: Uint8Array = new Uint8Array(0)): Uint8Array {
+  const inflater = new Inflater(data, window);
+  inflater.run();
+  return inflater.out.slice(window.length, inflater.length);
+}
+
+/** Janela do próximo frame no modo deflate: os últimos MAX_WINDOW bytes descomprimidos */
+export function slideWindow(window: Uint8Array, output: Uint8Array): Uint8Array {
+  if (output.length >= MAX_WINDOW) return output.slice(output.length - MAX_WINDOW);
+  const keep = Math.min(window.length, MAX_WINDOW - output.length);
+  const next = new Uint8Array(keep + output.length);
+  next.set(window.subarray(window.length - keep));
+  next.set(output, keep);
+  return next;
+}